@@ -0,0 +1,406 @@
+import argparse
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import store
+from cube import DAY_KEYS, HOUR_KEYS, LABELS, MEASURES, get_cubes, rollup
+
+# pyarrow opsional (sama seperti pipeline.py): tanpa pyarrow hanya format JSON
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# API HTTP lokal untuk agregat dashboard. Berjalan sebagai proses terpisah
+# (python api.py) di atas data dan cache yang sama (data_loader, cube, store),
+# sehingga layanan lain tidak perlu scraping dashboard atau menghitung ulang
+# groupby. ETag diturunkan dari versi data + request, jadi request ulang dengan
+# If-None-Match dijawab 304 tanpa menghitung apa pun; request identik yang
+# datang bersamaan hanya dihitung sekali.
+
+DEFAULT_PORT = 8502
+STATS = ["sum", "mean", "std", "n"]
+FORMATS = {"json": "application/json", "arrow": "application/vnd.apache.arrow.stream"}
+
+# Body hasil encode yang disimpan per proses (kunci: ETag)
+MAX_CACHED = 256
+
+# Body lebih kecil dari ini tidak dikompresi
+MIN_GZIP_BYTES = 1024
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+counters = {"requests": 0, "not_modified": 0, "computed": 0, "coalesced": 0}
+
+
+class SingleFlight:
+    # Request identik yang datang saat hasilnya sedang dihitung menunggu
+    # hasil yang sama, bukan menghitung ulang
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, compute):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event(), "result": None, "error": None}
+        if leader:
+            try:
+                call["result"] = compute()
+            except BaseException as exc:
+                call["error"] = exc
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call["done"].set()
+        else:
+            call["done"].wait()
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"], leader
+
+
+_flight = SingleFlight()
+
+
+# --- Endpoint ---
+
+def split_list(value):
+    return [v for v in value.split(",") if v]
+
+
+def choose(values, allowed, name):
+    unknown = [v for v in values if v not in allowed]
+    if unknown:
+        raise ValueError(f"{name} tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(map(str, allowed))})")
+    return values
+
+
+def cube_filters(cube, params, reserved):
+    # Parameter selain yang dipakai endpoint dianggap filter dimensi, mis. season=1,2
+    keys = [c for c in cube.columns if not c.endswith(("_sum", "_sq")) and c != "n"]
+    for name, value in params.items():
+        if name in reserved:
+            continue
+        choose([name], keys, "Dimensi filter")
+        try:
+            codes = [int(v) for v in split_list(value)]
+        except ValueError:
+            raise ValueError(f"Nilai filter {name} harus berupa kode integer") from None
+        cube = cube[cube[name].isin(codes)]
+    return cube
+
+
+def select_cube(params, by):
+    level = params.get("level") or ("hour" if set(by) - set(DAY_KEYS) else "day")
+    choose([level], ["hour", "day"], "Level")
+    anomalies = params.get("anomalies", "exclude")
+    choose([anomalies], ["exclude", "include"], "Mode anomali")
+    cube = get_cubes(include_anomalies=anomalies == "include")[level]
+    choose(by, HOUR_KEYS if level == "hour" else DAY_KEYS, "Dimensi")
+    return cube
+
+
+def aggregate(params):
+    # Roll-up cube: /aggregate?by=season&measures=cnt&stats=sum,mean
+    by = choose(split_list(params.get("by", "season")), HOUR_KEYS, "Dimensi")
+    measures = choose(split_list(params.get("measures", "cnt")), MEASURES, "Measure")
+    stats = choose(split_list(params.get("stats", "sum,mean")), STATS, "Statistik")
+    cube = cube_filters(select_cube(params, by), params, {"by", "measures", "stats", "level", "anomalies", "format"})
+    result = rollup(cube, by) if by else rollup(cube.assign(all=0), ["all"])
+    columns = [f"{m}_{s}" for m in measures for s in stats if s != "n"] + (["n"] if "n" in stats else [])
+    return {"by": [LABELS[k][0] if k in LABELS else k for k in by], "frame": result[columns].reset_index()}
+
+
+def heatmap(params):
+    # Matriks dua dimensi: /heatmap?rows=weekday&cols=hr&value=cnt_sum
+    rows, cols = params.get("rows", "weekday"), params.get("cols", "hr")
+    value = params.get("value", "cnt_sum")
+    choose([value], [f"{m}_{s}" for m in MEASURES for s in STATS if s != "n"] + ["n"], "Value")
+    cube = cube_filters(select_cube(params, [rows, cols]), params,
+                        {"rows", "cols", "value", "level", "anomalies", "format"})
+    matrix = rollup(cube, [rows, cols])[value].unstack(LABELS[cols][0] if cols in LABELS else cols)
+    if rows == "weekday":
+        matrix = matrix.reindex([label for label in LABELS["weekday"][1].values() if label in matrix.index])
+    return {"rows": matrix.index.tolist(), "columns": matrix.columns.tolist(), "matrix": matrix}
+
+
+def query(params):
+    # Query group-by atas store SQLite (sama dengan halaman Explore):
+    # /query?level=hour&group_by=season,hr&measure=cnt&agg=mean&season=1,2&start=2012-01-01
+    level = params.get("level", "hour")
+    choose([level], list(store.DIMENSIONS), "Level")
+    group_by = tuple(split_list(params.get("group_by", "hr")))
+    agg = params.get("agg", "mean")
+    choose([agg], list(store.AGGREGATIONS), "Agregasi")
+    reserved = {"level", "group_by", "measure", "agg", "start", "end", "anomalies", "format"}
+    try:
+        filters = {name: [int(v) for v in split_list(value)] for name, value in params.items() if name not in reserved}
+    except ValueError:
+        raise ValueError("Nilai filter harus berupa kode integer") from None
+    start = pd.Timestamp(params["start"]) if "start" in params else None
+    end = pd.Timestamp(params["end"]) if "end" in params else None
+    table, result, _ = store.query(level, group_by, filters, params.get("measure", "cnt"), agg, start, end,
+                                   params.get("anomalies", "exclude") == "include")
+    return {"source": table, "by": list(group_by), "frame": result}
+
+
+def health(params):
+    hour_df, day_df = data_loader.load_data()
+    return {"hour_rows": len(hour_df), "day_rows": len(day_df), **counters}
+
+
+ROUTES = {"/aggregate": aggregate, "/heatmap": heatmap, "/query": query, "/health": health}
+
+
+# --- Encode ---
+
+def column_values(values):
+    # Float dibulatkan agar payload ringkas; NaN menjadi null
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        rounded = np.round(values, 4)
+        return [None if v != v else v for v in rounded.tolist()]
+    if values.dtype.kind in "iub":
+        return values.tolist()
+    return [str(v) for v in values.tolist()]
+
+
+def encode(result, version, fmt):
+    if fmt == "arrow":
+        if pa is None:
+            raise ValueError("Format arrow membutuhkan pyarrow")
+        frame = result["matrix"].reset_index() if "matrix" in result else result.get("frame")
+        if frame is None:
+            raise ValueError("Format arrow hanya untuk endpoint tabel")
+        frame = frame.rename(columns=str)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({b"version": version.encode()})
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+
+    payload = {"version": version}
+    for name, value in result.items():
+        if name == "frame":
+            # Kolumnar: satu array per kolom, bukan satu object per baris
+            payload["columns"] = {str(c): column_values(value[c].to_numpy()) for c in value.columns}
+        elif name == "matrix":
+            payload["values"] = [column_values(row) for row in value.to_numpy(dtype=float)]
+        else:
+            payload[name] = column_values(value) if isinstance(value, list) else value
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def make_etag(version, path, params):
+    # Weak ETag: body gzip dan tanpa kompresi punya isi yang sama
+    request = json.dumps([version, path, sorted(params.items())])
+    return 'W/"' + hashlib.sha1(request.encode()).hexdigest()[:20] + '"'
+
+
+def respond(path, params, version, etag):
+    # Mengembalikan (body, body gzip) dari cache, atau dihitung sekali per ETag
+    with _lock:
+        cached = _cache.get(etag)
+        if cached is not None:
+            _cache.move_to_end(etag)
+            return cached
+
+    def compute():
+        body = encode(ROUTES[path](params), version, params.get("format", "json"))
+        compressed = gzip.compress(body, compresslevel=5) if len(body) >= MIN_GZIP_BYTES else None
+        return body, compressed
+
+    bodies, leader = _flight.do(etag, compute)
+    with _lock:
+        counters["computed" if leader else "coalesced"] += 1
+        # /health berisi counter yang selalu berubah, jadi tidak di-cache
+        if path != "/health":
+            _cache[etag] = bodies
+            while len(_cache) > MAX_CACHED:
+                _cache.popitem(last=False)
+    return bodies
+
+
+class Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 agar klien bisa memakai ulang koneksi (keep-alive)
+    protocol_version = "HTTP/1.1"
+    quiet = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        with _lock:
+            counters["requests"] += 1
+        if url.path not in ROUTES:
+            return self.send_json(404, {"error": f"Endpoint tidak dikenal: {url.path}", "endpoints": list(ROUTES)})
+        fmt = params.get("format", "json")
+        if fmt not in FORMATS:
+            return self.send_json(400, {"error": f"Format tidak dikenal: {fmt}"})
+
+        # ETag hanya butuh versi data (dua os.stat), jadi cache klien divalidasi
+        # tanpa membangun hasil
+        version = data_loader.data_version()
+        etag = make_etag(version, url.path, params)
+        if url.path != "/health" and etag in self.headers.get("If-None-Match", ""):
+            with _lock:
+                counters["not_modified"] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        try:
+            body, compressed = respond(url.path, params, version, etag)
+        except ValueError as exc:
+            return self.send_json(400, {"error": str(exc)})
+        except Exception as exc:
+            return self.send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+        use_gzip = compressed is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        self.send_response(200)
+        self.send_header("Content-Type", FORMATS[fmt])
+        self.send_header("ETag", etag)
+        # Klien boleh menyimpan hasil, tetapi harus revalidasi (murah, lihat ETag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        payload = compressed if use_gzip else body
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", FORMATS["json"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT):
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_background(host="127.0.0.1", port=0):
+    # Server di thread terpisah (port 0 = port bebas), untuk test dan --measure
+    server = make_server(host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --- Pengukuran (python api.py --measure); isi, ETag/304, dan coalescing diuji di tests/test_api.py ---
+
+def fetch(port, path, headers=None, conn=None):
+    own = conn is None
+    conn = conn or http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    try:
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        body = response.read()
+        if response.getheader("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return response.status, response.getheader("ETag"), body
+    finally:
+        if own:
+            conn.close()
+
+
+def measure(seconds=5.0, clients=16, revalidate=0.5):
+    # Throughput dan latensi dengan klien keep-alive; sebagian request memakai
+    # If-None-Match (revalidasi cache klien)
+    server = start_background()
+    port = server.server_address[1]
+    paths = ["/aggregate?by=season&stats=sum,mean", "/aggregate?by=hr&measures=casual,registered&stats=sum",
+             "/heatmap?rows=weekday&cols=hr", "/query?level=day&group_by=weekday&agg=sum",
+             "/aggregate?by=month,workingday&level=hour&season=2,3"]
+    etags = {p: fetch(port, p)[1] for p in paths}
+    deadline = time.perf_counter() + seconds
+
+    def client(i):
+        rng = np.random.default_rng(i)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        latencies = []
+        while time.perf_counter() < deadline:
+            path = paths[rng.integers(len(paths))]
+            headers = {"Accept-Encoding": "gzip"}
+            if rng.random() < revalidate:
+                headers["If-None-Match"] = etags[path]
+            start = time.perf_counter()
+            fetch(port, path, headers, conn)
+            latencies.append(time.perf_counter() - start)
+        conn.close()
+        return latencies
+
+    try:
+        with ThreadPoolExecutor(clients) as pool:
+            latencies = np.concatenate(list(pool.map(client, range(clients))))
+    finally:
+        server.shutdown()
+    return {
+        **counters,
+        "clients": clients,
+        "requests": len(latencies),
+        "requests_per_s": round(len(latencies) / seconds, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 2),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP lokal untuk agregat dashboard (JSON kolumnar/Arrow)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--log", action="store_true", help="tampilkan log setiap request")
+    parser.add_argument("--verify", action="store_true", help="periksa isi, ETag/304, dan coalescing")
+    parser.add_argument("--measure", action="store_true", help="ukur throughput dan latensi")
+    parser.add_argument("--clients", type=int, default=16, help="jumlah klien bersamaan untuk --measure")
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(data_loader.run_tests("test_api.py"))
+    elif args.measure:
+        print(json.dumps(measure(clients=args.clients)))
+    else:
+        Handler.quiet = not args.log
+        server = make_server(args.host, args.port)
+        # Data dan cube dimuat sebelum request pertama
+        get_cubes()
+        print(f"API berjalan di http://{args.host}:{server.server_address[1]} ({', '.join(ROUTES)})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
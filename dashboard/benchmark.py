@@ -0,0 +1,321 @@
+import argparse
+import importlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Benchmark headless dashboard.py memakai streamlit.testing (AppTest).
+# Setiap dataset dijalankan di proses terpisah; di dalamnya setiap halaman
+# dan pertanyaan diukur dalam kondisi cache dingin (cache data, artefak, dan
+# figure dikosongkan) dan hangat (rerun dengan cache terisi).
+# Modul data (pandas/matplotlib) diimpor di dalam fungsi agar pemeriksaan
+# waktu start (--startup) berjalan di proses yang belum memuatnya.
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(CURRENT_DIR, "dashboard.py")
+VISUALIZATION = "Visualization & Explanatory"
+PAGES = ["Home", "Dataset Overview", VISUALIZATION, "Clustering", "Forecast", "Explore", "What-if", "Conclusion"]
+DEFAULT_SCALES = (1, 10, 100)
+
+# Selisih waktu di bawah ini dianggap noise saat membandingkan hasil
+MIN_DELTA_SECONDS = 0.05
+
+# Anggaran halaman Home saat proses baru start: modul yang tidak boleh ikut
+# diimpor dan batas waktu sampai halaman selesai dirender (detik).
+# pandas/numpy tidak dimasukkan karena sudah diimpor streamlit untuk
+# komponen option_menu.
+STARTUP_PAGE = "Home"
+STARTUP_FORBIDDEN = ("matplotlib", "seaborn", "sklearn", "data_loader", "cube", "charts", "figure_cache")
+STARTUP_BUDGET_SECONDS = 1.0
+
+
+def scenarios():
+    # Halaman visualisasi diukur per pertanyaan (?question=1..7)
+    from charts import QUESTIONS
+    for page in PAGES:
+        if page == VISUALIZATION:
+            for number in range(1, len(QUESTIONS) + 1):
+                yield page, number
+        else:
+            yield page, None
+
+
+def reset_caches():
+    import data_loader
+    from figure_cache import get_cache
+    data_loader.clear_cache()
+    get_cache().clear()
+
+
+def run_page(page, question, timeout):
+    from figure_cache import get_cache
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(SCRIPT, default_timeout=timeout)
+    at.query_params["page"] = page
+    if question is not None:
+        at.query_params["question"] = str(question)
+    cache = get_cache()
+    render_before = cache.render_seconds
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    error = at.exception[0].value if len(at.exception) else None
+    return elapsed, cache.render_seconds - render_before, error
+
+
+def measure_scenario(page, question, repeat, timeout):
+    cold, cold_render, warm, warm_render = [], [], [], []
+    error = None
+    for _ in range(repeat):
+        reset_caches()
+        elapsed, render, error = run_page(page, question, timeout)
+        cold.append(elapsed)
+        cold_render.append(render)
+        elapsed, render, _ = run_page(page, question, timeout)
+        warm.append(elapsed)
+        warm_render.append(render)
+
+    # Memori puncak diukur di run terpisah karena tracemalloc memperlambat eksekusi
+    reset_caches()
+    tracemalloc.start()
+    run_page(page, question, timeout)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "page": page,
+        "question": question,
+        "cold_s": round(min(cold), 4),
+        "warm_s": round(min(warm), 4),
+        "cold_render_s": round(min(cold_render), 4),
+        "warm_render_s": round(min(warm_render), 4),
+        "peak_mb": round(peak / 2**20, 1),
+        "error": error,
+    }
+
+
+def worker(repeat, timeout):
+    # Dijalankan di proses anak dengan BIKE_DATA_DIR sudah di-set
+    import warnings
+
+    import data_loader
+    warnings.filterwarnings("ignore")
+    # Impor modul dashboard lebih dulu agar biaya impor tidak masuk ke halaman pertama
+    for module in ("charts", "clustering", "cube", "figure_cache", "forecast", "ingest"):
+        importlib.import_module(module)
+
+    hour_df, day_df = data_loader.load_data()
+    rows = {"hour_rows": len(hour_df), "day_rows": len(day_df)}
+    results = [dict(rows, **measure_scenario(page, question, repeat, timeout))
+               for page, question in scenarios()]
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    for result in results:
+        result["process_max_rss_mb"] = round(max_rss, 1)
+    # Grid what-if: waktu build, memori, dan latensi query per gerakan slider
+    import whatif
+    return {"results": results, "whatif": whatif.measure()}
+
+
+def startup_worker(timeout):
+    # Dijalankan di proses baru: impor streamlit + render halaman Home sekali
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(SCRIPT, default_timeout=timeout)
+    at.query_params["page"] = STARTUP_PAGE
+    at.run()
+    return {
+        "page": STARTUP_PAGE,
+        "first_paint_s": round(time.perf_counter() - start, 4),
+        "imported": sorted(m for m in STARTUP_FORBIDDEN if m in sys.modules),
+        "error": at.exception[0].value if len(at.exception) else None,
+    }
+
+
+def check_startup(timeout=60, budget=STARTUP_BUDGET_SECONDS):
+    # Waktu proses (termasuk start interpreter) sampai halaman Home selesai dirender
+    command = [sys.executable, os.path.abspath(__file__), "--startup-worker", "--timeout", str(timeout)]
+    start = time.perf_counter()
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_s"] = round(time.perf_counter() - start, 4)
+    failures = [f"modul {module} ikut diimpor" for module in result["imported"]]
+    if result["first_paint_s"] > budget:
+        failures.append(f"first paint {result['first_paint_s']:.3f}s melebihi anggaran {budget:.3f}s")
+    if result["error"]:
+        failures.append(f"error: {result['error']}")
+    return result, failures
+
+
+def dataset_dir(scale, seed):
+    import data_loader
+    import synthetic
+    if scale == 1:
+        return data_loader.resolve_data_dir()
+    # Data sintetis dibuat sekali lalu dipakai ulang antar run
+    path = os.path.join(data_loader.cache_dir(), "benchmark", f"synthetic-{scale}x-seed{seed}")
+    marker = os.path.join(path, "COMPLETE")
+    if not os.path.exists(marker):
+        print(f"Membuat data sintetis {scale}x di {path} ...", file=sys.stderr)
+        synthetic.generate(path, scale, seed=seed)
+        open(marker, "w").close()
+    return path
+
+
+def run_dataset(scale, seed, repeat, timeout):
+    path = dataset_dir(scale, seed)
+    env = dict(os.environ, BIKE_DATA_DIR=path)
+    if scale != 1:
+        # Model clustering dari data sintetis tidak boleh menimpa model data asli
+        env["BIKE_CACHE_DIR"] = os.path.join(path, ".cache")
+    command = [sys.executable, os.path.abspath(__file__), "--worker",
+               "--repeat", str(repeat), "--timeout", str(timeout)]
+    output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+    output = json.loads(output.strip().splitlines()[-1])
+    for result in output["results"]:
+        result["dataset"] = f"{scale}x"
+    output["whatif"]["dataset"] = f"{scale}x"
+    return output
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=CURRENT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(scales, seed=0, repeat=1, timeout=600):
+    import pandas as pd
+    import streamlit as st
+
+    results, whatif = [], []
+    for scale in scales:
+        output = run_dataset(scale, seed, repeat, timeout)
+        results.extend(output["results"])
+        whatif.append(output["whatif"])
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": repeat,
+        },
+        "results": results,
+        "whatif": whatif,
+    }
+
+
+def result_key(result):
+    return result["dataset"], result["page"], result["question"]
+
+
+def compare(baseline, current, threshold=0.2, metrics=("cold_s", "warm_s", "peak_mb")):
+    # Bandingkan dua file hasil; regresi = naik lebih dari threshold (relatif)
+    base = {result_key(r): r for r in baseline["results"]}
+    rows, regressions = [], []
+    for result in current["results"]:
+        old = base.get(result_key(result))
+        if old is None:
+            continue
+        for metric in metrics:
+            before, after = old[metric], result[metric]
+            change = (after - before) / before if before else 0.0
+            row = {"dataset": result["dataset"], "page": result["page"], "question": result["question"],
+                   "metric": metric, "before": before, "after": after, "change": round(change, 3)}
+            rows.append(row)
+            noise = MIN_DELTA_SECONDS if metric.endswith("_s") else 1.0
+            if change > threshold and after - before > noise:
+                regressions.append(row)
+    return rows, regressions
+
+
+def format_row(row):
+    label = row["page"] if row["question"] is None else f"{row['page']} Q{row['question']}"
+    return (f"{row['dataset']:>6} {label:<32} {row['metric']:<8} "
+            f"{row['before']:>9} -> {row['after']:>9} ({row['change']:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless halaman dan pertanyaan dashboard")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="skala data dipisah koma; 1 = data bawaan (mis. 1,10,100,1000)")
+    parser.add_argument("--repeat", type=int, default=1, help="jumlah pengulangan (diambil yang tercepat)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=600, help="batas waktu satu run AppTest (detik)")
+    parser.add_argument("--output", default="benchmark.json", help="file hasil (JSON)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="bandingkan dua file hasil; exit code 1 jika ada regresi")
+    parser.add_argument("--threshold", type=float, default=0.2, help="batas regresi relatif untuk --compare")
+    parser.add_argument("--startup", action="store_true",
+                        help="periksa anggaran impor dan waktu render halaman Home; exit code 1 jika terlampaui")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS,
+                        help="batas waktu first paint halaman Home untuk --startup (detik)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--startup-worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.repeat, args.timeout)))
+        return
+
+    if args.startup_worker:
+        print(json.dumps(startup_worker(args.timeout)))
+        return
+
+    if args.startup:
+        result, failures = check_startup(args.timeout, args.budget)
+        print(f"{result['page']}: proses {result['process_s']:.3f}s, first paint {result['first_paint_s']:.3f}s "
+              f"(anggaran {args.budget:.3f}s)")
+        if failures:
+            for failure in failures:
+                print(f"GAGAL: {failure}")
+            sys.exit(1)
+        print("Anggaran start terpenuhi")
+        return
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        rows, regressions = compare(baseline, current, args.threshold)
+        for row in rows:
+            print(format_row(row))
+        if regressions:
+            print(f"\n{len(regressions)} regresi di atas {args.threshold:.0%}:")
+            for row in regressions:
+                print(format_row(row))
+            sys.exit(1)
+        print("\nTidak ada regresi")
+        return
+
+    scales = [int(s) for s in args.scales.split(",")]
+    report = run_benchmark(scales, args.seed, args.repeat, args.timeout)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    for result in report["results"]:
+        label = result["page"] if result["question"] is None else f"{result['page']} Q{result['question']}"
+        print(f"{result['dataset']:>6} {label:<32} cold {result['cold_s']:>7.3f}s  warm {result['warm_s']:>7.3f}s  "
+              f"render {result['cold_render_s']:>6.3f}s  peak {result['peak_mb']:>7.1f} MB"
+              + (f"  ERROR: {result['error']}" if result["error"] else ""))
+    for result in report["whatif"]:
+        print(f"{result['dataset']:>6} {'What-if grid':<32} fit {result['fit_s']:>7.3f}s  build {result['grid_build_s']:>6.3f}s  "
+              f"grid {result['grid_mb']:>5.1f} MB  query p50 {result['query_p50_us']:>6.1f}us  "
+              f"p99 {result['query_p99_us']:>6.1f}us")
+    print(f"Hasil ditulis ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.colors import to_hex
+from matplotlib.figure import Figure
+
+from cube import rollup, totals
+from pipeline import day_order
+from plotting import (bar_chart, heatmap, line_chart, palette, regression_chart, scale_formatter,
+                      stacked_bar_chart, tight_layout, time_series_chart)
+from stats import INSUFFICIENT_DATA, get_day_moments
+
+# Pertanyaan analisis, sesuai urutan di halaman "Visualization & Explanatory"
+QUESTIONS = [
+    "Bagaimana variasi jumlah penyewaan sepeda berdasarkan musim, dan musim mana yang memiliki permintaan tertinggi?",
+    "Bagaimana pengaruh kondisi cuaca terhadap pola penyewaan sepeda?",
+    "Bagaimana tren penyewaan sepeda per jam sepanjang hari, dan kapan waktu penggunaan tertinggi?",
+    "Apakah terdapat perbedaan signifikan dalam pola penyewaan sepeda antara hari kerja dan akhir pekan?",
+    "Bagaimana distribusi dan rasio antara pengguna kasual dan terdaftar di berbagai periode waktu?",
+    "Bagaimana dampak hari libur terhadap pola penyewaan sepeda dibandingkan dengan hari biasa?",
+    "Apakah terdapat korelasi antara suhu, kelembaban, kecepatan angin, dan jumlah penyewaan sepeda?",
+]
+
+# Figure dibuat langsung lewat matplotlib.figure.Figure (bukan pyplot) sehingga
+# tidak ada state global yang tertinggal setelah figure selesai dirender.
+
+
+def daily_series(day_df, by):
+    # Satu seri harian per label (mis. per musim) untuk chart tren
+    groups = {}
+    for name, group in day_df.groupby(by, observed=True, sort=True):
+        groups[name] = (group["dteday"].to_numpy(), group["cnt"].to_numpy())
+    return groups
+
+
+def season_figure(cubes, day_df):
+    # Hitung statistik musiman
+    seasonal = rollup(cubes["day"], ["season"])
+    seasonal_stats = seasonal.sort_values("cnt_sum", ascending=False)
+
+    # Buat figure dengan 2 baris dan 2 kolom
+    fig = Figure(figsize=(18, 12))
+    axes = fig.subplots(2, 2)
+
+    # Bar Chart 1: Total Sewa Sepeda Berdasarkan Musim
+    bar_chart(axes[0, 0], seasonal_stats.index, seasonal_stats["cnt_sum"].to_numpy(), annotate_offset=10000)
+    axes[0, 0].set_title("Total Sewa Sepeda Berdasarkan Musim", fontsize=14)
+    axes[0, 0].set_ylabel("Total Sewa (Juta)", fontsize=12)
+    axes[0, 0].set_xlabel("Musim", fontsize=12)
+    axes[0, 0].yaxis.set_major_formatter(scale_formatter(1e6, 1))
+
+    # Bar Chart 2: Rata-rata Sewa Sepeda Harian Berdasarkan Musim
+    bar_chart(axes[0, 1], seasonal_stats.index, seasonal_stats["cnt_mean"].to_numpy(), annotate_offset=100)
+    axes[0, 1].set_title("Rata-Rata Sewa Sepeda Harian Berdasarkan Musim", fontsize=14)
+    axes[0, 1].set_ylabel("Rata-Rata Sewa per Hari", fontsize=12)
+    axes[0, 1].set_xlabel("Musim", fontsize=12)
+
+    # Line Chart 1: Tren Sewa Sepeda Seiring Waktu Berdasarkan Musim
+    groups = daily_series(day_df, "season_name")
+    time_series_chart(axes[1, 0], groups, palette("viridis", len(groups)), linewidth=2)
+    axes[1, 0].set_title("Tren Sewa Sepeda Berdasarkan Musim", fontsize=14)
+    axes[1, 0].set_ylabel("Total Sewa", fontsize=12)
+    axes[1, 0].set_xlabel("Tanggal", fontsize=12)
+    axes[1, 0].legend(title="Musim")
+
+    # Line Chart 2: Total Sewa Sepeda untuk Setiap Musim
+    labels = seasonal.index.astype(str)
+    line_chart(axes[1, 1], labels, {"cnt": seasonal["cnt_sum"].to_numpy()}, ["purple"], marker="o")
+    axes[1, 1].set_title("Total Sewa Sepeda untuk Setiap Musim", fontsize=14)
+    axes[1, 1].set_ylabel("Jumlah Sewa (Juta)", fontsize=12)
+    axes[1, 1].set_xlabel("Musim")
+    axes[1, 1].yaxis.set_major_formatter(scale_formatter(1e6, 1))
+
+    tight_layout(fig)
+    return fig
+
+
+def weather_figure(cubes, day_df):
+    weather = rollup(cubes["day"], ["weathersit"])
+    weather_stats = weather.sort_values("cnt_sum", ascending=False)
+
+    fig = Figure(figsize=(18, 12))
+    axes = fig.subplots(2, 2)
+
+    bar_chart(axes[0, 0], weather_stats.index, weather_stats["cnt_sum"].to_numpy())
+    axes[0, 0].set_title("Total Sewa Sepeda Berdasarkan Kondisi Cuaca")
+    axes[0, 0].set_xlabel("weather_condition")
+    axes[0, 0].set_ylabel("sum")
+
+    bar_chart(axes[0, 1], weather_stats.index, weather_stats["cnt_mean"].to_numpy())
+    axes[0, 1].set_title("Rata-rata Sewa Sepeda Harian Berdasarkan Kondisi Cuaca")
+    axes[0, 1].set_xlabel("weather_condition")
+    axes[0, 1].set_ylabel("mean")
+
+    groups = daily_series(day_df, "weather_condition")
+    time_series_chart(axes[1, 0], groups, palette("viridis", len(groups)), linewidth=2)
+    axes[1, 0].set_title("Tren Sewa Sepeda Berdasarkan Kondisi Cuaca")
+    axes[1, 0].set_xlabel("dteday")
+    axes[1, 0].set_ylabel("cnt")
+    axes[1, 0].legend(title="weather_condition")
+
+    labels = weather.index.astype(str)
+    line_chart(axes[1, 1], labels, {"cnt": weather["cnt_sum"].to_numpy()}, ["purple"], marker="o")
+    axes[1, 1].set_title("Total Sewa Sepeda untuk Setiap Kondisi Cuaca")
+    axes[1, 1].set_xlabel("weather_condition")
+    axes[1, 1].set_ylabel("cnt")
+
+    tight_layout(fig)
+    return fig
+
+
+def hourly_figure(cubes, day_df):
+    # Buat visualisasi dalam 1 baris 2 kolom
+    fig = Figure(figsize=(20, 6))
+    axes = fig.subplots(1, 2)
+
+    # Line Chart - Tren Sewa per Jam
+    hourly = rollup(cubes["hour"], ["hr"])
+    line_chart(axes[0], hourly.index, {"cnt": hourly["cnt_sum"].to_numpy()}, ["purple"], marker="o")
+    axes[0].set_title("Tren Sewa Sepeda per Jam dalam Sehari", fontsize=14)
+    axes[0].set_ylabel("Jumlah Sewa (Ribu)", fontsize=12)
+    axes[0].set_xlabel("Jam", fontsize=12)
+    axes[0].set_xticks(range(0, 24, 1))  # Set grid berdasarkan jam (0-24)
+    axes[0].grid(axis="both", linestyle="--", alpha=0.6)  # Tambahkan grid
+    axes[0].yaxis.set_major_formatter(scale_formatter(1e3))
+
+    # Heatmap - Sewa Sepeda per Jam dan Hari
+    heatmap_data = rollup(cubes["hour"], ["weekday", "hr"])["cnt_sum"].unstack("hr")
+    heatmap_data = heatmap_data.reindex(day_order)  # Urutkan berdasarkan hari yang benar
+
+    heatmap(axes[1], heatmap_data, cmap="viridis")
+    axes[1].set_title("Pola Sewa Sepeda (Jam vs. Hari)", fontsize=14)
+    axes[1].set_ylabel("Hari", fontsize=12)
+    axes[1].set_xlabel("Jam", fontsize=12)
+    tight_layout(fig)
+    return fig
+
+
+def split_figure(cubes, key, bar_title, bar_labels, bar_xlabel, line_title, line_labels):
+    # Dipakai pertanyaan 4 (workingday) dan 6 (holiday): total per kategori
+    # dan tren per jam untuk masing-masing kategori
+    fig = Figure(figsize=(20, 6))
+    axes = fig.subplots(1, 2)
+
+    # Label dan warna dipetakan dari nilai kategori (0/1), bukan dari posisi,
+    # karena filter bisa menyisakan satu kategori saja
+    bar_names, line_names = dict(enumerate(bar_labels)), dict(enumerate(line_labels))
+    bar_colors, line_colors = dict(enumerate(palette("viridis", len(bar_labels)))), {0: "blue", 1: "green"}
+
+    # Bar Chart Grouped - Total Sewa per kategori hari
+    category_totals = rollup(cubes["day"], [key])["cnt_sum"]
+    bar_chart(axes[0], [bar_names[v] for v in category_totals.index], category_totals.to_numpy(),
+              colors=[bar_colors[v] for v in category_totals.index], annotate_offset=3000)
+    axes[0].set_title(bar_title, fontsize=14)
+    axes[0].tick_params(axis="x", labelsize=12)
+    axes[0].set_ylabel("Jumlah Sewa (Juta)", fontsize=12)
+    axes[0].set_xlabel(bar_xlabel, fontsize=12)
+    axes[0].yaxis.set_major_formatter(scale_formatter(1e6, 1))
+
+    # Line Chart - Tren Sewa per jam untuk tiap kategori
+    hourly = rollup(cubes["hour"], ["hr", key])["cnt_sum"].unstack(key)
+    series = {line_names[value]: hourly[value].to_numpy() for value in hourly.columns}
+    line_chart(axes[1], hourly.index, series, [line_colors[value] for value in hourly.columns], marker="o")
+    axes[1].set_title(line_title, fontsize=14)
+    axes[1].set_ylabel("Jumlah Sewa (Ribu)", fontsize=12)
+    axes[1].set_xlabel("Jam", fontsize=12)
+    axes[1].set_xticks(range(0, 24, 1))  # Ubah grid ke 24 jam
+    axes[1].grid(axis="both", linestyle="--", alpha=0.6)  # Tambahkan grid
+    axes[1].legend(title="Kategori", fontsize=11)
+    axes[1].yaxis.set_major_formatter(scale_formatter(1e3))
+
+    tight_layout(fig)
+    return fig
+
+
+def workingday_figure(cubes, day_df):
+    return split_figure(
+        cubes, "workingday",
+        "Total Sewa Sepeda: Hari Kerja vs. Akhir Pekan", ["Akhir Pekan", "Hari Kerja"], "Tipe Hari",
+        "Tren Sewa Sepeda Sepanjang Hari: Hari Kerja vs. Akhir Pekan", ["Akhir Pekan", "Hari Kerja"],
+    )
+
+
+def holiday_figure(cubes, day_df):
+    return split_figure(
+        cubes, "holiday",
+        "Total Sewa Sepeda: Hari Libur vs. Hari Biasa", ["Hari Biasa", "Hari Libur"], "Kategori Hari",
+        "Tren Sewa Sepeda Sepanjang Hari: Hari Libur vs. Hari Biasa", ["Hari Biasa", "Hari Libur"],
+    )
+
+
+def users_figure(cubes, day_df):
+    fig = Figure(figsize=(20, 5))
+    axes = fig.subplots(1, 3)
+
+    # Bar Chart Total Pengguna Kasual vs. Terdaftar
+    day_totals = totals(cubes["day"])
+    user_distribution = day_totals[["casual_sum", "registered_sum"]].to_numpy()
+    bar_chart(axes[0], ["casual", "registered"], user_distribution,
+              colors=palette("viridis", 2), annotate_offset=1500)
+    axes[0].set_title("Total Pengguna Kasual vs. Terdaftar", fontsize=14)
+    axes[0].set_xlabel("Tipe Pengguna", fontsize=12)
+    axes[0].set_ylabel("Jumlah Sewa (Juta)", fontsize=12)
+    axes[0].yaxis.set_major_formatter(scale_formatter(1e6, 1))
+
+    # Bar Chart Stacked - Pengguna Kasual vs. Terdaftar per Jam
+    hourly = rollup(cubes["hour"], ["hr"])
+    viridis = colormaps["viridis"]
+    stacked_bar_chart(
+        axes[1], hourly.index,
+        {"Casual": hourly["casual_sum"].to_numpy(), "Registered": hourly["registered_sum"].to_numpy()},
+        [to_hex(viridis(0.0)), to_hex(viridis(1.0))],
+    )
+    axes[1].set_title("Perbandingan Pengguna Kasual dan Terdaftar per Jam", fontsize=14)
+    axes[1].set_xlabel("Jam", fontsize=12)
+    axes[1].set_ylabel("Jumlah Sewa", fontsize=12)
+    axes[1].legend()
+
+    # Pie Chart - Rasio Pengguna Kasual vs. Terdaftar
+    axes[2].pie(user_distribution, labels=["Casual", "Registered"], autopct="%1.1f%%",
+                colors=palette("viridis", 2), startangle=90)
+    axes[2].set_title("Rasio Pengguna Kasual vs. Terdaftar", fontsize=14)
+
+    tight_layout(fig)
+    return fig
+
+
+def correlation_figure(cubes, day_df, moments=None):
+    # Korelasi dan garis regresi dihitung dari momen yang sudah diagregasi;
+    # hanya titik scatter yang masih membaca baris harian
+    moments = get_day_moments() if moments is None else moments
+    fig = Figure(figsize=(20, 6))
+    axes = fig.subplots(1, 2)
+
+    # Heatmap - Correlation Matrix
+    corr_matrix = moments.corr(["cnt", "temp", "hum", "windspeed"])
+    heatmap(axes[0], corr_matrix, cmap="viridis", annot=True)
+    axes[0].set_title("Korelasi antara Faktor Cuaca dan Jumlah Penyewaan")
+
+    # Scatter Plot dengan Correlation Line - Temp vs. Penyewaan
+    # (pita kepercayaan 95% analitik, bukan bootstrap seperti regplot)
+    regression_chart(axes[1], day_df["temp"], day_df["cnt"], moments.ols("temp", "cnt"), color="purple",
+                     note=INSUFFICIENT_DATA)
+    axes[1].set_title("Hubungan antara Suhu dan Jumlah Penyewaan")
+    axes[1].set_xlabel("Suhu")
+    axes[1].set_ylabel("Jumlah Penyewaan")
+
+    tight_layout(fig)
+    return fig
+
+
+# Builder figure untuk tiap pertanyaan
+QUESTION_FIGURES = dict(zip(QUESTIONS, [
+    season_figure, weather_figure, hourly_figure, workingday_figure,
+    users_figure, holiday_figure, correlation_figure,
+]))
+
+
+def time_period_figure(time_period_clusters):
+    # Generate warna dari colormap Viridis
+    viridis = colormaps["viridis"].resampled(4)
+    colors = {
+        "holiday_casual": to_hex(viridis(0)),
+        "non_holiday_casual": to_hex(viridis(1)),
+        "holiday_registered": to_hex(viridis(2)),
+        "non_holiday_registered": to_hex(viridis(3))
+    }
+
+    # Visualisasi hasil clustering
+    fig = Figure(figsize=(12, 7))
+    ax = fig.subplots()
+    bar_width = 0.35  # Lebar bar
+    time_labels = ["Morning", "Afternoon", "Evening", "Night"]
+    index = np.arange(len(time_labels))
+
+    # Pisahkan data berdasarkan kategori hari libur dan non-libur
+    holiday_data = time_period_clusters[time_period_clusters["holiday"] == 1]
+    non_holiday_data = time_period_clusters[time_period_clusters["holiday"] == 0]
+
+    # Plot stacked bars untuk casual users
+    ax.bar(index,
+        holiday_data["casual"],
+        bar_width, label="Casual (Holiday)", color=colors["holiday_casual"])
+
+    ax.bar(index,
+        non_holiday_data["casual"],
+        bar_width, bottom=holiday_data["casual"], label="Casual (Non-Holiday)", color=colors["non_holiday_casual"])
+
+    # Plot stacked bars untuk registered users
+    ax.bar(index + bar_width,
+        holiday_data["registered"],
+        bar_width, label="Registered (Holiday)", color=colors["holiday_registered"])
+
+    ax.bar(index + bar_width,
+        non_holiday_data["registered"],
+        bar_width, bottom=holiday_data["registered"], label="Registered (Non-Holiday)", color=colors["non_holiday_registered"])
+
+    # Tambahkan label dan legenda
+    ax.set_xlabel("Time Period")
+    ax.set_ylabel("Average Rentals")
+    ax.set_title("Average Rentals by Time Period (Casual vs Registered)")
+    ax.set_xticks(index + bar_width / 2)
+    ax.set_xticklabels(time_labels)
+    ax.legend()
+
+    tight_layout(fig)
+    return fig
+
+
+def day_cluster_figure(clusters):
+    # Profil rata-rata 24 jam (centroid) tiap cluster, satu panel per fitur
+    features = clusters["features"]
+    centroids = clusters["centroids"]
+    counts = np.bincount(clusters["labels"], minlength=len(centroids))
+    colors = palette("viridis", len(centroids))
+
+    fig = Figure(figsize=(7 * len(features), 5))
+    axes = np.atleast_1d(fig.subplots(1, len(features)))
+    for f, (ax, feature) in enumerate(zip(axes, features)):
+        series = {
+            f"Cluster {i + 1} ({counts[i]} hari)": centroid[f * 24:(f + 1) * 24]
+            for i, centroid in enumerate(centroids)
+        }
+        line_chart(ax, np.arange(24), series, colors, marker="o")
+        ax.set_title(f"Profil Harian per Cluster ({feature})", fontsize=14)
+        ax.set_xlabel("Jam", fontsize=12)
+        ax.set_ylabel("Rata-Rata Sewa", fontsize=12)
+        ax.set_xticks(range(0, 24, 1))
+        ax.grid(axis="both", linestyle="--", alpha=0.6)
+        ax.legend(fontsize=9)
+
+    tight_layout(fig)
+    return fig
+
+
+def forecast_figure(history, prediction):
+    # cnt aktual beberapa hari terakhir, prakiraan beserta pitanya, dan baseline
+    fig = Figure(figsize=(20, 6))
+    ax = fig.subplots()
+    ax.plot(history["time"], history["cnt"], color="gray", linewidth=1.5, label="Aktual")
+    ax.plot(prediction["time"], prediction["baseline"], color="orange", linestyle="--", linewidth=1.5,
+            label="Baseline (rata-rata jam-dalam-minggu)")
+    ax.plot(prediction["time"], prediction["forecast"], color="purple", linewidth=2, label="Prakiraan")
+    ax.fill_between(prediction["time"], prediction["lower"], prediction["upper"], facecolor="purple",
+                    alpha=0.15, linewidth=0, label="Interval 95%")
+    ax.set_title("Prakiraan Jumlah Penyewaan Sepeda per Jam", fontsize=14)
+    ax.set_xlabel("Waktu", fontsize=12)
+    ax.set_ylabel("Jumlah Sewa", fontsize=12)
+    ax.grid(axis="both", linestyle="--", alpha=0.6)
+    ax.legend(fontsize=10)
+
+    tight_layout(fig)
+    return fig
+
+
+def anomaly_figure(anomalies):
+    # Jam anomali: nilai aktual vs nilai yang diharapkan dari baseline slot jam-dalam-minggu
+    times = anomalies["dteday"].to_numpy(dtype="datetime64[ns]") + anomalies["hr"].to_numpy().astype("timedelta64[h]")
+    actual = anomalies["cnt"].to_numpy()
+    expected = anomalies["cnt_expected"].to_numpy()
+    spikes = actual > expected
+
+    fig = Figure(figsize=(20, 6))
+    ax = fig.subplots()
+    ax.vlines(times, expected, actual, color="lightgray", linewidth=1)
+    ax.scatter(times, expected, color="gray", s=12, label="Diharapkan (baseline)")
+    ax.scatter(times[spikes], actual[spikes], color="crimson", s=24, label="Lonjakan")
+    ax.scatter(times[~spikes], actual[~spikes], color="royalblue", s=24, label="Penurunan")
+    ax.set_title(f"Jam Anomali ({len(anomalies)} jam)", fontsize=14)
+    ax.set_xlabel("Waktu", fontsize=12)
+    ax.set_ylabel("Jumlah Sewa per Jam", fontsize=12)
+    ax.grid(axis="both", linestyle="--", alpha=0.6)
+    ax.legend(fontsize=10)
+
+    tight_layout(fig)
+    return fig
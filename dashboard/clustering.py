@@ -0,0 +1,206 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from cube import get_cubes, rollup
+from data_loader import get_artifact, model_path, save_npz
+
+# Kategori waktu beserta jam mulainya; periode terakhir (Night) berlanjut
+# melewati tengah malam sampai jam mulai periode pertama
+TIME_PERIODS = ["Morning", "Afternoon", "Evening", "Night"]
+DEFAULT_BOUNDARIES = (5, 12, 17, 21)
+
+
+def period_lookup(boundaries=DEFAULT_BOUNDARIES):
+    # Lookup table 24 entri: indeks = jam, nilai = kode periode
+    start = boundaries[0]
+    hours = np.arange(24)
+    codes = np.searchsorted(np.asarray(boundaries[1:]), hours, side="right")
+    codes[hours < start] = len(TIME_PERIODS) - 1
+    return codes
+
+
+def hourly_holiday_sums():
+    # Agregat per (jam, holiday) dari cube, dihitung sekali per versi data
+    return get_artifact(
+        "hourly_holiday_sums",
+        lambda hour_df, day_df: rollup(get_cubes()["hour"], ["hr", "holiday"]),
+    )
+
+
+def time_period_means(boundaries=DEFAULT_BOUNDARIES, hourly=None):
+    # Rata-rata casual/registered per (TimePeriod, holiday). Hanya 48 baris
+    # agregat per jam yang diproses, tidak ada scan ulang ke baris mentah.
+    hourly = hourly_holiday_sums() if hourly is None else hourly
+    hourly = hourly.reset_index()
+    codes = period_lookup(boundaries)[hourly["hr"].to_numpy()]
+    period = pd.Categorical.from_codes(codes, categories=TIME_PERIODS, ordered=True)
+
+    sums = hourly.groupby([period, "holiday"], observed=False)[["casual_sum", "registered_sum", "n"]].sum()
+    # Kombinasi yang kosong (mis. karena filter hari kerja) tetap ada dengan nilai 0
+    full = pd.MultiIndex.from_product([sums.index.levels[0], [0, 1]])
+    sums = sums.reindex(full)
+    result = pd.DataFrame({
+        "casual": sums["casual_sum"] / sums["n"],
+        "registered": sums["registered_sum"] / sums["n"],
+    }).fillna(0)
+    result.index = result.index.set_names(["TimePeriod", "holiday"])
+    return result.reset_index()
+
+
+# ---------------------------------------------------------------------------
+# Segmentasi hari berdasarkan profil permintaan 24 jam (k-means)
+# ---------------------------------------------------------------------------
+
+PROFILE_FEATURES = ["cnt", "casual", "registered"]
+
+
+def daily_profiles(hour_df, features=("cnt",), normalize=False):
+    # Matriks (hari x 24*fitur); satu baris per dteday. Data multi-kota
+    # (synthetic.py) punya satu baris per (kota, dteday, hr): nilainya
+    # dijumlahkan lintas kota, bukan saling menimpa.
+    day_codes, days = pd.factorize(hour_df["dteday"], sort=True)
+    cells = day_codes * 24 + hour_df["hr"].to_numpy().astype(int)
+    present = np.bincount(cells, minlength=len(days) * 24).reshape(len(days), 24) > 0
+    X = np.full((len(days), 24 * len(features)), np.nan)
+    for f, feature in enumerate(features):
+        sums = np.bincount(cells, weights=hour_df[feature].to_numpy(dtype=float), minlength=len(days) * 24)
+        X[:, f * 24:(f + 1) * 24] = np.where(present, sums.reshape(len(days), 24), np.nan)
+
+    # Jam yang tidak tercatat diisi rata-rata jam tsb
+    column_means = np.nanmean(X, axis=0)
+    missing = np.isnan(X)
+    X[missing] = np.take(column_means, np.nonzero(missing)[1])
+
+    if normalize:
+        # Bentuk profil saja: setiap blok fitur dibagi total hariannya
+        blocks = X.reshape(len(days), len(features), 24)
+        X = (blocks / np.maximum(blocks.sum(axis=2, keepdims=True), 1)).reshape(len(days), -1)
+    return days, X
+
+
+def squared_distances(X, centroids):
+    # ||x||^2 - 2 x.c + ||c||^2 untuk semua pasangan sekaligus
+    d = (X ** 2).sum(axis=1)[:, None] - 2 * X @ centroids.T + (centroids ** 2).sum(axis=1)[None, :]
+    return np.maximum(d, 0)
+
+
+def cluster_sums(X, labels, k):
+    # Jumlah anggota per cluster lewat perkalian matriks one-hot (lebih cepat dari np.add.at)
+    onehot = np.zeros((len(X), k))
+    onehot[np.arange(len(X)), labels] = 1
+    return onehot.T @ X
+
+
+def kmeans_plus_plus(X, k, rng):
+    centroids = np.empty((k, X.shape[1]))
+    centroids[0] = X[rng.integers(len(X))]
+    closest = squared_distances(X, centroids[:1])[:, 0]
+    for i in range(1, k):
+        # Titik berikutnya dipilih dengan peluang sebanding jarak kuadrat (D^2)
+        total = closest.sum()
+        idx = rng.choice(len(X), p=closest / total) if total > 0 else rng.integers(len(X))
+        centroids[i] = X[idx]
+        closest = np.minimum(closest, squared_distances(X, centroids[i:i + 1])[:, 0])
+    return centroids
+
+
+def kmeans(X, k, n_init=4, max_iter=100, tol=1e-6, seed=0):
+    rng = np.random.default_rng(seed)
+    best = None
+    for _ in range(n_init):
+        centroids = kmeans_plus_plus(X, k, rng)
+        for _ in range(max_iter):
+            labels = squared_distances(X, centroids).argmin(axis=1)
+            counts = np.bincount(labels, minlength=k)
+            sums = cluster_sums(X, labels, k)
+            # Cluster kosong mempertahankan centroid lamanya
+            updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centroids)
+            shift = ((updated - centroids) ** 2).sum()
+            centroids = updated
+            if shift <= tol:
+                break
+        distances = squared_distances(X, centroids)
+        labels = distances.argmin(axis=1)
+        inertia = distances[np.arange(len(X)), labels].sum()
+        if best is None or inertia < best[2]:
+            best = (centroids, np.bincount(labels, minlength=k), inertia)
+    return best[0], best[1]
+
+
+def partial_fit(centroids, counts, X):
+    # Update mini-batch: setiap centroid bergeser ke rata-rata berbobot
+    # antara posisi lama (bobot = jumlah anggota) dan anggota barunya
+    labels = squared_distances(X, centroids).argmin(axis=1)
+    new_counts = np.bincount(labels, minlength=len(centroids))
+    sums = cluster_sums(X, labels, len(centroids))
+    total = counts + new_counts
+    updated = (centroids * counts[:, None] + sums) / np.maximum(total, 1)[:, None]
+    centroids = np.where(new_counts[:, None] > 0, updated, centroids)
+    return centroids, total
+
+
+def order_clusters(centroids, counts):
+    # Urutkan cluster dari permintaan terendah agar label stabil antar refit
+    order = np.argsort(centroids.sum(axis=1))
+    return centroids[order], counts[order]
+
+
+def load_model(path):
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def seen_rows_hash(hour_df, features, last_day):
+    # Sidik jari baris yang sudah dipakai model (tidak bergantung urutan baris).
+    # Menambah hari baru tidak mengubahnya; mengedit hari lama atau mengganti
+    # CSV dengan data lain (meski jumlah harinya sama) mengubahnya.
+    rows = hour_df.loc[hour_df["dteday"] <= last_day, ["dteday", "hr", *features]]
+    return pd.util.hash_pandas_object(rows, index=False).to_numpy().sum()
+
+
+def fit_day_clusters(hour_df, k=4, features=("cnt",), normalize=False, seed=0):
+    days, X = daily_profiles(hour_df, features, normalize)
+    name = f"kmeans-k{k}-{'-'.join(features)}-{'shape' if normalize else 'volume'}"
+    path = model_path(name)
+    model = load_model(path)
+    last_day = days[-1].to_datetime64()
+
+    seen = None
+    if model is not None and model["centroids"].shape == (k, X.shape[1]) and "seen_hash" in model:
+        seen = days <= model["last_day"]
+        # Riwayat berubah (bukan sekadar bertambah): model dilatih ulang
+        if seen_rows_hash(hour_df, features, model["last_day"]) != model["seen_hash"]:
+            seen = None
+
+    if seen is None:
+        centroids, counts = kmeans(X, k, seed=seed)
+    elif seen.all():
+        centroids, counts = model["centroids"], model["counts"]
+    else:
+        # Hanya hari baru yang diproses
+        centroids, counts = partial_fit(model["centroids"], model["counts"], X[~seen])
+
+    centroids, counts = order_clusters(centroids, counts)
+    save_npz(path, centroids=centroids, counts=counts, last_day=last_day,
+             seen_hash=seen_rows_hash(hour_df, features, last_day))
+
+    labels = squared_distances(X, centroids).argmin(axis=1)
+    return {"days": days, "labels": labels, "centroids": centroids, "features": list(features)}
+
+
+def get_day_clusters(k=4, features=("cnt",), normalize=False):
+    name = f"day_clusters-{k}-{'-'.join(features)}-{normalize}"
+    return get_artifact(name, lambda hour_df, day_df: fit_day_clusters(hour_df, k, tuple(features), normalize))
+
+
+def cluster_membership(clusters, day_df, column):
+    # Proporsi anggota tiap cluster per kategori (season/weather/workingday)
+    labels = pd.Series(clusters["labels"] + 1, index=pd.Index(clusters["days"], name="dteday"), name="Cluster")
+    # Data multi-kota punya beberapa baris per tanggal; profil harian memakai satu baris per tanggal
+    info = day_df.groupby("dteday", sort=False)[column].first()
+    joined = pd.concat([labels, info], axis=1, join="inner")
+    return pd.crosstab(joined["Cluster"], joined[column], normalize="index").round(3)
@@ -0,0 +1,144 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_loader import get_artifact
+from pipeline import day_order, season_map, weather_map
+
+# Dimensi cube. Cube harian memakai dimensi kalender yang sama; cube per jam
+# menambah jam dan penanda anomali (lihat anomaly.py).
+DAY_KEYS = ["year", "month", "season", "weathersit", "workingday", "holiday", "weekday"]
+HOUR_KEYS = DAY_KEYS + ["hr", "anomaly"]
+
+MEASURES = ["cnt", "casual", "registered"]
+
+# Kode dimensi diganti label agar hasil roll-up siap ditampilkan
+LABELS = {
+    "season": ("season_name", season_map),
+    "weathersit": ("weather_condition", weather_map),
+    "weekday": ("day_of_week", dict(enumerate(day_order))),
+}
+
+
+def build_cube(df, keys):
+    # Satu baris per kombinasi dimensi berisi sum, sum-of-squares, dan jumlah baris
+    values = df[MEASURES].astype("int64")
+    frame = df[keys].copy()
+    for m in MEASURES:
+        frame[f"{m}_sum"] = values[m]
+        frame[f"{m}_sq"] = values[m] ** 2
+    grouped = frame.groupby(keys, sort=True)
+    cube = grouped.sum()
+    cube["n"] = grouped.size()
+    return cube.reset_index()
+
+
+def build_cubes(hour_df, day_df):
+    return {"hour": build_cube(hour_df, HOUR_KEYS), "day": build_cube(day_df, DAY_KEYS)}
+
+
+def merge_cubes(cubes, keys):
+    # Partial cube digabung dengan menjumlahkan sel yang kombinasi dimensinya sama
+    merged = pd.concat(cubes, ignore_index=True).groupby(keys, sort=True).sum()
+    return merged.reset_index()
+
+
+def get_cubes(include_anomalies=False):
+    # Default: sel jam anomali dikecualikan, sama seperti data yang dulu disaring IQR
+    cubes = get_artifact("cube", build_cubes)
+    if include_anomalies:
+        return cubes
+    return get_artifact("cube_clean", lambda hour_df, day_df: exclude_anomalies(cubes))
+
+
+def exclude_anomalies(cubes):
+    hour = cubes["hour"]
+    return dict(cubes, hour=hour[hour["anomaly"] == 0].reset_index(drop=True))
+
+
+def summarize(sums):
+    # Turunkan mean dan standar deviasi sampel dari sum, sum-of-squares, dan n
+    result = pd.DataFrame(index=sums.index)
+    n = sums["n"]
+    result["n"] = n
+    for m in MEASURES:
+        s = sums[f"{m}_sum"]
+        q = sums[f"{m}_sq"].astype("float64")
+        result[f"{m}_sum"] = s
+        result[f"{m}_mean"] = s / n
+        var = (q - s.astype("float64") ** 2 / n) / (n - 1)
+        result[f"{m}_std"] = np.sqrt(var.clip(lower=0)).where(n > 1)
+    return result
+
+
+def rollup(cube, by):
+    # Agregasi ulang cube ke dimensi yang lebih kasar; biayanya tergantung
+    # jumlah sel cube, bukan jumlah baris data mentah
+    columns = [c for c in cube.columns if c.endswith(("_sum", "_sq"))] + ["n"]
+    sums = cube.groupby(by, sort=True)[columns].sum()
+    result = summarize(sums).reset_index()
+    for key in by:
+        if key in LABELS:
+            label, mapping = LABELS[key]
+            result[key] = result[key].map(mapping)
+            result = result.rename(columns={key: label})
+    return result.set_index([LABELS[k][0] if k in LABELS else k for k in by])
+
+
+def totals(cube):
+    # Roll-up ke seluruh data (tanpa dimensi)
+    columns = [c for c in cube.columns if c.endswith(("_sum", "_sq"))] + ["n"]
+    return summarize(cube[columns].sum().to_frame().T).iloc[0]
+
+
+class IncrementalCube:
+    # Cube yang bisa ditambah per batch tanpa membangun ulang dari seluruh riwayat.
+    # Setiap sel disimpan di array numpy (kapasitas bertambah 2x) dengan lookup
+    # dictionary dari kombinasi dimensi ke nomor baris, sehingga update batch
+    # berbiaya O(jumlah sel pada batch).
+
+    def __init__(self, cube, keys):
+        self.keys = list(keys)
+        self.columns = [c for c in cube.columns if c not in self.keys]
+        self.size = len(cube)
+        capacity = max(self.size, 16)
+        self.key_values = np.zeros((capacity, len(self.keys)), dtype=np.int64)
+        self.values = np.zeros((capacity, len(self.columns)), dtype=np.int64)
+        self.key_values[:self.size] = cube[self.keys].to_numpy(dtype=np.int64)
+        self.values[:self.size] = cube[self.columns].to_numpy(dtype=np.int64)
+        self.index = {tuple(row): i for i, row in enumerate(self.key_values[:self.size].tolist())}
+        self._frame = cube
+        self._lock = threading.Lock()
+
+    def add(self, partial, sign=1):
+        # partial: cube hasil build_cube atas batch baru (sign=-1 untuk mengurangi)
+        keys = partial[self.keys].to_numpy(dtype=np.int64)
+        values = partial[self.columns].to_numpy(dtype=np.int64) * sign
+        with self._lock:
+            for key, row in zip(map(tuple, keys.tolist()), values):
+                i = self.index.get(key)
+                if i is None:
+                    i = self._append(key)
+                self.values[i] += row
+            self._frame = None
+
+    def _append(self, key):
+        if self.size == len(self.values):
+            self.key_values = np.concatenate([self.key_values, np.zeros_like(self.key_values)])
+            self.values = np.concatenate([self.values, np.zeros_like(self.values)])
+        i = self.size
+        self.key_values[i] = key
+        self.index[key] = i
+        self.size += 1
+        return i
+
+    def to_frame(self):
+        # Materialisasi DataFrame hanya saat dibutuhkan chart (di-cache sampai update berikutnya)
+        with self._lock:
+            if self._frame is None:
+                frame = pd.DataFrame(self.key_values[:self.size], columns=self.keys)
+                frame[self.columns] = self.values[:self.size]
+                # Sel yang sudah kosong (mis. hari yang berpindah kategori) tidak ikut
+                self._frame = frame[frame["n"] > 0].reset_index(drop=True)
+            return self._frame
@@ -0,0 +1,131 @@
+import contextlib
+import json
+import os
+import threading
+import time
+import uuid
+
+# Instrumentasi per tahap pipeline (baca data, filter, fitur, cube, build
+# figure, tight_layout, encode PNG). Aktif jika BIKE_DIAGNOSTICS=1 atau URL
+# berisi ?diagnostics=1. Saat tidak aktif, stage() hanya membaca satu atribut
+# thread-local lalu mengembalikan context manager kosong.
+
+ENABLED = os.environ.get("BIKE_DIAGNOSTICS") == "1"
+
+# Jika di-set, setiap run yang diinstrumentasi ditambahkan ke file JSON lines ini
+EXPORT_PATH = os.environ.get("BIKE_DIAGNOSTICS_FILE")
+
+
+class _Local(threading.local):
+    # Default di level kelas: thread tanpa run aktif tidak memicu AttributeError
+    recorder = None
+
+
+_local = _Local()
+_null = contextlib.nullcontext()
+_export_lock = threading.Lock()
+
+try:
+    _page_size = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _page_size = None
+
+
+def current_rss():
+    # RSS saat ini (bytes); hanya tersedia di Linux lewat /proc
+    if _page_size is None:
+        return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _page_size
+    except OSError:
+        return None
+
+
+class Recorder:
+    # Pencatat tahap untuk satu run script (satu thread sesi Streamlit)
+
+    def __init__(self, context):
+        self.context = dict(context)
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records = []
+        self.depth = 0
+        self.start = time.perf_counter()
+        self.start_rss = current_rss()
+        self.seconds = None
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        # Slot dipesan saat masuk agar urutan catatan mengikuti urutan mulai
+        index = len(self.records)
+        self.records.append(None)
+        depth = self.depth
+        self.depth += 1
+        rss = current_rss()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.depth -= 1
+            end_rss = current_rss()
+            self.records[index] = {
+                "stage": name,
+                "depth": depth,
+                "ms": round(seconds * 1000, 3),
+                "rss_mb": None if end_rss is None else round(end_rss / 2**20, 1),
+                "rss_delta_mb": None if rss is None else round((end_rss - rss) / 2**20, 2),
+            }
+
+    def event(self, name):
+        # Catatan tanpa durasi (mis. cache hit)
+        self.records.append({"stage": name, "depth": self.depth, "ms": 0.0,
+                             "rss_mb": None, "rss_delta_mb": None})
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.start
+        return self
+
+    def rows(self):
+        # Satu baris JSON per tahap, ditambah satu baris ringkasan run
+        base = {"run": self.run_id, "time": time.strftime("%Y-%m-%dT%H:%M:%S"), **self.context}
+        rows = [dict(base, **record) for record in self.records if record is not None]
+        end_rss = current_rss()
+        rows.append(dict(base, stage="total", depth=0, ms=round((self.seconds or 0) * 1000, 3),
+                         rss_mb=None if end_rss is None else round(end_rss / 2**20, 1),
+                         rss_delta_mb=None if self.start_rss is None else round((end_rss - self.start_rss) / 2**20, 2)))
+        return rows
+
+    def to_jsonl(self):
+        return "".join(json.dumps(row) + "\n" for row in self.rows())
+
+
+def stage(name):
+    recorder = _local.recorder
+    if recorder is None:
+        return _null
+    return recorder.stage(name)
+
+
+def event(name):
+    recorder = _local.recorder
+    if recorder is not None:
+        recorder.event(name)
+
+
+def start_run(enabled, **context):
+    # Dipanggil di awal setiap rerun dashboard
+    _local.recorder = Recorder(context) if enabled else None
+    return _local.recorder
+
+
+def finish_run():
+    recorder = _local.recorder
+    _local.recorder = None
+    if recorder is None:
+        return None
+    recorder.finish()
+    if EXPORT_PATH:
+        with _export_lock, open(EXPORT_PATH, "a") as f:
+            f.write(recorder.to_jsonl())
+    return recorder
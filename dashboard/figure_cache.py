@@ -0,0 +1,104 @@
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+
+from diagnostics import event, stage
+
+# Batas memori cache figure per proses worker (MB), bisa diatur lewat env
+DEFAULT_MAX_MB = 64
+
+# Opsi encoding yang sama dengan st.pyplot
+SAVEFIG_KWARGS = {"dpi": 200, "bbox_inches": "tight"}
+
+
+class FigureCache:
+    # LRU berisi bytes PNG/SVG hasil render, dibatasi total ukuran bytes
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Total waktu render (build + encode) saat cache miss
+        self.renders = 0
+        self.render_seconds = 0.0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old)
+            self._items[key] = data
+            self.total_bytes += len(data)
+            # Buang entri yang paling lama tidak dipakai sampai di bawah batas
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+_cache = FigureCache(int(float(os.environ.get("BIKE_FIGURE_CACHE_MB", DEFAULT_MAX_MB)) * 2**20))
+
+
+def get_cache():
+    return _cache
+
+
+def encode_figure(fig, fmt="png"):
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, **SAVEFIG_KWARGS)
+    finally:
+        release_figure(fig)
+    return buffer.getvalue()
+
+
+def release_figure(fig):
+    # Figure dari pyplot harus ditutup agar tidak tertahan di registry global;
+    # figure biasa cukup dikosongkan agar artist-nya bisa di-garbage-collect
+    if plt.fignum_exists(getattr(fig, "number", None)):
+        plt.close(fig)
+    else:
+        fig.clear()
+
+
+def cached_figure(key, builder, *args, fmt="png"):
+    # key: (nama pertanyaan/chart, state filter, versi data)
+    data = _cache.get((key, fmt))
+    if data is None:
+        start = time.perf_counter()
+        with stage(f"figure:{key[0]}:build"):
+            fig = builder(*args)
+        with stage(f"figure:{key[0]}:encode"):
+            data = encode_figure(fig, fmt)
+        _cache.renders += 1
+        _cache.render_seconds += time.perf_counter() - start
+        _cache.put((key, fmt), data)
+    else:
+        event(f"figure:{key[0]}:cache_hit")
+    return data
@@ -0,0 +1,306 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from cube import DAY_KEYS, HOUR_KEYS, build_cube, get_cubes, merge_cubes
+from data_loader import data_version, get_artifact, load_data, run_tests
+from pipeline import season_map, weather_map
+from stats import Moments, get_day_moments, get_day_partitions
+
+# Filter global dashboard: rentang dteday, musim, cuaca, hari kerja/libur,
+# jenis pengguna, dan perlakuan jam anomali. Rentang tanggal dicari dengan binary search pada dteday yang
+# terurut; filter kategori memakai bitmap per nilai yang dihitung sekali per
+# versi data. Sel cube dan partisi momen (stats.PartitionedMoments) untuk bulan
+# yang tercakup penuh dipakai langsung, sehingga hanya baris pada bulan di tepi
+# rentang yang diagregasi ulang.
+
+FILTER_COLUMNS = {
+    "season": list(season_map),
+    "weathersit": list(weather_map),
+    "workingday": [0, 1],
+    "holiday": [0, 1],
+}
+
+# Jenis pengguna: kolom yang menggantikan cnt di semua chart
+USER_TYPES = {"Semua pengguna": "cnt", "Casual": "casual", "Registered": "registered"}
+
+# Jam anomali (kolom anomaly) dikecualikan dari chart atau tetap dihitung dan ditandai
+ANOMALY_MODES = {"Kecualikan": "exclude", "Tandai": "highlight"}
+
+# Indeks per jam juga menyimpan bitmap penanda anomali
+HOUR_FILTER_COLUMNS = {**FILTER_COLUMNS, "anomaly": [0, 1]}
+
+# Jumlah hasil filter yang disimpan per proses
+MAX_CACHED = 16
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+class SortedIndex:
+    # Indeks tanggal terurut + bitmap (packbits) per nilai kategori untuk satu frame
+
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        dates = df["dteday"].to_numpy(dtype="datetime64[ns]")
+        # Frame hasil ingestion bisa saja tidak terurut; posisi asli disimpan di order
+        self.order = None
+        if len(dates) > 1 and (dates[1:] < dates[:-1]).any():
+            self.order = np.argsort(dates, kind="stable")
+            dates = dates[self.order]
+        self.dates = dates
+        self.bitmaps = {}
+        for column in columns:
+            values = df[column].to_numpy()
+            if self.order is not None:
+                values = values[self.order]
+            for value in np.unique(values):
+                self.bitmaps[(column, int(value))] = np.packbits(values == value)
+
+    def date_slice(self, start, end):
+        # Batas [lo, hi) untuk tanggal start..end (inklusif)
+        start = np.datetime64(pd.Timestamp(start), "ns")
+        end = np.datetime64(pd.Timestamp(end) + pd.Timedelta(days=1), "ns")
+        lo = int(np.searchsorted(self.dates, start, side="left"))
+        hi = int(np.searchsorted(self.dates, end, side="left"))
+        return lo, max(lo, hi)
+
+    def bitmap(self, column, value, lo, hi):
+        packed = self.bitmaps.get((column, value))
+        if packed is None:
+            return np.zeros(hi - lo, dtype=bool)
+        offset = lo % 8
+        bits = np.unpackbits(packed[lo // 8:(hi + 7) // 8])
+        return bits[offset:offset + hi - lo].view(bool)
+
+    def mask(self, lo, hi, selections):
+        # OR bitmap nilai terpilih per kolom, lalu AND antar kolom; hanya pada slice
+        mask = None
+        for column, values in selections.items():
+            selected = np.zeros(hi - lo, dtype=bool)
+            for value in values:
+                selected |= self.bitmap(column, value, lo, hi)
+            mask = selected if mask is None else mask & selected
+        return mask
+
+    def rows(self, df, lo, hi, selections):
+        mask = self.mask(lo, hi, selections)
+        if self.order is None and mask is None:
+            return df.iloc[lo:hi]
+        positions = np.arange(lo, hi) if self.order is None else self.order[lo:hi]
+        return df.iloc[positions if mask is None else positions[mask]]
+
+
+def get_index():
+    def build(hour_df, day_df):
+        return {"hour": SortedIndex(hour_df, HOUR_FILTER_COLUMNS), "day": SortedIndex(day_df)}
+    return get_artifact("filter_index", build)
+
+
+def filter_key(start, end, selections, user_type, bounds, anomalies="exclude"):
+    # None = tanpa filter (rentang penuh, semua kategori, semua pengguna, anomali dikecualikan)
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    selections = {c: tuple(sorted(v)) for c, v in selections.items()
+                  if set(v) != set(FILTER_COLUMNS[c])}
+    if (start <= bounds[0] and end >= bounds[1] and not selections and user_type == "cnt"
+            and anomalies == "exclude"):
+        return None
+    return (start.date().isoformat(), end.date().isoformat(),
+            tuple(sorted(selections.items())), user_type, anomalies)
+
+
+def month_range(start, end):
+    # Bulan pertama dan terakhir (year*12 + month-1) yang tercakup penuh oleh rentang
+    first = start.year * 12 + start.month - 1 + (start.day != 1)
+    last = end.year * 12 + end.month - 1 - (not end.is_month_end)
+    return first, last
+
+
+def month_start(code):
+    return pd.Timestamp(year=code // 12, month=code % 12 + 1, day=1)
+
+
+def split_range(start, end):
+    # Bulan penuh (first..last, kosong jika first > last) dan rentang tanggal di tepinya
+    first, last = month_range(start, end)
+    if first > last:
+        return first, last, [(start, end)]
+    edges = [(start, month_start(first) - pd.Timedelta(days=1)), (month_start(last + 1), end)]
+    return first, last, [(a, b) for a, b in edges if a <= b]
+
+
+def full_months(cells, first, last, selections):
+    # Mask sel (cube atau partisi momen) pada bulan penuh dan kategori terpilih
+    months = cells["year"].to_numpy().astype(np.int64) * 12 + cells["month"].to_numpy() - 1
+    mask = (months >= first) & (months <= last)
+    for column, values in selections.items():
+        mask &= cells[column].isin(values).to_numpy()
+    return mask
+
+
+def edge_rows(df, index, edges, selections):
+    for edge_start, edge_end in edges:
+        lo, hi = index.date_slice(edge_start, edge_end)
+        rows = index.rows(df, lo, hi, selections)
+        if len(rows):
+            yield rows
+
+
+def filter_cube(cube, df, index, keys, start, end, selections):
+    first, last, edges = split_range(start, end)
+    parts = []
+    if first <= last:
+        # Bulan penuh: langsung dari sel cube
+        parts.append(cube[full_months(cube, first, last, selections)])
+
+    # Bulan di tepi rentang: agregasi ulang baris hasil slice
+    for rows in edge_rows(df, index, edges, selections):
+        parts.append(build_cube(rows, keys))
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return cube.iloc[:0]
+    return merge_cubes(parts, keys) if len(parts) > 1 else parts[0].reset_index(drop=True)
+
+
+def filter_moments(partitions, df, index, start, end, selections):
+    # Sama seperti filter_cube: partisi bulan penuh digabung, tepi rentang dipindai
+    first, last, edges = split_range(start, end)
+    moments = Moments(partitions.columns)
+    if first <= last:
+        moments.merge(partitions.select(full_months(partitions.keys, first, last, selections)))
+    for rows in edge_rows(df, index, edges, selections):
+        moments.merge(Moments.from_frame(rows, partitions.columns))
+    return moments
+
+
+def measure_moments(moments, user_type):
+    # Padanan use_measure untuk momen: kolom cnt diganti jenis pengguna terpilih
+    if user_type == "cnt":
+        return moments
+    renamed = moments.subset([user_type if c == "cnt" else c for c in moments.columns])
+    renamed.columns = list(moments.columns)
+    return renamed
+
+
+def use_measure(cubes, day_df, user_type):
+    # Jenis pengguna terpilih menggantikan cnt sehingga semua chart ikut berubah
+    if user_type == "cnt":
+        return cubes, day_df
+    cubes = {name: cube.assign(cnt_sum=cube[f"{user_type}_sum"], cnt_sq=cube[f"{user_type}_sq"])
+             for name, cube in cubes.items()}
+    return cubes, day_df.assign(cnt=day_df[user_type])
+
+
+def compute_view(key):
+    hour_df, day_df = load_data()
+    cubes, index = get_cubes(include_anomalies=True), get_index()
+    start, end, selections, user_type, anomalies = key
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    selections = {c: list(v) for c, v in selections}
+    hour_selections = dict(selections, anomaly=[0]) if anomalies == "exclude" else selections
+
+    filtered = {
+        "hour": filter_cube(cubes["hour"], hour_df, index["hour"], HOUR_KEYS, start, end, hour_selections),
+        "day": filter_cube(cubes["day"], day_df, index["day"], DAY_KEYS, start, end, selections),
+    }
+    lo, hi = index["day"].date_slice(start, end)
+    days = index["day"].rows(day_df, lo, hi, selections)
+    moments = filter_moments(get_day_partitions(), day_df, index["day"], start, end, selections)
+    filtered, days = use_measure(filtered, days, user_type)
+    view = {"cubes": filtered, "day_df": days, "moments": measure_moments(moments, user_type)}
+    if anomalies == "highlight":
+        # Jam anomali pada rentang dan kategori terpilih, untuk ditandai di halaman
+        lo, hi = index["hour"].date_slice(start, end)
+        view["anomalies"] = index["hour"].rows(hour_df, lo, hi, dict(selections, anomaly=[1]))
+    return view
+
+
+def filtered_view(key):
+    # Hasil filter di-cache per (versi data, filter) dengan LRU kecil
+    if key is None:
+        hour_df, day_df = load_data()
+        return {"cubes": get_cubes(), "day_df": day_df, "moments": get_day_moments()}
+    cache_key = (data_version(), key)
+    with _lock:
+        view = _cache.get(cache_key)
+        if view is not None:
+            _cache.move_to_end(cache_key)
+            return view
+    view = compute_view(key)
+    with _lock:
+        _cache[cache_key] = view
+        while len(_cache) > MAX_CACHED:
+            _cache.popitem(last=False)
+    return view
+
+
+def select_days(clusters, day_df):
+    # Model cluster tetap dilatih dengan seluruh hari; tampilan dibatasi ke hari hasil filter
+    keep = np.isin(clusters["days"], day_df["dteday"].to_numpy())
+    return dict(clusters, days=clusters["days"][keep], labels=clusters["labels"][keep])
+
+
+# --- Pengukuran (python filters.py); kesetaraan diuji di tests/test_filters.py ---
+
+def random_keys(n, seed=0):
+    hour_df, day_df = load_data()
+    bounds = (day_df["dteday"].min(), day_df["dteday"].max())
+    days = pd.date_range(*bounds)
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        a, b = sorted(rng.choice(len(days), 2, replace=False))
+        selections = {c: [v for v in values if rng.random() < 0.7] or [values[0]]
+                      for c, values in FILTER_COLUMNS.items()}
+        user_type = rng.choice(list(USER_TYPES.values()))
+        anomalies = rng.choice(list(ANOMALY_MODES.values()))
+        yield filter_key(days[a], days[b], selections, str(user_type), bounds, str(anomalies))
+
+
+def measure(n=20, render=True):
+    # Latensi perubahan filter (tanpa cache) dan render satu chart dari hasilnya
+    from charts import hourly_figure, season_figure
+    from figure_cache import encode_figure
+
+    hour_df, _ = load_data()
+    start = time.perf_counter()
+    get_index()
+    index_seconds = time.perf_counter() - start
+    filters, renders = [], []
+    for key in random_keys(n, seed=1):
+        start = time.perf_counter()
+        view = compute_view(key)
+        filters.append(time.perf_counter() - start)
+        if render and len(view["day_df"]):
+            start = time.perf_counter()
+            for builder in (season_figure, hourly_figure):
+                encode_figure(builder(view["cubes"], view["day_df"]))
+            renders.append((time.perf_counter() - start) / 2)
+    return {
+        "hour_rows": len(hour_df),
+        "index_build_s": round(index_seconds, 3),
+        "filter_p50_ms": round(float(np.percentile(filters, 50)) * 1000, 1),
+        "filter_max_ms": round(max(filters) * 1000, 1),
+        "render_p50_s": round(float(np.percentile(renders, 50)), 3) if renders else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifikasi dan ukur filter global (gunakan BIKE_DATA_DIR untuk data sintetis)")
+    parser.add_argument("--verify", action="store_true",
+                        help="jalankan tests/test_filters.py (bandingkan dengan boolean mask atas seluruh baris)")
+    parser.add_argument("--n", type=int, default=20, help="jumlah kombinasi filter acak")
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(run_tests("test_filters.py"))
+    else:
+        print(json.dumps(measure(args.n)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+import argparse
+import json
+import os
+import time
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from data_loader import get_artifact, load_data, model_path, save_npz
+
+# Prakiraan cnt per jam: baseline musiman per jam-dalam-minggu (168 kolom
+# one-hot) ditambah ridge regression atas fitur kalender dan cuaca, dengan
+# target log1p(cnt) karena pengaruh cuaca bersifat multiplikatif. Model
+# disimpan sebagai statistik cukup X'X, X'y, y'y sehingga data baru cukup
+# ditambahkan (X_baru'X_baru) lalu sistem p x p diselesaikan ulang; tidak ada
+# iterasi gradien maupun scan ulang data lama.
+
+HOURS_PER_WEEK = 168
+SEASONS = [1, 2, 3, 4]
+WEATHERS = [1, 2, 3, 4]
+
+FEATURES = (
+    ["intercept"]
+    + [f"how_{i}" for i in range(HOURS_PER_WEEK)]
+    + [f"season_{s}" for s in SEASONS]
+    + [f"weathersit_{w}" for w in WEATHERS]
+    + ["workingday", "holiday", "trend", "temp", "temp_sq", "hum", "windspeed"]
+)
+HOW_OFFSET = 1
+SEASON_OFFSET = HOW_OFFSET + HOURS_PER_WEEK
+WEATHER_OFFSET = SEASON_OFFSET + len(SEASONS)
+NUMERIC_OFFSET = WEATHER_OFFSET + len(WEATHERS)
+# Kolom kategori (termasuk workingday/holiday) dan jumlah sel kombinasinya
+CATEGORICAL_COLUMNS = NUMERIC_OFFSET + 2
+CELL_SHAPE = (HOURS_PER_WEEK, len(SEASONS), len(WEATHERS), 2, 2)
+
+# Kekuatan regularisasi (intercept tidak dipenalti)
+DEFAULT_ALPHA = 1.0
+
+# Naikkan jika susunan fitur berubah agar model tersimpan dilatih ulang
+FEATURE_VERSION = 2
+MODEL_NAME = "forecast-ridge"
+
+# Kolom yang dibaca model; hash barisnya menandai riwayat yang berubah
+MODEL_COLUMNS = ["dteday", "hr", "weekday", "season", "weathersit", "workingday", "holiday",
+                 "temp", "hum", "windspeed", "cnt"]
+
+# Horizon prakiraan di dashboard (jam)
+HORIZONS = {"Besok (24 jam)": 24, "7 hari ke depan (168 jam)": 168}
+
+# Prediksi memakai matriks desain per blok baris agar memori tetap kecil pada data besar
+BATCH_ROWS = 50_000
+
+# Panjang riwayat untuk rata-rata cuaca default dan periode uji backtest (hari)
+WEATHER_WINDOW_DAYS = 7
+BACKTEST_DAYS = 28
+
+
+def hour_times(df):
+    return df["dteday"].to_numpy(dtype="datetime64[ns]") + df["hr"].to_numpy().astype("timedelta64[h]")
+
+
+def categorical_codes(df):
+    # Kode (jam-dalam-minggu, musim, cuaca, hari kerja, libur) per baris
+    return (df["weekday"].to_numpy().astype(np.int64) * 24 + df["hr"].to_numpy(),
+            df["season"].to_numpy().astype(np.int64) - 1,
+            df["weathersit"].to_numpy().astype(np.int64) - 1,
+            df["workingday"].to_numpy().astype(np.int64),
+            df["holiday"].to_numpy().astype(np.int64))
+
+
+def categorical_matrix(how, season, weathersit, workingday, holiday):
+    # Kolom intercept s.d. holiday dari matriks desain, dibangun dengan indexing
+    n = len(how)
+    C = np.zeros((n, CATEGORICAL_COLUMNS))
+    rows = np.arange(n)
+    C[:, 0] = 1.0
+    C[rows, HOW_OFFSET + how] = 1.0
+    C[rows, SEASON_OFFSET + season] = 1.0
+    C[rows, WEATHER_OFFSET + weathersit] = 1.0
+    C[:, NUMERIC_OFFSET] = workingday
+    C[:, NUMERIC_OFFSET + 1] = holiday
+    return C
+
+
+def numeric_matrix(df, origin):
+    # Kolom trend (tahun sejak origin) dan cuaca
+    temp = df["temp"].to_numpy(dtype=float)
+    days = (df["dteday"].to_numpy(dtype="datetime64[ns]") - np.datetime64(origin, "ns")) / np.timedelta64(1, "D")
+    return np.column_stack([
+        days / 365.0,
+        temp,
+        temp ** 2,
+        df["hum"].to_numpy(dtype=float),
+        df["windspeed"].to_numpy(dtype=float),
+    ])
+
+
+def rows_hash(df):
+    # Jumlah hash per baris (modulo 2^64): tidak bergantung urutan dan bisa
+    # ditambah per batch, jadi model yang hanya bertambah barisnya tetap cocok
+    return int(pd.util.hash_pandas_object(df[MODEL_COLUMNS], index=False).to_numpy().sum())
+
+
+def combine_hashes(a, b):
+    return (a + b) % 2**64
+
+
+def design_matrix(df, origin):
+    return np.hstack([categorical_matrix(*categorical_codes(df)), numeric_matrix(df, origin)])
+
+
+class ForecastModel:
+    # Statistik cukup ridge regression yang bisa ditambah per batch
+
+    def __init__(self, origin, alpha=DEFAULT_ALPHA, xtx=None, xty=None, yty=0.0, how_sum=None, n=0,
+                 last_time=None, seen_hash=0):
+        p = len(FEATURES)
+        self.origin = np.datetime64(origin, "ns")
+        self.alpha = float(alpha)
+        self.xtx = np.zeros((p, p)) if xtx is None else np.asarray(xtx, dtype=float)
+        self.xty = np.zeros(p) if xty is None else np.asarray(xty, dtype=float)
+        self.yty = float(yty)
+        # Jumlah cnt (skala asli) per jam-dalam-minggu untuk baseline
+        self.how_sum = np.zeros(HOURS_PER_WEEK) if how_sum is None else np.asarray(how_sum, dtype=float)
+        self.n = int(n)
+        self.last_time = last_time
+        # Hash baris yang sudah masuk ke statistik (lihat rows_hash)
+        self.seen_hash = int(seen_hash)
+        self._coef = None
+
+    def update(self, df):
+        if len(df) == 0:
+            return self
+        # Kolom kategori konstan di dalam satu sel (jam-dalam-minggu, musim,
+        # cuaca, hari kerja, libur): bagian X'X-nya cukup dihitung dari jumlah
+        # per sel, jadi hanya 5 kolom numerik yang diproses per baris
+        codes = categorical_codes(df)
+        cell = np.ravel_multi_index(codes, CELL_SHAPE)
+        cells = int(np.prod(CELL_SHAPE))
+        N = numeric_matrix(df, self.origin)
+        cnt = df["cnt"].to_numpy(dtype=float)
+        y = np.log1p(cnt)
+
+        count = np.bincount(cell, minlength=cells)
+        present = np.flatnonzero(count)
+        sum_n = np.column_stack([np.bincount(cell, N[:, j], minlength=cells)[present] for j in range(N.shape[1])])
+        sum_y = np.bincount(cell, y, minlength=cells)[present]
+        C = categorical_matrix(*np.unravel_index(present, CELL_SHAPE))
+
+        k = CATEGORICAL_COLUMNS
+        self.xtx[:k, :k] += C.T @ (C * count[present, None])
+        cross = C.T @ sum_n
+        self.xtx[:k, k:] += cross
+        self.xtx[k:, :k] += cross.T
+        self.xtx[k:, k:] += N.T @ N
+        self.xty[:k] += C.T @ sum_y
+        self.xty[k:] += N.T @ y
+        self.yty += float(y @ y)
+        self.how_sum += np.bincount(codes[0], cnt, minlength=HOURS_PER_WEEK)
+        self.n += len(df)
+        self.seen_hash = combine_hashes(self.seen_hash, rows_hash(df))
+        last = hour_times(df).max()
+        self.last_time = last if self.last_time is None else max(self.last_time, last)
+        self._coef = None
+        return self
+
+    @property
+    def coef(self):
+        # (X'X + alpha*I) b = X'y, intercept tanpa penalti
+        if self._coef is None:
+            penalty = np.full(len(FEATURES), self.alpha)
+            penalty[0] = 0.0
+            self._coef = np.linalg.solve(self.xtx + np.diag(penalty), self.xty)
+        return self._coef
+
+    @property
+    def sigma(self):
+        # Simpangan baku residual (skala log) dari statistik cukup: y'y - 2b'X'y + b'X'Xb
+        b = self.coef
+        sse = self.yty - 2 * b @ self.xty + b @ self.xtx @ b
+        return float(np.sqrt(max(sse, 0.0) / max(self.n - len(FEATURES), 1)))
+
+    def baseline(self, df):
+        # Rata-rata historis per jam-dalam-minggu; jumlah baris = diagonal X'X pada kolom one-hot
+        counts = np.diag(self.xtx)[HOW_OFFSET:HOW_OFFSET + HOURS_PER_WEEK]
+        means = np.divide(self.how_sum, counts, out=np.full(HOURS_PER_WEEK, np.nan), where=counts > 0)
+        how = df["weekday"].to_numpy().astype(np.int64) * 24 + df["hr"].to_numpy()
+        return means[how]
+
+    def predict_log(self, df):
+        return np.concatenate([design_matrix(df.iloc[start:start + BATCH_ROWS], self.origin) @ self.coef
+                               for start in range(0, max(len(df), 1), BATCH_ROWS)])
+
+    def predict(self, df):
+        return np.expm1(self.predict_log(df))
+
+    def save(self, path):
+        # Ditulis atomik (tmp + os.replace) karena sesi lain bisa sedang memuatnya
+        save_npz(path, xtx=self.xtx, xty=self.xty, yty=self.yty, how_sum=self.how_sum, n=self.n, alpha=self.alpha,
+                 origin=self.origin, last_time=self.last_time, seen_hash=np.uint64(self.seen_hash),
+                 version=FEATURE_VERSION)
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if (int(data["version"]) != FEATURE_VERSION or data["xtx"].shape[0] != len(FEATURES)
+                    or "seen_hash" not in data.files):
+                return None
+            return cls(data["origin"], float(data["alpha"]), data["xtx"], data["xty"],
+                       float(data["yty"]), data["how_sum"], int(data["n"]), data["last_time"],
+                       int(data["seen_hash"]))
+
+
+def fit_model(hour_df, alpha=DEFAULT_ALPHA, path=None):
+    # Model tersimpan dipakai ulang; hanya jam setelah last_time yang ditambahkan
+    path = path or model_path(MODEL_NAME)
+    times = hour_times(hour_df)
+    model = ForecastModel.load(path)
+    if model is not None:
+        seen = times <= model.last_time
+        # Riwayat berubah (bukan sekadar bertambah; termasuk CSV lain dengan
+        # jumlah baris sama) atau alpha lain: latih ulang
+        if model.alpha != alpha or seen.sum() != model.n or rows_hash(hour_df[seen]) != model.seen_hash:
+            model = None
+    if model is None:
+        model = ForecastModel(hour_df["dteday"].min(), alpha)
+        seen = np.zeros(len(hour_df), dtype=bool)
+    if not seen.all():
+        model.update(hour_df[~seen])
+        model.save(path)
+    return model
+
+
+def training_rows(hour_df):
+    # Jam anomali (lihat anomaly.py) tidak ikut melatih model
+    return hour_df[hour_df["anomaly"] == 0]
+
+
+def get_forecaster():
+    return get_artifact("forecast_model", lambda hour_df, day_df: fit_model(training_rows(hour_df)))
+
+
+def season_lookup(day_df):
+    # Musim per (bulan*100 + tanggal) dari data historis untuk tanggal di masa depan
+    dates = day_df["dteday"]
+    return day_df.groupby(dates.dt.month * 100 + dates.dt.day)["season"].first()
+
+
+def future_frame(hour_df, day_df, hours, weathersit=None):
+    # Fitur untuk `hours` jam setelah data terakhir. Cuaca (temp/hum/windspeed)
+    # memakai rata-rata per jam dari WEATHER_WINDOW_DAYS hari terakhir;
+    # weathersit bisa ditentukan pengguna
+    times = hour_times(hour_df)
+    last = times.max()
+    future = pd.DatetimeIndex(last + np.arange(1, hours + 1) * np.timedelta64(1, "h"))
+
+    recent = hour_df[times > last - np.timedelta64(WEATHER_WINDOW_DAYS, "D")]
+    by_hour = recent.groupby("hr")
+    climate = by_hour[["temp", "hum", "windspeed"]].mean().reindex(range(24))
+    climate = climate.fillna(recent[["temp", "hum", "windspeed"]].mean())
+    usual_weather = by_hour["weathersit"].agg(lambda s: s.mode().iloc[0]).reindex(range(24)).fillna(1)
+
+    seasons = season_lookup(day_df)
+    hr = future.hour.to_numpy()
+    weekday = (future.dayofweek.to_numpy() + 1) % 7
+    frame = pd.DataFrame({
+        "time": future,
+        "dteday": future.normalize(),
+        "hr": hr,
+        "weekday": weekday,
+        # Hari libur di masa depan tidak diketahui
+        "holiday": 0,
+        "workingday": ((weekday >= 1) & (weekday <= 5)).astype(int),
+        "season": seasons.reindex(future.month * 100 + future.day).fillna(1).to_numpy().astype(int),
+        "weathersit": usual_weather.to_numpy()[hr].astype(int) if weathersit is None else weathersit,
+        "temp": climate["temp"].to_numpy()[hr],
+        "hum": climate["hum"].to_numpy()[hr],
+        "windspeed": climate["windspeed"].to_numpy()[hr],
+    })
+    return frame
+
+
+def forecast(hours=24, weathersit=None, level=0.95):
+    hour_df, day_df = load_data()
+    model = get_forecaster()
+    frame = future_frame(hour_df, day_df, hours, weathersit)
+    # Pita prakiraan dihitung di skala log lalu dikembalikan ke skala cnt
+    log_prediction = model.predict_log(frame)
+    margin = NormalDist().inv_cdf((1 + level) / 2) * model.sigma
+    return pd.DataFrame({
+        "time": frame["time"],
+        "forecast": np.expm1(log_prediction),
+        "lower": np.expm1(log_prediction - margin),
+        "upper": np.expm1(log_prediction + margin),
+        "baseline": model.baseline(frame),
+    })
+
+
+def recent_history(hour_df, days=WEATHER_WINDOW_DAYS):
+    # cnt aktual per jam untuk `days` hari terakhir (rata-rata antar kota jika multi-kota)
+    times = hour_times(hour_df)
+    recent = times > times.max() - np.timedelta64(days, "D")
+    history = pd.DataFrame({"time": times[recent], "cnt": hour_df["cnt"].to_numpy()[recent]})
+    return history.groupby("time", as_index=False)["cnt"].mean()
+
+
+def backtest(hour_df, days=BACKTEST_DAYS, alpha=DEFAULT_ALPHA):
+    # Latih pada data sebelum `days` hari terakhir, uji pada sisanya (cuaca aktual)
+    times = hour_times(hour_df)
+    cutoff = times.max() - np.timedelta64(days, "D")
+    train, test = hour_df[times <= cutoff], hour_df[times > cutoff]
+    model = ForecastModel(train["dteday"].min(), alpha).update(training_rows(train))
+    actual = test["cnt"].to_numpy(dtype=float)
+    result = {"train_rows": len(train), "test_rows": len(test)}
+    for name, predicted in (("model", model.predict(test)), ("baseline", model.baseline(test))):
+        error = predicted - actual
+        result[f"{name}_mae"] = round(float(np.abs(error).mean()), 2)
+        result[f"{name}_rmse"] = round(float(np.sqrt((error ** 2).mean())), 2)
+    return result
+
+
+def get_backtest():
+    return get_artifact("forecast_backtest", lambda hour_df, day_df: backtest(hour_df))
+
+
+# --- Pengukuran (python forecast.py --measure) ---
+
+def measure(prediction_hours=10_000, path=None):
+    import tempfile
+
+    hour_df, day_df = load_data()
+    path = path or os.path.join(tempfile.mkdtemp(), f"{MODEL_NAME}.npz")
+    # Latih penuh pada semua jam kecuali satu minggu terakhir, lalu tambahkan minggu itu
+    train = training_rows(hour_df)
+    times = hour_times(train)
+    older = train[times <= times.max() - np.timedelta64(7, "D")]
+    start = time.perf_counter()
+    fit_model(older, path=path)
+    full_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    model = fit_model(train, path=path)
+    model.coef
+    incremental_seconds = time.perf_counter() - start
+
+    frame = future_frame(hour_df, day_df, prediction_hours)
+    start = time.perf_counter()
+    model.predict(frame)
+    predict_seconds = time.perf_counter() - start
+    return {
+        "hour_rows": len(hour_df),
+        "features": len(FEATURES),
+        "full_fit_s": round(full_seconds, 3),
+        "incremental_fit_s": round(incremental_seconds, 3),
+        "predict_hours": prediction_hours,
+        "predict_ms": round(predict_seconds * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prakiraan cnt per jam (gunakan BIKE_DATA_DIR untuk data lain)")
+    parser.add_argument("--hours", type=int, default=24, help="jumlah jam yang diprakirakan")
+    parser.add_argument("--evaluate", action="store_true", help=f"backtest {BACKTEST_DAYS} hari terakhir")
+    parser.add_argument("--measure", action="store_true", help="ukur waktu training dan prediksi")
+    args = parser.parse_args()
+
+    if args.evaluate:
+        hour_df, _ = load_data()
+        print(json.dumps(backtest(hour_df)))
+    elif args.measure:
+        print(json.dumps(measure()))
+    else:
+        print(forecast(args.hours).round(1).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+import argparse
+import bisect
+import logging
+import os
+import shutil
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+from anomaly import fit_detector, flag_anomalies
+from cube import DAY_KEYS, HOUR_KEYS, IncrementalCube, build_cube, get_cubes
+from data_loader import Lazy, get_artifact
+from pipeline import add_features, compact_dtypes, concat_prepared
+from schema import HOUR_SCHEMA, check
+from stats import get_day_moments
+
+# Skema hour.csv / day.csv (urutan kolom file)
+HOUR_COLUMNS = list(HOUR_SCHEMA)
+DAY_COLUMNS = [c for c in HOUR_COLUMNS if c != "hr"]
+
+CALENDAR_COLUMNS = ["season", "yr", "mnth", "holiday", "weekday", "workingday"]
+WEATHER_COLUMNS = ["temp", "atemp", "hum", "windspeed"]
+COUNT_COLUMNS = ["casual", "registered", "cnt"]
+
+# Folder tempat sistem lain menaruh batch baru (format hour.csv)
+INBOX_DIR = os.environ.get("BIKE_INBOX_DIR")
+
+_lock = threading.Lock()
+_ingestor = None
+
+logger = logging.getLogger(__name__)
+
+
+def hour_keys(df):
+    # Kunci unik per jam: jumlah jam sejak epoch sampai (dteday, hr)
+    return df["dteday"].to_numpy().astype("datetime64[h]").astype(np.int64) + df["hr"].to_numpy().astype(np.int64)
+
+
+class HourlyIngestor:
+    # Menambahkan baris per jam ke data yang sudah di-cache tanpa membangun
+    # ulang semuanya. Setiap append hanya memperkaya baris batch, memperbarui
+    # rollup harian untuk hari yang tersentuh, menambah cube secara inkremental,
+    # dan menilai baris batch dengan detektor anomali online (state per slot
+    # jam-dalam-minggu, lihat anomaly.py).
+
+    def __init__(self):
+        hour_df, day_df = data_loader.load_data()
+        cubes = get_cubes(include_anomalies=True)
+
+        # Semua jam tersimpan di hour_df (anomali hanya ditandai), jadi jumlah
+        # jam per (hari, cuaca) bisa dihitung langsung tanpa membaca CSV mentah
+        self.detector = get_detector().copy()
+        self.day_weather = hour_df.groupby(["dteday", "weathersit"]).size()
+        self.day_hours = self.day_weather.groupby(level=0).sum().to_dict()
+        self.next_hour_instant = int(hour_df["instant"].max()) + 1
+        # Jam yang sudah tercatat (terurut) ditambah jam dari batch sebelumnya,
+        # untuk membuang baris batch yang dikirim ulang
+        self.known_hours = np.sort(hour_keys(hour_df))
+        self.new_hours = set()
+
+        self.hour_chunks = [hour_df]
+        self.base_days = day_df
+        self.base_pos = {day: i for i, day in enumerate(day_df["dteday"])}
+        self.next_day_instant = int(day_df["instant"].max()) + 1
+        # Hari baru (di luar day.csv awal), terurut menurut tanggal
+        self.new_days = []
+        # Akumulator dan baris harian terbaru untuk hari yang tersentuh ingestion
+        self.day_state = {}
+        self.day_rows = {}
+        # Jumlah baris harian yang saat ini tertulis di day.csv
+        self.persisted_days = len(day_df)
+        self.cubes = {
+            "hour": IncrementalCube(cubes["hour"], HOUR_KEYS),
+            "day": IncrementalCube(cubes["day"], DAY_KEYS),
+        }
+        # Momen harian untuk korelasi/regresi, diperbarui bersama day cube
+        self.moments = get_day_moments().copy()
+        self.version = data_loader.data_version()
+        self._chunks_lock = threading.Lock()
+
+    def is_new(self, batch):
+        # Mask baris batch yang (dteday, hr)-nya belum ada di riwayat maupun
+        # muncul lebih awal di batch yang sama
+        keys = hour_keys(batch)
+        pos = np.minimum(np.searchsorted(self.known_hours, keys), len(self.known_hours) - 1)
+        known = self.known_hours[pos] == keys
+        known |= np.fromiter((k in self.new_hours for k in keys.tolist()), dtype=bool, count=len(keys))
+        known |= pd.Series(keys).duplicated().to_numpy()
+        return ~known
+
+    def append(self, batch):
+        # batch sudah dinormalisasi oleh normalize_batch dan bebas duplikat
+        self.next_hour_instant = int(batch["instant"].max()) + 1
+        self.new_hours.update(hour_keys(batch).tolist())
+
+        # Setiap baris dinilai terhadap state slotnya lalu state diperbarui (O(1) per baris)
+        flagged = flag_anomalies(batch, self.detector)
+        enriched = compact_dtypes(add_features(flagged))
+        self.cubes["hour"].add(build_cube(enriched, HOUR_KEYS))
+        with self._chunks_lock:
+            self.hour_chunks.append(enriched)
+
+        touched = self._update_days(batch)
+        return {
+            "received": len(batch),
+            "anomalies": int(enriched["anomaly"].sum()),
+            "days": touched,
+        }
+
+    def _update_days(self, batch):
+        grouped = batch.groupby("dteday", sort=True)
+        sums = grouped[COUNT_COLUMNS + WEATHER_COLUMNS].sum()
+        calendar = grouped[CALENDAR_COLUMNS].first()
+        hours = grouped.size()
+        weather = batch.groupby(["dteday", "weathersit"]).size()
+
+        touched = []
+        for day in sums.index:
+            state = self.day_state.get(day) or self._initial_state(day, calendar.loc[day])
+            state["hours"] += int(hours[day])
+            state["sums"] += sums.loc[day].to_numpy(dtype=float)
+            for weathersit, count in weather.loc[day].items():
+                state["weather"][weathersit] = state["weather"].get(weathersit, 0) + int(count)
+            self.day_state[day] = state
+
+            # Kontribusi baris harian lama dikurangi dari cube, lalu baris baru ditambahkan
+            old_row = self.current_day_row(day)
+            new_row = self._day_row(day, state)
+            if old_row is not None:
+                self.cubes["day"].add(build_cube(old_row, DAY_KEYS), sign=-1)
+                self.moments.remove_rows(old_row)
+            self.cubes["day"].add(build_cube(new_row, DAY_KEYS))
+            self.moments.add_rows(new_row)
+            self.day_rows[day] = new_row
+            touched.append(day)
+        return touched
+
+    def _initial_state(self, day, calendar):
+        state = {"hours": 0, "sums": np.zeros(len(COUNT_COLUMNS) + len(WEATHER_COLUMNS)), "weather": {}}
+        pos = self.base_pos.get(day)
+        if pos is None:
+            state["instant"] = self.next_day_instant
+            state["calendar"] = calendar.to_dict()
+            self.next_day_instant += 1
+            bisect.insort(self.new_days, day)
+            return state
+
+        # Hari yang sudah ada di day.csv: lanjutkan dari nilai hariannya
+        base = self.base_days.iloc[pos]
+        hours = self.day_hours.get(day, 24)
+        state["instant"] = int(base["instant"])
+        state["calendar"] = {c: int(base[c]) for c in CALENDAR_COLUMNS}
+        state["hours"] = hours
+        state["sums"] = np.concatenate([
+            base[COUNT_COLUMNS].to_numpy(dtype=float),
+            base[WEATHER_COLUMNS].to_numpy(dtype=float) * hours,
+        ])
+        if day in self.day_hours:
+            state["weather"] = {int(w): int(c) for w, c in self.day_weather.loc[day].items()}
+        else:
+            state["weather"] = {int(base["weathersit"]): hours}
+        return state
+
+    def current_day_row(self, day):
+        if day in self.day_rows:
+            return self.day_rows[day]
+        pos = self.base_pos.get(day)
+        return None if pos is None else self.base_days.iloc[[pos]]
+
+    def _day_row(self, day, state):
+        counts = state["sums"][:len(COUNT_COLUMNS)]
+        means = state["sums"][len(COUNT_COLUMNS):] / state["hours"]
+        row = {"instant": state["instant"], "dteday": day, **state["calendar"]}
+        # Cuaca harian = kondisi yang paling sering muncul pada hari itu
+        row["weathersit"] = max(state["weather"], key=state["weather"].get)
+        row.update(zip(WEATHER_COLUMNS, means))
+        row.update(zip(COUNT_COLUMNS, counts.astype(np.int64)))
+        frame = pd.DataFrame([row], columns=DAY_COLUMNS)
+        return compact_dtypes(add_features(frame))
+
+    def day_position(self, day):
+        # Posisi hari di day.csv: hari dari file awal, lalu hari baru terurut
+        pos = self.base_pos.get(day)
+        if pos is None:
+            pos = len(self.base_days) + bisect.bisect_left(self.new_days, day)
+        return pos
+
+    def day_at(self, pos):
+        if pos < len(self.base_days):
+            return self.base_days["dteday"].iloc[pos]
+        return self.new_days[pos - len(self.base_days)]
+
+    def snapshot(self):
+        # Salinan dangkal state saat publish; frame lengkap baru dirangkai saat dibutuhkan
+        with self._chunks_lock:
+            chunks = tuple(self.hour_chunks)
+        return Lazy(lambda: self.frames(chunks, dict(self.day_rows), list(self.new_days)))
+
+    def frames(self, chunks, day_rows, new_days):
+        # Penggabungan O(riwayat) hanya terjadi saat halaman benar-benar membutuhkan frame lengkap
+        hour_df = concat_prepared(chunks) if len(chunks) > 1 else chunks[0]
+        with self._chunks_lock:
+            # Potongan yang sudah digabung diganti hasilnya agar tidak digabung ulang
+            if len(self.hour_chunks) >= len(chunks) and all(
+                    a is b for a, b in zip(self.hour_chunks, chunks)):
+                self.hour_chunks[:len(chunks)] = [hour_df]
+
+        day_df = self.base_days
+        updated = [self.base_pos[d] for d in day_rows if d in self.base_pos]
+        if updated or new_days:
+            parts = [day_df.drop(index=day_df.index[updated])]
+            parts += [day_rows[d] for d in day_rows if d in self.base_pos]
+            parts += [day_rows[d] for d in new_days if d in day_rows]
+            day_df = concat_prepared(parts).sort_values("dteday", kind="stable").reset_index(drop=True)
+        return hour_df, day_df
+
+
+def get_detector():
+    # State detektor anomali setelah seluruh hour_df, dihitung sekali per versi data
+    return get_artifact("anomaly_detector", lambda hour_df, day_df: fit_detector(hour_df))
+
+
+def normalize_batch(batch, ingestor):
+    missing = [c for c in HOUR_COLUMNS if c not in batch.columns and c != "instant"]
+    if missing:
+        raise ValueError(f"Kolom batch tidak sesuai skema hour.csv: {', '.join(missing)}")
+    batch = batch.copy()
+    numbered = "instant" in batch.columns
+    if not numbered:
+        batch["instant"] = np.arange(ingestor.next_hour_instant, ingestor.next_hour_instant + len(batch))
+    batch = batch[HOUR_COLUMNS].reset_index(drop=True)
+    check(batch, HOUR_SCHEMA, "batch")
+    batch["dteday"] = pd.to_datetime(batch["dteday"])
+    # Jam yang sudah ada tidak dihitung dua kali (mis. file yang sama dikirim ulang)
+    new = ingestor.is_new(batch)
+    duplicates = int((~new).sum())
+    if duplicates:
+        batch = batch[new].reset_index(drop=True)
+        if not numbered:
+            batch["instant"] = np.arange(ingestor.next_hour_instant, ingestor.next_hour_instant + len(batch))
+    return batch, duplicates
+
+
+def get_ingestor():
+    global _ingestor
+    # Ingestor dibangun ulang jika data di cache berubah dari luar (mis. CSV diganti)
+    if _ingestor is None or _ingestor.version != data_loader.data_version():
+        _ingestor = HourlyIngestor()
+    return _ingestor
+
+
+def append_hours(batch, persist=False):
+    # Tambahkan batch baris per jam (skema hour.csv). Biaya sebanding ukuran
+    # batch; frame lengkap dan cube baru dimaterialisasi saat dibaca.
+    with _lock:
+        ingestor = get_ingestor()
+        batch, duplicates = normalize_batch(batch, ingestor)
+        if batch.empty:
+            return {"received": 0, "duplicates": duplicates, "anomalies": 0, "days": [],
+                    "version": ingestor.version}
+        summary = ingestor.append(batch)
+        summary["duplicates"] = duplicates
+
+        new_key = persist_batch(ingestor, batch, summary["days"]) if persist else None
+        hour_cube, day_cube = ingestor.cubes["hour"], ingestor.cubes["day"]
+        entry = data_loader.publish(
+            ingestor.snapshot(),
+            {
+                "cube": Lazy(lambda: {"hour": hour_cube.to_frame(), "day": day_cube.to_frame()}),
+                "day_moments": ingestor.moments.copy(),
+                "anomaly_detector": ingestor.detector.copy(),
+            },
+            new_key=new_key,
+        )
+        ingestor.version = entry["version"]
+        summary["version"] = entry["version"]
+        return summary
+
+
+def persist_batch(ingestor, batch, touched_days):
+    # hour.csv cukup di-append; day.csv hanya ditulis ulang mulai baris hari
+    # pertama yang tersentuh (biasanya hanya baris terakhir file)
+    data_dir = data_loader.resolve_data_dir()
+    hour_path = os.path.join(data_dir, data_loader.HOUR_FILE)
+    day_path = os.path.join(data_dir, data_loader.DAY_FILE)
+
+    raw = batch.copy()
+    raw["dteday"] = raw["dteday"].dt.strftime("%Y-%m-%d")
+    raw.to_csv(hour_path, mode="a", header=False, index=False)
+
+    total_days = len(ingestor.base_days) + len(ingestor.new_days)
+    start = min([ingestor.day_position(d) for d in touched_days] + [ingestor.persisted_days])
+    truncate_last_lines(day_path, ingestor.persisted_days - start)
+    rows = [ingestor.current_day_row(ingestor.day_at(pos))[DAY_COLUMNS] for pos in range(start, total_days)]
+    if rows:
+        day_rows = pd.concat(rows, ignore_index=True)
+        day_rows["dteday"] = day_rows["dteday"].dt.strftime("%Y-%m-%d")
+        day_rows.to_csv(day_path, mode="a", header=False, index=False)
+    ingestor.persisted_days = total_days
+
+    return data_loader.data_signature()
+
+
+def truncate_last_lines(path, n_lines, block_size=65536):
+    # Potong n baris terakhir file dengan membaca dari belakang
+    if n_lines <= 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        # Abaikan newline penutup file
+        f.seek(pos - 1)
+        if f.read(1) == b"\n":
+            pos -= 1
+        newlines = 0
+        while pos > 0:
+            start = max(pos - block_size, 0)
+            f.seek(start)
+            chunk = f.read(pos - start)
+            idx = len(chunk)
+            while True:
+                idx = chunk.rfind(b"\n", 0, idx)
+                if idx < 0:
+                    break
+                newlines += 1
+                if newlines == n_lines:
+                    f.truncate(start + idx + 1)
+                    return
+            pos = start
+        raise ValueError(f"{path} memiliki kurang dari {n_lines} baris")
+
+
+def poll_inbox():
+    # Dipanggil dashboard di setiap rerun: batch baru di folder inbox langsung
+    # digabungkan ke data yang sudah di-cache (biaya jika kosong: satu stat).
+    # Batch yang tidak lolos validasi dipindah ke inbox/failed/ beserta
+    # alasannya, sehingga halaman tetap dirender dan file tidak diproses ulang.
+    inbox = inbox_dir()
+    if not os.path.isdir(inbox):
+        return []
+    results = []
+    for entry in sorted(os.scandir(inbox), key=lambda e: e.name):
+        if not entry.name.endswith(".csv") or not entry.is_file():
+            continue
+        # Klaim file dengan rename agar hanya satu proses yang memprosesnya
+        claimed = f"{entry.path}.{uuid.uuid4().hex}.processing"
+        try:
+            os.rename(entry.path, claimed)
+        except OSError:
+            continue
+        try:
+            result = append_hours(pd.read_csv(claimed), persist=True)
+            folder = os.path.join(inbox, "processed")
+        except ValueError as error:
+            # Termasuk error parsing CSV (ParserError/EmptyDataError turunan ValueError)
+            logger.warning("Batch %s gagal diproses: %s", entry.name, error)
+            result = {"file": entry.name, "error": str(error)}
+            folder = os.path.join(inbox, "failed")
+        os.makedirs(folder, exist_ok=True)
+        shutil.move(claimed, os.path.join(folder, entry.name))
+        if "error" in result:
+            with open(os.path.join(folder, f"{entry.name}.error.txt"), "w") as f:
+                f.write(f"{result['error']}\n")
+        results.append(result)
+    return results
+
+
+def inbox_dir():
+    return INBOX_DIR or os.path.join(data_loader.resolve_data_dir(), "inbox")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kirim batch baris per jam (format hour.csv) ke dashboard")
+    parser.add_argument("batch", help="file CSV dengan skema hour.csv")
+    args = parser.parse_args()
+
+    # File ditaruh di inbox secara atomik; dashboard yang berjalan akan
+    # memprosesnya pada rerun berikutnya
+    inbox = inbox_dir()
+    os.makedirs(inbox, exist_ok=True)
+    target = os.path.join(inbox, f"{pd.Timestamp.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.csv")
+    shutil.copy(args.batch, target + ".tmp")
+    os.replace(target + ".tmp", target)
+    print(f"Batch dikirim ke {target}")
+
+
+if __name__ == "__main__":
+    main()
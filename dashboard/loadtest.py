@@ -0,0 +1,264 @@
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+
+import numpy as np
+
+from benchmark import PAGES, SCRIPT, VISUALIZATION
+from diagnostics import current_rss
+
+# Load test beberapa sesi bersamaan terhadap satu worker dashboard.py.
+# Setiap sesi adalah AppTest (streamlit.testing) di thread sendiri yang
+# berpindah halaman dan memilih pertanyaan di selectbox, sama seperti pengguna
+# yang berbagi satu proses server. Jumlah sesi dinaikkan bertahap (--sessions
+# 1,2,4,8) untuk melihat kapan latensi rerun mulai runtuh, dan hasilnya bisa
+# dipakai sebagai gerbang (exit code 1) untuk perubahan yang menyangkut skala.
+
+QUESTION_LABEL = "Pilih pertanyaan analisis:"
+
+# Peluang sesi memilih pertanyaan lain setelah membuka halaman visualisasi
+QUESTION_PROBABILITY = 0.7
+
+# Interval pencatatan RSS dan jumlah rerun (detik)
+SAMPLE_SECONDS = 1.0
+
+
+@contextmanager
+def shared_runtime():
+    # AppTest memasang Runtime tiruan per run dan mengosongkannya setelah run
+    # selesai, sehingga dengan beberapa sesi paralel run yang selesai lebih
+    # dulu menghapus Runtime run lain. Selama load test, Runtime yang kosong
+    # diganti satu Runtime bersama (seperti satu proses server).
+    from unittest.mock import MagicMock
+
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    original = Runtime.__dict__["instance"], Runtime.__dict__["exists"]
+    Runtime.instance = classmethod(lambda cls: cls._instance or shared)
+    Runtime.exists = classmethod(lambda cls: True)
+    try:
+        yield
+    finally:
+        Runtime.instance, Runtime.exists = original
+
+
+class Session:
+    # Satu pengguna: satu AppTest (session state sendiri) yang dijalankan ulang
+
+    def __init__(self, index, seed, think, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.rng = random.Random(seed * 1000 + index)
+        self.think = think
+        self.app = AppTest.from_file(SCRIPT, default_timeout=timeout)
+
+    def rerun(self, label, action, records, origin):
+        start = time.perf_counter()
+        try:
+            action()
+            error = self.app.exception[0].value if len(self.app.exception) else None
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        records.append({"session": self.index, "label": label, "t": round(start - origin, 3),
+                        "seconds": time.perf_counter() - start, "error": error})
+
+    def open_page(self, page):
+        self.app.query_params["page"] = page
+        self.app.run()
+
+    def question_box(self):
+        boxes = [box for box in self.app.selectbox if box.label == QUESTION_LABEL]
+        return boxes[0] if boxes else None
+
+    def step(self, records, origin, page=None, question=None):
+        # Satu aksi pengguna: buka halaman (menu sidebar), lalu mungkin ganti pertanyaan
+        page = page or self.rng.choice(PAGES)
+        self.rerun(page, lambda: self.open_page(page), records, origin)
+        box = self.question_box() if page == VISUALIZATION else None
+        if box is not None and (question is not None or self.rng.random() < QUESTION_PROBABILITY):
+            number = question or self.rng.randrange(len(box.options)) + 1
+            self.rerun(f"{page} Q{number}", lambda: box.select(box.options[number - 1]).run(), records, origin)
+
+    def loop(self, deadline, records, origin):
+        while time.perf_counter() < deadline:
+            self.step(records, origin)
+            # Jeda baca acak di sekitar rata-rata --think
+            time.sleep(self.rng.expovariate(1 / self.think) if self.think > 0 else 0)
+
+
+def warm_up(seed, timeout):
+    # Setiap halaman dan pertanyaan dibuka sekali agar yang diukur kondisi
+    # stabil, bukan pemuatan data dan cache pertama
+    from charts import QUESTIONS
+
+    session = Session(-1, seed, 0, timeout)
+    records = []
+    origin = time.perf_counter()
+    for page in PAGES:
+        session.step(records, origin, page)
+    for number in range(1, len(QUESTIONS) + 1):
+        session.step(records, origin, VISUALIZATION, number)
+    return records
+
+
+def rss_mb():
+    rss = current_rss()
+    return None if rss is None else round(rss / 2**20, 1)
+
+
+def sample(samples, origin, stop, records, state, interval=SAMPLE_SECONDS):
+    # RSS proses, jumlah sesi aktif, dan jumlah rerun yang selesai, setiap interval
+    while not stop.wait(interval):
+        samples.append({"t": round(time.perf_counter() - origin, 2), "rss_mb": rss_mb(),
+                        "sessions": state["sessions"], "reruns": len(records)})
+
+
+def percentiles(seconds):
+    if not len(seconds):
+        return {"p50_s": None, "p95_s": None, "p99_s": None}
+    p50, p95, p99 = np.percentile(seconds, [50, 95, 99])
+    return {"p50_s": round(float(p50), 4), "p95_s": round(float(p95), 4), "p99_s": round(float(p99), 4)}
+
+
+def summarize(sessions, records, duration, rss_start, rss_end):
+    seconds = np.array([r["seconds"] for r in records])
+    labels = sorted({r["label"] for r in records})
+    return {
+        "sessions": sessions,
+        "reruns": len(records),
+        "errors": sum(r["error"] is not None for r in records),
+        "throughput_per_s": round(len(records) / duration, 2),
+        **percentiles(seconds),
+        "rss_start_mb": rss_start,
+        "rss_end_mb": rss_end,
+        "rss_growth_mb": None if rss_start is None else round(rss_end - rss_start, 1),
+        "labels": {label: {"reruns": int(sum(r["label"] == label for r in records)),
+                           **percentiles(seconds[[r["label"] == label for r in records]])}
+                   for label in labels},
+    }
+
+
+def run_load(levels, duration, think=1.0, seed=0, timeout=600, warmup=True):
+    warnings.filterwarnings("ignore")
+    with shared_runtime():
+        warmup_records = warm_up(seed, timeout) if warmup else []
+        origin = time.perf_counter()
+        samples, stop = [], threading.Event()
+        records, state = [], {"sessions": 0}
+        sampler = threading.Thread(target=sample, args=(samples, origin, stop, records, state), daemon=True)
+        sampler.start()
+        results = []
+        rss_baseline = rss_mb()
+        try:
+            for level in levels:
+                first = len(records)
+                rss_start = rss_mb()
+                state["sessions"] = level
+                deadline = time.perf_counter() + duration
+                level_start = time.perf_counter()
+                sessions = [Session(i, seed, think, timeout) for i in range(level)]
+                threads = [threading.Thread(target=s.loop, args=(deadline, records, origin)) for s in sessions]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - level_start
+                results.append(summarize(level, records[first:], elapsed, rss_start, rss_mb()))
+        finally:
+            stop.set()
+            sampler.join()
+
+    # Pertumbuhan memori per menit sepanjang run (setelah warm-up), untuk mendeteksi kebocoran
+    points = [(s["t"], s["rss_mb"]) for s in samples if s["rss_mb"] is not None]
+    slope = float(np.polyfit(*zip(*points), 1)[0]) * 60 if len(points) > 2 else None
+    return {
+        "meta": {"levels": levels, "duration_s": duration, "think_s": think, "seed": seed,
+                 "warmup_reruns": len(warmup_records),
+                 "warmup_errors": sum(r["error"] is not None for r in warmup_records)},
+        "levels": results,
+        "memory": {
+            "rss_baseline_mb": rss_baseline,
+            "rss_end_mb": rss_mb(),
+            "rss_growth_mb": None if rss_baseline is None else round(rss_mb() - rss_baseline, 1),
+            "rss_slope_mb_per_min": None if slope is None else round(slope, 2),
+        },
+        "timeline": samples,
+        "errors": [r for r in records if r["error"] is not None][:20],
+    }
+
+
+def check_gate(report, max_p95=None, max_p99=None, min_throughput=None, max_growth_mb=None, max_errors=0):
+    # Gerbang penerimaan: daftar pelanggaran (kosong = lolos)
+    failures = []
+    for level in report["levels"]:
+        name = f"{level['sessions']} sesi"
+        if level["errors"] > max_errors:
+            failures.append(f"{name}: {level['errors']} rerun error")
+        if max_p95 is not None and level["p95_s"] is not None and level["p95_s"] > max_p95:
+            failures.append(f"{name}: p95 {level['p95_s']:.3f}s melebihi {max_p95:.3f}s")
+        if max_p99 is not None and level["p99_s"] is not None and level["p99_s"] > max_p99:
+            failures.append(f"{name}: p99 {level['p99_s']:.3f}s melebihi {max_p99:.3f}s")
+        if min_throughput is not None and level["throughput_per_s"] < min_throughput:
+            failures.append(f"{name}: throughput {level['throughput_per_s']}/s di bawah {min_throughput}/s")
+    growth = report["memory"]["rss_growth_mb"]
+    if max_growth_mb is not None and growth is not None and growth > max_growth_mb:
+        failures.append(f"RSS naik {growth} MB, melebihi {max_growth_mb} MB")
+    if report["meta"]["warmup_errors"]:
+        failures.append(f"{report['meta']['warmup_errors']} rerun error saat warm-up")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test sesi bersamaan terhadap satu worker dashboard "
+                                                 "(gunakan BIKE_DATA_DIR untuk data lain)")
+    parser.add_argument("--sessions", default="1,2,4,8", help="jumlah sesi bersamaan per tahap, dipisah koma")
+    parser.add_argument("--duration", type=float, default=30, help="lama setiap tahap (detik)")
+    parser.add_argument("--think", type=float, default=1.0, help="rata-rata jeda antar aksi per sesi (detik)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=600, help="batas waktu satu rerun (detik)")
+    parser.add_argument("--no-warmup", action="store_true", help="ukur termasuk pemuatan data dan cache pertama")
+    parser.add_argument("--output", help="simpan laporan lengkap (JSON, termasuk timeline RSS)")
+    parser.add_argument("--max-p95", type=float, help="gerbang: p95 latensi rerun maksimum per tahap (detik)")
+    parser.add_argument("--max-p99", type=float, help="gerbang: p99 latensi rerun maksimum per tahap (detik)")
+    parser.add_argument("--min-throughput", type=float, help="gerbang: rerun per detik minimum per tahap")
+    parser.add_argument("--max-growth-mb", type=float, help="gerbang: kenaikan RSS maksimum sepanjang run (MB)")
+    parser.add_argument("--max-errors", type=int, default=0, help="gerbang: rerun error maksimum per tahap")
+    args = parser.parse_args()
+
+    levels = [int(s) for s in args.sessions.split(",")]
+    report = run_load(levels, args.duration, args.think, args.seed, args.timeout, warmup=not args.no_warmup)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    for level in report["levels"]:
+        print(f"{level['sessions']:>3} sesi  {level['reruns']:>5} rerun  {level['throughput_per_s']:>6.2f}/s  "
+              f"p50 {level['p50_s'] or 0:>6.3f}s  p95 {level['p95_s'] or 0:>6.3f}s  p99 {level['p99_s'] or 0:>6.3f}s  "
+              f"RSS {level['rss_start_mb']} -> {level['rss_end_mb']} MB  error {level['errors']}")
+    memory = report["memory"]
+    print(f"RSS {memory['rss_baseline_mb']} -> {memory['rss_end_mb']} MB "
+          f"({memory['rss_slope_mb_per_min']} MB/menit)")
+
+    failures = check_gate(report, args.max_p95, args.max_p99, args.min_throughput, args.max_growth_mb,
+                          args.max_errors)
+    if failures:
+        for failure in failures:
+            print(f"GAGAL: {failure}")
+        sys.exit(1)
+    print("Gerbang load test terpenuhi")
+
+
+if __name__ == "__main__":
+    main()
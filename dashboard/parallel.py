@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import data_loader
+from anomaly import flag_anomalies
+from cube import DAY_KEYS, HOUR_KEYS, build_cube, merge_cubes
+from pipeline import add_features, prepare_data
+from schema import DAY_SCHEMA, HOUR_SCHEMA, check
+from stats import Moments
+
+# Kolom partisi pada data mentah; "city" hanya ada di data multi-kota (synthetic.py)
+PARTITIONS = {"year": "yr", "season": "season", "city": "city"}
+
+# Kolom untuk matriks korelasi (pertanyaan 7)
+MOMENT_COLUMNS = ["cnt", "temp", "hum", "windspeed"]
+
+
+def split(df, by):
+    # Partisi diurutkan menurut nilai kuncinya agar urutan merge selalu sama
+    column = PARTITIONS[by]
+    if column not in df.columns:
+        raise ValueError(f"Kolom partisi '{column}' tidak ada di data")
+    return [group for _, group in df.groupby(column, sort=True)]
+
+
+def cube_keys(df, keys):
+    return keys + ["city"] if "city" in df.columns else keys
+
+
+def merge_moments(partials):
+    # Digabung berurutan sesuai urutan partisi
+    merged = partials[0].copy()
+    for partial in partials[1:]:
+        merged.merge(partial)
+    return merged
+
+
+# --- Tugas per partisi (dijalankan di proses worker) ---
+
+def hour_partition(frame):
+    enriched = add_features(frame.copy())
+    return {"cube": build_cube(enriched, cube_keys(frame, HOUR_KEYS)), "rows": len(frame)}
+
+
+def day_partition(frame):
+    enriched = add_features(frame.copy())
+    # Momen disimpan untuk semua STAT_COLUMNS agar subset kolom apa pun bisa diambil
+    return {"cube": build_cube(enriched, cube_keys(frame, DAY_KEYS)), "moments": Moments.from_frame(enriched)}
+
+
+def run(executor, fn, partitions, *args):
+    # map mempertahankan urutan input, jadi hasil merge tidak bergantung pada
+    # proses mana yang selesai lebih dulu
+    if executor is None:
+        return [fn(p, *args) for p in partitions]
+    return list(executor.map(fn, partitions, *[[a] * len(partitions) for a in args]))
+
+
+def parallel_aggregate(hour_raw, day_raw, by="year", workers=None):
+    # Partial aggregate per partisi dihitung di process pool lalu digabung.
+    # workers=1 menjalankan partisi yang sama secara serial di proses ini.
+    check(hour_raw, HOUR_SCHEMA, data_loader.HOUR_FILE)
+    check(day_raw, DAY_SCHEMA, data_loader.DAY_FILE)
+    # Baseline anomali per slot jam-dalam-minggu melintasi batas tahun/musim,
+    # jadi penandaan dilakukan sekali (satu pass vektor) sebelum data dipartisi
+    hour_flagged = flag_anomalies(hour_raw)
+    hour_parts, day_parts = split(hour_flagged, by), split(day_raw, by)
+    executor = None if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    try:
+        hour_partials = run(executor, hour_partition, hour_parts)
+        day_partials = run(executor, day_partition, day_parts)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {
+        "cubes": {
+            "hour": merge_cubes([p["cube"] for p in hour_partials], cube_keys(hour_raw, HOUR_KEYS)),
+            "day": merge_cubes([p["cube"] for p in day_partials], cube_keys(day_raw, DAY_KEYS)),
+        },
+        "moments": merge_moments([p["moments"] for p in day_partials]),
+        "anomalies": int(hour_flagged["anomaly"].sum()),
+        "rows": sum(p["rows"] for p in hour_partials),
+    }
+
+
+def serial_aggregate(hour_raw, day_raw):
+    # Jalur serial dashboard: satu frame, satu groupby
+    hour_df, day_df = prepare_data(hour_raw, day_raw)
+    return {
+        "cubes": {
+            "hour": build_cube(hour_df, cube_keys(hour_df, HOUR_KEYS)),
+            "day": build_cube(day_df, cube_keys(day_df, DAY_KEYS)),
+        },
+        "corr": day_df[MOMENT_COLUMNS].corr(),
+        "rows": len(hour_df),
+    }
+
+
+def load_raw(data_dir=None):
+    data_dir = data_dir or data_loader.resolve_data_dir()
+    return (pd.read_csv(os.path.join(data_dir, data_loader.HOUR_FILE)),
+            pd.read_csv(os.path.join(data_dir, data_loader.DAY_FILE)))
+
+
+def measure(data_dir=None, by="year", workers_list=(1, 2, 4)):
+    hour_raw, day_raw = load_raw(data_dir)
+    results = []
+    start = time.perf_counter()
+    serial_aggregate(hour_raw, day_raw)
+    results.append({"mode": "serial", "seconds": round(time.perf_counter() - start, 3)})
+    for workers in workers_list:
+        start = time.perf_counter()
+        parallel_aggregate(hour_raw, day_raw, by, workers)
+        results.append({"mode": "partitioned", "by": by, "workers": workers,
+                        "seconds": round(time.perf_counter() - start, 3)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agregasi paralel per partisi (tahun/musim/kota)")
+    parser.add_argument("--data-dir", help="folder berisi hour.csv dan day.csv (mis. hasil synthetic.py)")
+    parser.add_argument("--by", choices=list(PARTITIONS), default="year")
+    parser.add_argument("--workers", type=int, help="jumlah proses (default: jumlah core)")
+    parser.add_argument("--verify", action="store_true", help="jalankan tests/test_parallel.py (bandingkan dengan jalur serial)")
+    parser.add_argument("--measure", action="store_true", help="ukur waktu serial vs process pool")
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(data_loader.run_tests("test_parallel.py", data_dir=args.data_dir))
+    elif args.measure:
+        workers = (args.workers,) if args.workers else (1, 2, 4, os.cpu_count())
+        for result in measure(args.data_dir, args.by, sorted(set(workers))):
+            print(json.dumps(result))
+    else:
+        hour_raw, day_raw = load_raw(args.data_dir)
+        result = parallel_aggregate(hour_raw, day_raw, args.by, args.workers)
+        print(result["moments"].corr(MOMENT_COLUMNS).round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+from anomaly import flag_anomalies
+from diagnostics import stage
+from schema import DAY_SCHEMA, HOUR_SCHEMA, apply_schema, check, label_column
+
+# pyarrow dipin di requirements.txt (juga dependensi streamlit); tanpa pyarrow semua
+# tahap tetap dihitung, hanya tidak disimpan ke disk
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+# Pipeline analisis bersama untuk main.ipynb, dashboard.py, dan job batch
+# (report.py, api.py, store.py, ...). Setiap tahap punya kunci isi: hash dari
+# nama, kode sumber tahap, dan kunci tahap masukannya, dengan file CSV sumber di-hash
+# dari isinya. Output tahap disimpan sebagai Feather di .cache/pipeline, sehingga
+# proses lain (atau run notebook berikutnya) memuat hasil yang sudah ada dan
+# hanya menghitung ulang tahap yang masukannya berubah.
+#
+#   hour.csv -> hour_raw -> hour_flagged -> hour -> cube_hour
+#   day.csv  -> day_raw  -> day          -> cube_day
+
+HOUR_FILE = "hour.csv"
+DAY_FILE = "day.csv"
+
+# Mapping season
+season_map = {1: 'Spring', 2: 'Summer', 3: 'Fall', 4: 'Winter'}
+
+# Mapping weather
+weather_map = {
+    1: 'Clear/Partly Cloudy',
+    2: 'Mist/Cloudy',
+    3: 'Light Precipitation',
+    4: 'Heavy Precipitation'
+}
+
+# Urutan hari dalam seminggu (sesuai kode kolom weekday: 0 = Sunday)
+day_order = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+# Jumlah versi lama per tahap yang tetap disimpan (mis. untuk kembali ke CSV sebelumnya)
+KEEP_VERSIONS = 2
+
+SOURCES_FILE = "sources.json"
+
+
+# --- Transformasi ---
+
+def add_features(df):
+    # Konversi kolom "dteday" ke tipe datetime
+    df["dteday"] = pd.to_datetime(df["dteday"])
+
+    # Buat time-based features baru
+    dates = df['dteday'].dt
+    df['year'] = dates.year.astype("uint16")
+    df['month'] = dates.month.astype("uint8")
+    df['day'] = dates.day.astype("uint8")
+
+    # Label diturunkan dari kolom kode sebagai categorical (tanpa string per baris)
+    df['day_of_week'] = label_column(df['weekday'], day_order, first=0)
+    df['season_name'] = label_column(df['season'], season_map.values())
+    df['weather_condition'] = label_column(df['weathersit'], weather_map.values())
+
+    # Persentase dari casual vs registered users
+    df['casual_pct'] = (df['casual'] / df['cnt'] * 100).astype("float32")
+    df['registered_pct'] = (df['registered'] / df['cnt'] * 100).astype("float32")
+    return df
+
+
+def compact_dtypes(df):
+    # Kolom diperkecil sesuai skema (uint8/uint16/float32, lihat schema.py)
+    return apply_schema(df, HOUR_SCHEMA if "hr" in df.columns else DAY_SCHEMA)
+
+
+def concat_prepared(frames):
+    # Gabungkan frame hasil prepare_data; kategori label selalu lengkap
+    # sehingga hasil pd.concat tetap categorical
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_source(path, schema):
+    # Null, rentang, instant ganda, dan casual + registered == cnt diperiksa
+    # dalam satu pass sebelum data dipakai tahap berikutnya
+    df = pd.read_csv(path)
+    check(df, schema, os.path.basename(path))
+    return df
+
+
+def read_hour(path):
+    return read_source(path, HOUR_SCHEMA)
+
+
+def read_day(path):
+    return read_source(path, DAY_SCHEMA)
+
+
+def prepare_frame(df):
+    # Salinan dangkal: kolom baru tidak ikut ditulis ke frame tahap sebelumnya
+    return compact_dtypes(add_features(df.copy(deep=False)))
+
+
+def build_hour_cube(hour_df):
+    # Import lokal: cube mengimpor data_loader yang mengimpor modul ini
+    from cube import HOUR_KEYS, build_cube
+    return build_cube(hour_df, HOUR_KEYS)
+
+
+def build_day_cube(day_df):
+    from cube import DAY_KEYS, build_cube
+    return build_cube(day_df, DAY_KEYS)
+
+
+def prepare_data(hour_df, day_df):
+    # Tahap yang sama dengan pipeline, untuk frame yang sudah ada di memori
+    # (batch ingestion, partisi parallel.py, --verify)
+    with stage("prepare:validate"):
+        check(hour_df, HOUR_SCHEMA, HOUR_FILE)
+        check(day_df, DAY_SCHEMA, DAY_FILE)
+    # Jam anomali ditandai (kolom anomaly), bukan dibuang
+    with stage("prepare:flag_anomalies"):
+        hour_df = flag_anomalies(hour_df)
+    with stage("prepare:add_features"):
+        hour_df, day_df = prepare_frame(hour_df), prepare_frame(day_df)
+    return hour_df, day_df
+
+
+# Kode yang menentukan hasil tahap: fungsi, konstanta, atau nama modul (seluruh
+# file, dimuat saat kunci dihitung karena cube mengimpor modul ini)
+READ_CODE = (read_source, "schema")
+FEATURE_CODE = (prepare_frame, add_features, compact_dtypes, day_order, season_map, weather_map, "schema")
+CUBE_CODE = (day_order, season_map, weather_map, "cube")
+
+# Tahap: nama -> (masukan, fungsi, kode). Masukan berupa nama file sumber atau
+# nama tahap lain. Hash kode sumber fungsi dan kodenya masuk ke kunci tahap,
+# jadi mengubah kode itu (kolom, baris, dtype) otomatis menghitung ulang tahap
+# tersebut dan tahap sesudahnya.
+STAGES = {
+    "hour_raw": ((HOUR_FILE,), read_hour, READ_CODE),
+    "day_raw": ((DAY_FILE,), read_day, READ_CODE),
+    "hour_flagged": (("hour_raw",), flag_anomalies, ("anomaly",)),
+    "hour": (("hour_flagged",), prepare_frame, FEATURE_CODE),
+    "day": (("day_raw",), prepare_frame, FEATURE_CODE),
+    "cube_hour": (("hour",), build_hour_cube, CUBE_CODE),
+    "cube_day": (("day",), build_day_cube, CUBE_CODE),
+}
+
+SOURCES = (HOUR_FILE, DAY_FILE)
+
+# Artefak data_loader.get_artifact yang juga tersedia sebagai tahap pipeline
+SHARED_ARTIFACTS = {"cube": {"hour": "cube_hour", "day": "cube_day"}}
+
+
+def default_data_dir():
+    # Import lokal: data_loader mengimpor modul ini
+    from data_loader import resolve_data_dir
+    return resolve_data_dir()
+
+
+def default_store_dir():
+    from data_loader import cache_dir
+    return os.path.join(cache_dir(), "pipeline")
+
+
+def code_hash(objects):
+    digest = hashlib.sha1()
+    for obj in objects:
+        if isinstance(obj, str):
+            obj = importlib.import_module(obj)
+        source = inspect.getsource(obj) if callable(obj) or inspect.ismodule(obj) else repr(obj)
+        digest.update(source.encode())
+    return digest.hexdigest()[:16]
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Pipeline:
+    # Satu run: kunci dan hasil tahap dihitung sekali lalu dipakai semua target
+
+    def __init__(self, data_dir=None, store_dir=None):
+        self.data_dir = os.path.abspath(data_dir or default_data_dir())
+        self.store_dir = (store_dir or default_store_dir()) if feather is not None else None
+        if self.store_dir is not None:
+            os.makedirs(self.store_dir, exist_ok=True)
+        self.keys = {}
+        self.outputs = {}
+        # (tahap, "dipakai ulang"/"dihitung", detik) sesuai urutan dieksekusi
+        self.log = []
+
+    # --- Kunci isi ---
+
+    def source_key(self, name):
+        # Hash isi file di-cache per (path, mtime, size) agar rerun tidak membaca ulang file
+        path = os.path.join(self.data_dir, name)
+        stat = os.stat(path)
+        signature = f"{path}|{stat.st_mtime_ns}|{stat.st_size}"
+        index = self.read_index()
+        if signature not in index:
+            # Hanya hash terbaru per file yang disimpan
+            index = {k: v for k, v in index.items() if not k.startswith(f"{path}|")}
+            with stage(f"pipeline:hash:{name}"):
+                index[signature] = file_hash(path)
+            self.write_index(index)
+        return index[signature]
+
+    def read_index(self):
+        if self.store_dir is None:
+            return {}
+        try:
+            with open(os.path.join(self.store_dir, SOURCES_FILE)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def write_index(self, index):
+        if self.store_dir is None:
+            return
+        path = os.path.join(self.store_dir, SOURCES_FILE)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+
+    def key(self, name):
+        if name not in self.keys:
+            if name in SOURCES:
+                self.keys[name] = self.source_key(name)
+            else:
+                inputs, builder, code = STAGES[name]
+                payload = json.dumps([name, code_hash((builder, *code)), [self.key(i) for i in inputs]])
+                self.keys[name] = hashlib.sha1(payload.encode()).hexdigest()[:16]
+        return self.keys[name]
+
+    def version(self, targets):
+        # Versi data untuk sekumpulan target; sama untuk isi yang sama di folder mana pun
+        return hashlib.sha1("|".join(self.key(t) for t in targets).encode()).hexdigest()[:12]
+
+    # --- Artefak ---
+
+    def path(self, name):
+        return os.path.join(self.store_dir, f"{name}-{self.key(name)}.feather")
+
+    def cached(self, name):
+        return self.store_dir is not None and os.path.exists(self.path(name))
+
+    def load(self, name):
+        table = feather.read_table(self.path(name), memory_map=True)
+        # split_blocks menjaga kolom numerik tetap zero-copy di atas mmap
+        return table.to_pandas(split_blocks=True)
+
+    def save(self, name, df):
+        # Tanpa kompresi agar file bisa di-memory-map tanpa disalin
+        path = self.path(name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp, compression="uncompressed")
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.prune(name)
+
+    def prune(self, name):
+        # Versi lama tahap ini dihapus kecuali KEEP_VERSIONS yang terbaru
+        prefix, current = f"{name}-", os.path.basename(self.path(name))
+        old = [f for f in os.listdir(self.store_dir)
+               if f.startswith(prefix) and f.endswith(".feather") and f != current
+               and f[len(prefix):-len(".feather")].isalnum()]
+        old.sort(key=lambda f: os.path.getmtime(os.path.join(self.store_dir, f)), reverse=True)
+        for f in old[KEEP_VERSIONS - 1:]:
+            os.remove(os.path.join(self.store_dir, f))
+
+    def get(self, name):
+        # Hasil tahap: dari memori, dari artefak di disk, atau dihitung dari masukannya
+        if name in SOURCES:
+            return os.path.join(self.data_dir, name)
+        if name not in self.outputs:
+            start = time.perf_counter()
+            if self.cached(name):
+                with stage(f"pipeline:{name}:load"):
+                    self.outputs[name] = self.load(name)
+                status = "dipakai ulang"
+            else:
+                inputs, builder, _ = STAGES[name]
+                args = [self.get(i) for i in inputs]
+                start = time.perf_counter()
+                with stage(f"pipeline:{name}:compute"):
+                    output = builder(*args)
+                if self.store_dir is not None:
+                    with stage(f"pipeline:{name}:save"):
+                        self.save(name, output)
+                    # Hasil dimuat dari artefak agar frame identik dengan run berikutnya (dan ikut mmap)
+                    output = self.load(name)
+                self.outputs[name] = output
+                status = "dihitung"
+            self.log.append((name, status, time.perf_counter() - start))
+        return self.outputs[name]
+
+    def run(self, targets):
+        results = [self.get(t) for t in targets]
+        # Hasil antara (mis. hour_raw) dilepas agar tidak tertahan di memori
+        for name in list(self.outputs):
+            if name not in targets:
+                del self.outputs[name]
+        return results
+
+    def status(self):
+        # Kunci dan status setiap tahap tanpa menghitung apa pun
+        return [{"stage": name, "key": self.key(name), "cached": self.cached(name)} for name in STAGES]
+
+
+def load(data_dir=None, store_dir=None):
+    # (hour_df, day_df) siap analisis, seperti yang dipakai dashboard
+    return tuple(Pipeline(data_dir, store_dir).run(["hour", "day"]))
+
+
+# --- Pengukuran (python pipeline.py --measure); kesetaraan diuji di tests/test_pipeline.py ---
+
+# Script kecil yang dijalankan di proses baru untuk mengukur cold start
+MEASURE_SCRIPT = """
+import json, os, sys, time
+import pandas as pd
+import pipeline
+from schema import legacy_frame
+
+mode, data_dir = sys.argv[1], sys.argv[2]
+start = time.perf_counter()
+if mode == "legacy":
+    hour_df = legacy_frame(pd.read_csv(os.path.join(data_dir, "hour.csv")), hourly=True)
+    day_df = legacy_frame(pd.read_csv(os.path.join(data_dir, "day.csv")), hourly=False)
+elif mode == "csv":
+    hour_df, day_df = pipeline.prepare_data(pd.read_csv(os.path.join(data_dir, "hour.csv")),
+                                            pd.read_csv(os.path.join(data_dir, "day.csv")))
+else:
+    hour_df, day_df = pipeline.load(data_dir)
+elapsed = time.perf_counter() - start
+
+status = dict(line.split(":", 1) for line in open("/proc/self/status") if ":" in line)
+print(json.dumps({
+    "mode": mode,
+    "load_ms": round(elapsed * 1000, 2),
+    "rss_anon_mb": int(status["RssAnon"].split()[0]) / 1024 if "RssAnon" in status else None,
+    "frame_mb": round((hour_df.memory_usage(deep=True).sum() + day_df.memory_usage(deep=True).sum()) / 2**20, 2),
+}))
+"""
+
+
+def measure(data_dir=None, repeat=5):
+    # Cold start di proses baru: CSV lama, CSV dengan dtype ringkas, dan artefak pipeline (mmap)
+    here = os.path.dirname(os.path.abspath(__file__))
+    data_dir = data_dir or default_data_dir()
+    Pipeline(data_dir).run(["hour", "day"])
+    results = []
+    for mode in ("legacy", "csv", "pipeline"):
+        runs = []
+        for _ in range(repeat):
+            out = subprocess.run(
+                [sys.executable, "-c", MEASURE_SCRIPT, mode, data_dir],
+                cwd=here, capture_output=True, text=True, check=True,
+            )
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        results.append(min(runs, key=lambda r: r["load_ms"]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jalankan pipeline analisis dan simpan artefak setiap tahap "
+                                                 "(gunakan BIKE_DATA_DIR untuk data lain)")
+    parser.add_argument("stages", nargs="*", help=f"tahap target (default semua: {', '.join(STAGES)})")
+    parser.add_argument("--status", action="store_true", help="tampilkan kunci dan status artefak tanpa menghitung")
+    parser.add_argument("--verify", action="store_true",
+                        help="periksa hasil dan penggunaan ulang artefak pada salinan data sementara")
+    parser.add_argument("--measure", action="store_true", help="ukur cold start CSV vs artefak pipeline")
+    args = parser.parse_args()
+
+    if args.verify:
+        # Import lokal: data_loader mengimpor modul ini
+        from data_loader import run_tests
+        sys.exit(run_tests("test_pipeline.py"))
+    if args.measure:
+        for result in measure():
+            print(json.dumps(result))
+        return
+
+    pipe = Pipeline()
+    if args.status:
+        for row in pipe.status():
+            print(f"{row['stage']:<14} {row['key']}  {'tersimpan' if row['cached'] else 'belum ada'}")
+        return
+    for name in args.stages or STAGES:
+        if name not in STAGES:
+            parser.error(f"tahap tidak dikenal: {name}")
+    pipe.run(args.stages or list(STAGES))
+    for name, status, seconds in pipe.log:
+        print(f"{name:<14} {pipe.key(name)}  {status:<13} {seconds * 1000:8.1f} ms")
+    if pipe.store_dir is not None:
+        print(f"Artefak: {pipe.store_dir}")
+
+
+if __name__ == "__main__":
+    main()
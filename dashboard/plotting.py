@@ -0,0 +1,155 @@
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.colors import Normalize, to_hex
+from matplotlib.ticker import FuncFormatter
+
+from diagnostics import stage
+
+# Primitive plotting ringan: semua fungsi menerima data yang sudah diagregasi
+# (hasil roll-up cube atau groupby sendiri) dan langsung menggambar dengan
+# matplotlib tanpa estimator/regrouping seaborn.
+
+
+def palette(name, n):
+    # Sama seperti sns.color_palette("viridis", n): ujung colormap tidak dipakai
+    cmap = colormaps[name]
+    return [to_hex(cmap(x)) for x in np.linspace(0, 1, n + 2)[1:-1]]
+
+
+def scale_formatter(scale, decimals=0):
+    # Contoh: scale_formatter(1e6, 1) -> 1.2 untuk 1.234.567
+    return FuncFormatter(lambda x, _: f"{x / scale:.{decimals}f}")
+
+
+def tight_layout(fig):
+    # tight_layout dicatat terpisah di panel Diagnostics karena biayanya cukup besar
+    with stage("figure:tight_layout"):
+        fig.tight_layout()
+
+
+def bar_chart(ax, labels, values, colors=None, annotate_offset=None):
+    positions = np.arange(len(values))
+    ax.bar(positions, values, color=colors or palette("viridis", len(values)), width=0.8)
+    ax.set_xticks(positions)
+    ax.set_xticklabels([str(label) for label in labels])
+    if annotate_offset is not None:
+        # Tambahkan angka di atas masing-masing bin
+        for i, v in enumerate(values):
+            ax.text(i, v + annotate_offset, f"{v:,.0f}", ha="center", fontsize=10, fontweight="bold")
+
+
+def stacked_bar_chart(ax, labels, series, colors):
+    positions = np.arange(len(labels))
+    bottom = np.zeros(len(labels))
+    for (name, values), color in zip(series.items(), colors):
+        values = np.asarray(values, dtype=float)
+        ax.bar(positions, values, width=0.5, bottom=bottom, color=color, label=name)
+        bottom += values
+    ax.set_xticks(positions)
+    ax.set_xticklabels([str(label) for label in labels], rotation=90)
+
+
+def line_chart(ax, x, series, colors, marker=None, linewidth=None, max_points=None):
+    # series: dict label -> nilai y (satu garis per label)
+    for (name, values), color in zip(series.items(), colors):
+        xs, ys = np.asarray(x), np.asarray(values)
+        if max_points is not None:
+            xs, ys = downsample(xs, ys, max_points)
+        ax.plot(xs, ys, color=color, marker=marker, linewidth=linewidth, label=name)
+
+
+def time_series_chart(ax, groups, colors, linewidth=None):
+    # groups: dict label -> (x, y); tiap seri di-downsample ke lebar axes dalam piksel
+    max_points = 2 * axes_pixel_width(ax)
+    for (name, (xs, ys)), color in zip(groups.items(), colors):
+        xs, ys = downsample(np.asarray(xs), np.asarray(ys), max_points)
+        ax.plot(xs, ys, color=color, linewidth=linewidth, label=name)
+
+
+def heatmap(ax, data, cmap="viridis", annot=False, fmt=".2f"):
+    values = np.asarray(data, dtype=float)
+    # Sel NaN (mis. korelasi dari kurang dari 2 hari) tidak ikut menentukan skala warna
+    finite = values[np.isfinite(values)]
+    norm = Normalize(finite.min(), finite.max()) if finite.size else Normalize(0, 1)
+    mesh = ax.pcolormesh(values, cmap=cmap, norm=norm)
+    ax.figure.colorbar(mesh, ax=ax)
+
+    rows, cols = values.shape
+    ax.set_xlim(0, cols)
+    ax.set_ylim(rows, 0)
+    ax.set_xticks(np.arange(cols) + 0.5)
+    ax.set_xticklabels([str(c) for c in data.columns])
+    ax.set_yticks(np.arange(rows) + 0.5)
+    ax.set_yticklabels([str(i) for i in data.index], rotation=0)
+
+    if annot:
+        # Warna teks mengikuti kecerahan sel seperti sns.heatmap
+        rgba = colormaps[cmap](norm(values))
+        luminance = rgba[..., :3] @ np.array([0.299, 0.587, 0.114])
+        for (i, j), v in np.ndenumerate(values):
+            ax.text(j + 0.5, i + 0.5, format(v, fmt), ha="center", va="center",
+                    color="black" if luminance[i, j] > 0.408 else "white")
+    return mesh
+
+
+def regression_chart(ax, x, y, fit, color, note=None):
+    # Tampilan sama seperti sns.regplot: scatter, garis OLS, dan pita kepercayaan.
+    # fit berasal dari Moments.ols sehingga tidak ada regresi/bootstrap di sini.
+    # fit None (data tidak cukup): hanya scatter beserta catatan
+    ax.scatter(x, y, color=color, alpha=0.8, linewidths=0)
+    if fit is None:
+        ax.text(0.5, 0.5, note, transform=ax.transAxes, ha="center", va="center", fontsize=12)
+        return ax
+    ax.plot(fit["x"], fit["y"], color=color, linewidth=2.25)
+    ax.fill_between(fit["x"], fit["lower"], fit["upper"], facecolor=color, alpha=0.15, linewidth=0)
+    return ax
+
+
+def axes_pixel_width(ax):
+    fig = ax.figure
+    return max(int(ax.get_position().width * fig.get_figwidth() * fig.dpi), 1)
+
+
+def downsample(x, y, max_points, method="minmax"):
+    if len(x) <= max_points:
+        return x, y
+    if method == "lttb":
+        return lttb(x, y, max_points)
+    return minmax_decimate(x, y, max_points // 2)
+
+
+def minmax_decimate(x, y, n_bins):
+    # Setiap bin menyimpan titik minimum dan maksimum sehingga puncak tetap terlihat
+    n = len(y)
+    size = -(-n // n_bins)
+    padded = np.full(size * n_bins, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(n_bins, size)
+    valid = ~np.all(np.isnan(blocks), axis=1)
+    blocks = blocks[valid]
+    offsets = np.flatnonzero(valid) * size
+    lo = offsets + np.nanargmin(blocks, axis=1)
+    hi = offsets + np.nanargmax(blocks, axis=1)
+    idx = np.unique(np.concatenate([lo, hi, [0, n - 1]]))
+    return x[idx], y[idx]
+
+
+def lttb(x, y, n_out):
+    # Largest-Triangle-Three-Buckets
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return x, y
+    xs = x.astype("int64") if np.issubdtype(x.dtype, np.datetime64) else x.astype(float)
+    ys = y.astype(float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        nxt = slice(edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x, avg_y = xs[nxt].mean(), ys[nxt].mean()
+        area = np.abs((xs[a] - avg_x) * (ys[start:end] - ys[a]) - (xs[a] - xs[start:end]) * (avg_y - ys[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return x[idx], y[idx]
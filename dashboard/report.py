@@ -0,0 +1,227 @@
+import argparse
+import hashlib
+import io
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+# Render tanpa display; proses worker mewarisi backend ini
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+
+import charts
+from charts import QUESTION_FIGURES, day_cluster_figure, time_period_figure
+from clustering import DEFAULT_BOUNDARIES, get_day_clusters, time_period_means
+from cube import build_cubes, get_cubes, rollup
+from data_loader import current_dir, load_data
+from figure_cache import SAVEFIG_KWARGS, release_figure
+from filters import select_days
+from pipeline import code_hash, day_order, season_map, weather_map
+from stats import Moments, get_day_moments
+
+# Render batch semua figure dashboard (7 pertanyaan + 2 chart clustering) ke
+# PNG/SVG tanpa Streamlit. Figure dirender di process pool; hash data input
+# setiap figure disimpan di manifest.json sehingga figure yang inputnya tidak
+# berubah sejak run sebelumnya dilewati.
+
+DEFAULT_OUTPUT_DIR = os.path.join(current_dir, "reports")
+MANIFEST_FILE = "manifest.json"
+
+# Kolom partisi pada frame hasil prepare_data; "city" hanya ada di data multi-kota
+SPLITS = {"year": "year", "season": "season", "city": "city"}
+
+# Kode yang menentukan isi figure (lihat pipeline.code_hash): modul chart dan
+# plotting, roll-up cube, statistik/OLS, clustering, label, dan opsi savefig.
+# Perubahannya memicu render ulang semua figure.
+CODE = ("charts", "plotting", "cube", "stats", "clustering", "filters", day_order, season_map, weather_map,
+        SAVEFIG_KWARGS)
+
+
+def update_hash(h, obj):
+    # Hash isi data (bukan identitas objek) untuk frame, array, dict, dan Moments
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        h.update(repr(list(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name).encode())
+        h.update(pd.util.hash_pandas_object(obj).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"{obj.dtype}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=str):
+            h.update(repr(key).encode())
+            update_hash(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            update_hash(h, item)
+    elif isinstance(obj, Moments):
+        update_hash(h, vars(obj))
+    else:
+        h.update(repr(obj).encode())
+
+
+def code_version():
+    return code_hash((partition_figures, *CODE))
+
+
+def input_hash(name, args, version):
+    h = hashlib.sha256(f"{name}:{version}".encode())
+    update_hash(h, args)
+    return h.hexdigest()
+
+
+def partitions(hour_df, day_df, split):
+    # (label, hour_df, day_df) untuk seluruh data dan setiap kombinasi nilai partisi
+    yield "all", hour_df, day_df
+    if not split:
+        return
+    columns = [SPLITS[s] for s in split]
+    missing = [c for c in columns if c not in day_df.columns]
+    if missing:
+        raise ValueError(f"Kolom partisi {missing} tidak ada di data")
+    values = [sorted(day_df[c].unique()) for c in columns]
+    for combo in itertools.product(*values):
+        hour_mask = np.ones(len(hour_df), dtype=bool)
+        day_mask = np.ones(len(day_df), dtype=bool)
+        for column, value in zip(columns, combo):
+            hour_mask &= (hour_df[column] == value).to_numpy()
+            day_mask &= (day_df[column] == value).to_numpy()
+        if not day_mask.any() or not hour_mask.any():
+            continue
+        label = "_".join(f"{s}-{season_map.get(v, v) if s == 'season' else v}" for s, v in zip(split, combo))
+        yield label.replace(" ", ""), hour_df[hour_mask], day_df[day_mask]
+
+
+def partition_figures(label, hour_df, day_df, clusters):
+    # Argumen builder untuk satu partisi, sama seperti halaman dashboard
+    if label == "all":
+        cubes, moments = get_cubes(), get_day_moments()
+    else:
+        cubes, moments = build_cubes(hour_df, day_df), Moments.from_frame(day_df)
+        clusters = select_days(clusters, day_df)
+    figures = {}
+    for number, builder in enumerate(QUESTION_FIGURES.values(), start=1):
+        args = (cubes, day_df, moments) if builder is charts.correlation_figure else (cubes, day_df)
+        figures[f"q{number}-{builder.__name__}"] = (builder, args)
+    hourly = rollup(cubes["hour"], ["hr", "holiday"])
+    figures[f"clustering-{time_period_figure.__name__}"] = (
+        time_period_figure, (time_period_means(DEFAULT_BOUNDARIES, hourly),))
+    figures[f"clustering-{day_cluster_figure.__name__}"] = (day_cluster_figure, (clusters,))
+    return figures
+
+
+def render_job(job):
+    # Dijalankan di proses worker: satu figure, disimpan ke semua format
+    builder, args, paths = job
+    start = time.perf_counter()
+    fig = builder(*args)
+    try:
+        for fmt, path in paths.items():
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=fmt, **SAVEFIG_KWARGS)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(buffer.getvalue())
+            os.replace(tmp_path, path)
+    finally:
+        release_figure(fig)
+    return time.perf_counter() - start
+
+
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def plan(output_dir, formats, split, manifest, force=False):
+    # Daftar job yang perlu dirender dan jumlah figure yang dilewati
+    hour_df, day_df = load_data()
+    # Chart laporan memakai data tanpa jam anomali, sama seperti default dashboard
+    hour_df = hour_df[hour_df["anomaly"] == 0]
+    clusters = get_day_clusters()
+    version = code_version()
+    jobs, hashes, skipped = [], {}, 0
+    for label, hour_part, day_part in partitions(hour_df, day_df, split):
+        for name, (builder, args) in partition_figures(label, hour_part, day_part, clusters).items():
+            key = f"{label}/{name}"
+            digest = input_hash(name, args, version)
+            paths = {fmt: os.path.join(output_dir, label, f"{name}.{fmt}") for fmt in formats}
+            entry = manifest.get(key)
+            if (not force and entry is not None and entry["hash"] == digest
+                    and set(formats) <= set(entry["formats"]) and all(map(os.path.exists, paths.values()))):
+                skipped += 1
+                continue
+            jobs.append((builder, args, paths))
+            # Format lain dari run sebelumnya tetap berlaku jika hash-nya sama
+            previous = entry["formats"] if entry is not None and entry["hash"] == digest else []
+            hashes[key] = {"hash": digest, "formats": sorted(set(formats) | set(previous))}
+    return jobs, hashes, skipped
+
+
+def render_report(output_dir=DEFAULT_OUTPUT_DIR, formats=("png",), split=(), workers=None, force=False):
+    start = time.perf_counter()
+    manifest = load_manifest(output_dir)
+    jobs, hashes, skipped = plan(output_dir, formats, split, manifest, force)
+    plan_seconds = time.perf_counter() - start
+
+    # workers=1 merender di proses ini (sama seperti parallel.py)
+    if workers == 1 or len(jobs) <= 1:
+        seconds = [render_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            seconds = list(executor.map(render_job, jobs))
+
+    manifest.update(hashes)
+    os.makedirs(output_dir, exist_ok=True)
+    save_manifest(output_dir, manifest)
+    return {
+        "rendered": len(jobs),
+        "skipped": skipped,
+        "plan_s": round(plan_seconds, 3),
+        "render_cpu_s": round(sum(seconds), 3),
+        "total_s": round(time.perf_counter() - start, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render semua figure dashboard ke PNG/SVG tanpa Streamlit "
+                                                 "(gunakan BIKE_DATA_DIR untuk data lain)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--formats", default="png", help="format dipisah koma: png,svg")
+    parser.add_argument("--split", default="",
+                        help=f"partisi tambahan dipisah koma, mis. year atau year,season ({', '.join(SPLITS)})")
+    parser.add_argument("--workers", type=int, help="jumlah proses (default: jumlah core)")
+    parser.add_argument("--force", action="store_true", help="render ulang meskipun hash input tidak berubah")
+    args = parser.parse_args()
+
+    formats = [f for f in args.formats.split(",") if f]
+    unknown = set(formats) - {"png", "svg"}
+    if unknown:
+        parser.error(f"format tidak dikenal: {', '.join(sorted(unknown))}")
+    split = [s for s in args.split.split(",") if s]
+    unknown = set(split) - set(SPLITS)
+    if unknown:
+        parser.error(f"partisi tidak dikenal: {', '.join(sorted(unknown))}")
+
+    result = render_report(args.output_dir, formats, split, args.workers, args.force)
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
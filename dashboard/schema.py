@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Skema kolom hour.csv / day.csv: (dtype setelah dimuat, nilai minimum, nilai
+# maksimum). Batas None berarti batas dtype-nya, sehingga validasi rentang
+# sekaligus menjamin konversi ke dtype kecil tidak mengubah nilai. Kolom cuaca
+# tetap float64 karena dipakai momen/regresi yang dibandingkan dengan
+# DataFrame.corr() sampai 1e-9.
+HOUR_SCHEMA = {
+    "instant": ("uint32", 1, None),
+    "dteday": ("datetime64[ns]", None, None),
+    "season": ("uint8", 1, 4),
+    # Tahun relatif terhadap 2011; negatif untuk data sintetis sebelum 2011
+    "yr": ("int16", None, None),
+    "mnth": ("uint8", 1, 12),
+    "hr": ("uint8", 0, 23),
+    "holiday": ("uint8", 0, 1),
+    "weekday": ("uint8", 0, 6),
+    "workingday": ("uint8", 0, 1),
+    "weathersit": ("uint8", 1, 4),
+    "temp": ("float64", 0, 1),
+    "atemp": ("float64", 0, 1),
+    "hum": ("float64", 0, 1),
+    "windspeed": ("float64", 0, 1),
+    "casual": ("uint16", 0, None),
+    "registered": ("uint16", 0, None),
+    "cnt": ("uint16", 0, None),
+}
+
+# Jumlah harian bisa melewati 65535 untuk kota besar
+DAY_SCHEMA = {c: spec for c, spec in HOUR_SCHEMA.items() if c != "hr"}
+DAY_SCHEMA.update({c: ("uint32", 0, None) for c in ("casual", "registered", "cnt")})
+
+# Kolom opsional (data multi-kota dari synthetic.py)
+OPTIONAL_SCHEMA = {"city": ("uint16", 0, None)}
+
+# Kolom turunan dari add_features dan anomaly.py
+DERIVED_DTYPES = {
+    "year": "uint16",
+    "month": "uint8",
+    "day": "uint8",
+    "casual_pct": "float32",
+    "registered_pct": "float32",
+    "cnt_expected": "float32",
+    "anomaly_score": "float32",
+    "anomaly": "uint8",
+}
+
+
+def bounds(dtype, low, high):
+    if not np.issubdtype(np.dtype(dtype), np.integer):
+        return low, high
+    info = np.iinfo(dtype)
+    return (info.min if low is None else low), (info.max if high is None else high)
+
+
+def validate(df, schema):
+    # Satu pass vektor per kolom: null, rentang (termasuk pecahan di kolom
+    # integer), instant ganda, dan casual + registered == cnt
+    schema = {**schema, **{c: s for c, s in OPTIONAL_SCHEMA.items() if c in df.columns}}
+    report = {
+        "rows": len(df),
+        "missing_columns": [c for c in schema if c not in df.columns],
+        "nulls": {},
+        "out_of_range": {},
+        "duplicate_instant": 0,
+        "count_mismatch": 0,
+    }
+    for column, (dtype, low, high) in schema.items():
+        if column not in df.columns:
+            continue
+        values = df[column].to_numpy()
+        missing = pd.isna(values)
+        if missing.any():
+            report["nulls"][column] = int(missing.sum())
+        if column == "dteday":
+            continue
+        low, high = bounds(dtype, low, high)
+        bad = np.zeros(len(values), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            if low is not None:
+                bad |= values < low
+            if high is not None:
+                bad |= values > high
+            if np.issubdtype(np.dtype(dtype), np.integer) and values.dtype.kind == "f":
+                bad |= ~missing & (values != np.floor(values))
+        if bad.any():
+            report["out_of_range"][column] = int(bad.sum())
+
+    if "instant" in df.columns and len(df):
+        instant = df["instant"].to_numpy()
+        # File sumber biasanya sudah terurut sehingga cukup satu np.diff
+        if not (instant[1:] > instant[:-1]).all():
+            report["duplicate_instant"] = int(len(instant) - len(pd.unique(instant)))
+    if {"casual", "registered", "cnt"} <= set(df.columns):
+        total = df["casual"].to_numpy(dtype=np.float64) + df["registered"].to_numpy(dtype=np.float64)
+        report["count_mismatch"] = int((total != df["cnt"].to_numpy(dtype=np.float64)).sum())
+    report["errors"] = (len(report["missing_columns"]) + sum(report["nulls"].values())
+                        + sum(report["out_of_range"].values()) + report["duplicate_instant"]
+                        + report["count_mismatch"])
+    return report
+
+
+def check(df, schema, name):
+    # Sama seperti validate, tetapi berhenti dengan pesan ringkas jika ada pelanggaran
+    report = validate(df, schema)
+    if report["errors"]:
+        problems = {k: v for k, v in report.items() if k not in ("rows", "errors") and v}
+        raise ValueError(f"Data {name} tidak lolos validasi: {json.dumps(problems)}")
+    return report
+
+
+def apply_schema(df, schema):
+    # Kolom sumber dan turunan dikonversi ke dtype terkecilnya (tanpa salinan
+    # jika dtype sudah sesuai)
+    dtypes = {c: spec[0] for c, spec in {**schema, **OPTIONAL_SCHEMA}.items()}
+    dtypes.update(DERIVED_DTYPES)
+    for column, dtype in dtypes.items():
+        if column in df.columns and column != "dteday" and df[column].dtype != dtype:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def label_column(codes, labels, first=1):
+    # Categorical langsung dari kolom kode (mis. season 1..4) tanpa membuat
+    # string per baris; kategori selalu lengkap agar potongan bisa digabung
+    # dengan pd.concat tanpa kehilangan dtype categorical
+    codes = np.asarray(codes, dtype=np.int8) - np.int8(first)
+    return pd.Categorical.from_codes(codes, categories=list(labels))
+
+
+# --- Laporan (python schema.py) ---
+
+def legacy_frame(df, hourly):
+    # Representasi lama: int64/float64, label string per baris, salinan hour_of_day
+    from pipeline import season_map, weather_map
+
+    df = df.copy()
+    df["dteday"] = pd.to_datetime(df["dteday"])
+    df["year"], df["month"], df["day"] = df["dteday"].dt.year, df["dteday"].dt.month, df["dteday"].dt.day
+    df["day_of_week"] = df["dteday"].dt.day_name()
+    if hourly:
+        df["hour_of_day"] = df["hr"]
+    df["season_name"] = df["season"].map(season_map)
+    df["weather_condition"] = df["weathersit"].map(weather_map)
+    df["casual_pct"] = df["casual"] / df["cnt"] * 100
+    df["registered_pct"] = df["registered"] / df["cnt"] * 100
+    return df
+
+
+def memory_report():
+    # Memori frame per proses worker: representasi lama vs skema ringkas
+    import data_loader
+
+    key = data_loader.data_signature()
+    raw = {"hour": pd.read_csv(key[0][0]), "day": pd.read_csv(key[1][0])}
+    schemas = {"hour": HOUR_SCHEMA, "day": DAY_SCHEMA}
+    prepared = dict(zip(("hour", "day"), data_loader.load_data()))
+    result = {}
+    for name, df in raw.items():
+        report = validate(df, schemas[name])
+        legacy = legacy_frame(df, hourly=name == "hour").memory_usage(deep=True).sum()
+        compact = prepared[name].memory_usage(deep=True).sum()
+        result[name] = {
+            "rows": report["rows"],
+            "errors": report["errors"],
+            "legacy_mb": round(legacy / 2**20, 2),
+            "compact_mb": round(compact / 2**20, 2),
+        }
+    legacy = sum(r["legacy_mb"] for r in result.values())
+    compact = sum(r["compact_mb"] for r in result.values())
+    result["saved_per_worker_mb"] = round(legacy - compact, 2)
+    result["saved_pct"] = round(100 * (1 - compact / legacy), 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validasi skema hour.csv/day.csv dan laporan memori "
+                                                 "(gunakan BIKE_DATA_DIR untuk data lain)")
+    parser.add_argument("--hour", help="validasi file dengan skema hour.csv saja")
+    parser.add_argument("--day", help="validasi file dengan skema day.csv saja")
+    args = parser.parse_args()
+
+    if args.hour or args.day:
+        errors = 0
+        for path, schema in ((args.hour, HOUR_SCHEMA), (args.day, DAY_SCHEMA)):
+            if path:
+                report = validate(pd.read_csv(path), schema)
+                errors += report["errors"]
+                print(json.dumps({"file": os.path.basename(path), **report}))
+        sys.exit(1 if errors else 0)
+
+    result = memory_report()
+    print(json.dumps(result))
+    sys.exit(1 if result["hour"]["errors"] or result["day"]["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
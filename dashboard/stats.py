@@ -0,0 +1,187 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from data_loader import get_artifact
+
+# Kolom numerik harian yang momennya disimpan; matriks korelasi untuk subset
+# kolom mana pun (mis. atemp/casual/registered di notebook) diambil dari sini
+# tanpa memindai ulang baris data
+STAT_COLUMNS = ["cnt", "casual", "registered", "temp", "atemp", "hum", "windspeed"]
+
+# Partisi momen harian: bulan kalender x kategori filter global. Filter
+# dashboard menggabungkan partisi yang terpilih (lihat filters.filter_moments)
+# sehingga hanya baris pada bulan di tepi rentang yang dipindai ulang
+MOMENT_KEYS = ["year", "month", "season", "weathersit", "workingday", "holiday"]
+
+# Garis regresi butuh minimal 3 baris (dof = n - 2) dengan nilai x yang tidak
+# semuanya sama; filter tanggal yang sempit bisa menyisakan lebih sedikit
+MIN_REGRESSION_ROWS = 3
+INSUFFICIENT_DATA = "Data tidak cukup untuk garis regresi (minimal 3 hari dengan suhu berbeda)"
+
+
+class Moments:
+    # Statistik cukup yang bisa digabung: n, rata-rata, dan co-moment
+    # C = sum((x - mean)(x - mean)^T). Baris baru digabung dengan rumus
+    # Chan/Welford sehingga tidak ada pengurangan dua angka besar (sum x^2 - n*mean^2).
+
+    def __init__(self, columns, n=0, mean=None, comoment=None, minimum=None, maximum=None):
+        k = len(columns)
+        self.columns = list(columns)
+        self.n = n
+        self.mean = np.zeros(k) if mean is None else np.asarray(mean, dtype=float)
+        self.comoment = np.zeros((k, k)) if comoment is None else np.asarray(comoment, dtype=float)
+        # Rentang nilai untuk garis regresi; tidak disusutkan saat subtract
+        self.minimum = np.full(k, np.inf) if minimum is None else np.asarray(minimum, dtype=float)
+        self.maximum = np.full(k, -np.inf) if maximum is None else np.asarray(maximum, dtype=float)
+
+    @classmethod
+    def from_frame(cls, df, columns=STAT_COLUMNS):
+        X = df[columns].to_numpy(dtype=float)
+        if len(X) == 0:
+            return cls(columns)
+        mean = X.mean(axis=0)
+        centered = X - mean
+        return cls(columns, len(X), mean, centered.T @ centered, X.min(axis=0), X.max(axis=0))
+
+    def copy(self):
+        return Moments(self.columns, self.n, self.mean.copy(), self.comoment.copy(),
+                       self.minimum.copy(), self.maximum.copy())
+
+    def merge(self, other):
+        # Gabungan dua partisi (Chan et al.)
+        if other.columns != self.columns:
+            other = other.subset(self.columns)
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * self.n * other.n / n
+        self.mean = self.mean + delta * other.n / n
+        self.n = n
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        return self
+
+    def subtract(self, other):
+        # Kebalikan merge: keluarkan kontribusi baris yang berubah/dihapus
+        if other.columns != self.columns:
+            other = other.subset(self.columns)
+        if other.n == 0:
+            return self
+        n = self.n - other.n
+        if n <= 0:
+            self.n, self.mean, self.comoment = 0, np.zeros_like(self.mean), np.zeros_like(self.comoment)
+            return self
+        mean = (self.n * self.mean - other.n * other.mean) / n
+        delta = other.mean - mean
+        self.comoment = self.comoment - other.comoment - np.outer(delta, delta) * n * other.n / self.n
+        self.mean = mean
+        self.n = n
+        return self
+
+    def add_rows(self, df):
+        return self.merge(Moments.from_frame(df, self.columns))
+
+    def remove_rows(self, df):
+        return self.subtract(Moments.from_frame(df, self.columns))
+
+    def subset(self, columns):
+        idx = [self.columns.index(c) for c in columns]
+        return Moments(columns, self.n, self.mean[idx], self.comoment[np.ix_(idx, idx)],
+                       self.minimum[idx], self.maximum[idx])
+
+    def cov(self, columns=None):
+        m = self if columns is None else self.subset(columns)
+        return pd.DataFrame(m.comoment / (m.n - 1), index=m.columns, columns=m.columns)
+
+    def corr(self, columns=None):
+        # Kolom tanpa variasi (atau n < 2) menghasilkan NaN, sama seperti DataFrame.corr()
+        m = self if columns is None else self.subset(columns)
+        std = np.sqrt(np.diag(m.comoment))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return pd.DataFrame(m.comoment / np.outer(std, std), index=m.columns, columns=m.columns)
+
+    def ols(self, x, y, level=0.95, points=100):
+        # Garis OLS y ~ x dengan pita kepercayaan analitik untuk rata-rata
+        # prediksi: t * s * sqrt(1/n + (x0 - x_mean)^2 / Sxx). None jika data
+        # tidak cukup (n < 3 atau semua x sama); pemanggil menampilkan catatan
+        i, j = self.columns.index(x), self.columns.index(y)
+        sxx, sxy, syy = self.comoment[i, i], self.comoment[i, j], self.comoment[j, j]
+        if self.n < MIN_REGRESSION_ROWS or not sxx > 0:
+            return None
+        slope = sxy / sxx
+        intercept = self.mean[j] - slope * self.mean[i]
+        dof = self.n - 2
+        s = np.sqrt(max(syy - slope * sxy, 0) / dof)
+
+        grid = np.linspace(self.minimum[i], self.maximum[i], points)
+        fitted = intercept + slope * grid
+        margin = t_quantile((1 + level) / 2, dof) * s * np.sqrt(1 / self.n + (grid - self.mean[i]) ** 2 / sxx)
+        return {
+            "slope": slope, "intercept": intercept, "x": grid, "y": fitted,
+            "lower": fitted - margin, "upper": fitted + margin,
+        }
+
+
+class PartitionedMoments:
+    # Moments per kombinasi MOMENT_KEYS, disimpan sebagai array (satu baris per partisi)
+
+    def __init__(self, keys, n, mean, comoment, minimum, maximum, columns=STAT_COLUMNS):
+        self.keys = keys
+        self.columns = list(columns)
+        self.n, self.mean, self.comoment = n, mean, comoment
+        self.minimum, self.maximum = minimum, maximum
+
+    @classmethod
+    def from_frame(cls, df, keys=MOMENT_KEYS, columns=STAT_COLUMNS):
+        # Satu pass: kode partisi lalu bincount per kolom dan per pasangan kolom
+        X = df[columns].to_numpy(dtype=float)
+        groups, codes = np.unique(df[keys].to_numpy(dtype=np.int64), axis=0, return_inverse=True)
+        codes = codes.ravel()
+        p, k = len(groups), len(columns)
+        n = np.bincount(codes, minlength=p)
+        mean = np.column_stack([np.bincount(codes, X[:, c], p) for c in range(k)]).reshape(p, k) / n[:, None]
+        centered = X - mean[codes]
+        comoment = np.empty((p, k, k))
+        for a in range(k):
+            for b in range(a, k):
+                comoment[:, a, b] = comoment[:, b, a] = np.bincount(codes, centered[:, a] * centered[:, b], p)
+        minimum, maximum = np.full((p, k), np.inf), np.full((p, k), -np.inf)
+        np.minimum.at(minimum, codes, X)
+        np.maximum.at(maximum, codes, X)
+        return cls(pd.DataFrame(groups, columns=keys), n, mean, comoment, minimum, maximum, columns)
+
+    def select(self, mask):
+        # Gabungan partisi terpilih sekaligus: rumus Chan untuk banyak partisi,
+        # C = sum(C_i) + sum(n_i (mean_i - mean)(mean_i - mean)^T)
+        n = self.n[mask]
+        total = int(n.sum())
+        if total == 0:
+            return Moments(self.columns)
+        mean = n @ self.mean[mask] / total
+        delta = self.mean[mask] - mean
+        comoment = self.comoment[mask].sum(axis=0) + (delta * n[:, None]).T @ delta
+        return Moments(self.columns, total, mean, comoment,
+                       self.minimum[mask].min(axis=0), self.maximum[mask].max(axis=0))
+
+
+def t_quantile(p, dof):
+    # Kuantil distribusi t (ekspansi Cornish-Fisher dari kuantil normal);
+    # galat < 1e-4 untuk dof >= 10, cukup untuk pita kepercayaan grafik
+    z = NormalDist().inv_cdf(p)
+    return (z
+            + (z ** 3 + z) / (4 * dof)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * dof ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * dof ** 3))
+
+
+def get_day_moments():
+    # Momen seluruh baris harian, dihitung sekali per versi data
+    return get_artifact("day_moments", lambda hour_df, day_df: Moments.from_frame(day_df))
+
+
+def get_day_partitions():
+    # Momen harian per partisi (lihat MOMENT_KEYS), dihitung sekali per versi data
+    return get_artifact("day_moment_partitions", lambda hour_df, day_df: PartitionedMoments.from_frame(day_df))
@@ -0,0 +1,465 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+from anomaly import AnomalyDetector, flag_anomalies
+from cube import LABELS, MEASURES
+from pipeline import add_features
+from schema import DAY_SCHEMA, HOUR_SCHEMA, check
+from streaming import CHUNK_ROWS, iter_chunks
+
+# Store lokal (SQLite, tanpa server) untuk query ad-hoc halaman "Explore".
+# Baris hour/day disimpan apa adanya dengan indeks (dteday, hr) dan indeks per
+# dimensi kategori. Di sampingnya ada tabel agregat (sum dan n per sel) yang
+# jauh lebih kecil; setiap query dijawab dari tabel terkecil yang memuat semua
+# kolom yang dipakai, dan baris mentah hanya dipindai untuk rentang tanggal.
+
+STORE_FILE = "bike.sqlite"
+
+# Dinaikkan setiap kali tabel/indeks store berubah agar store lama dibangun ulang
+STORE_VERSION = 1
+
+# Dimensi yang boleh dipakai group-by/filter (whitelist nama kolom SQL)
+DIMENSIONS = {
+    "hour": ["year", "month", "season", "weathersit", "workingday", "holiday", "weekday", "hr"],
+    "day": ["year", "month", "season", "weathersit", "workingday", "holiday", "weekday"],
+}
+DIMENSION_LABELS = {
+    "year": "Tahun", "month": "Bulan", "season": "Musim", "weathersit": "Cuaca", "workingday": "Hari kerja",
+    "holiday": "Hari libur", "weekday": "Hari", "hr": "Jam", "city": "Kota",
+}
+WEATHER_COLUMNS = ["temp", "hum", "windspeed"]
+AGGREGATIONS = {"sum": "Total", "mean": "Rata-rata", "count": "Jumlah baris"}
+
+# Tabel agregat per level, dari yang terkecil: profil tanpa kalender dan
+# ringkasan bulanan (kota ditambahkan jika data multi-kota). Hanya kombinasi
+# jam dengan tahun/bulan, atau rentang tanggal, yang dihitung dari baris mentah.
+AGGREGATES = {
+    "hour": {
+        "hour_profile": ["season", "weathersit", "workingday", "holiday", "weekday", "hr", "anomaly"],
+        "hour_monthly": ["year", "month", "season", "weathersit", "workingday", "holiday", "weekday", "anomaly"],
+    },
+    "day": {
+        "day_profile": ["season", "weathersit", "workingday", "holiday", "weekday"],
+        "day_monthly": ["year", "month", "season", "weathersit", "workingday", "holiday", "weekday"],
+    },
+}
+
+INDEXES = {
+    "hour": [("dteday", "hr"), ("season",), ("weathersit",), ("workingday",), ("holiday",), ("weekday",)],
+    "day": [("dteday",), ("season",), ("weathersit",), ("workingday",), ("holiday",), ("weekday",)],
+}
+
+# Jumlah hasil query yang disimpan per proses
+MAX_CACHED = 64
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+_synced = None
+
+
+def store_path(data_dir=None):
+    return os.path.join(data_dir or data_loader.resolve_data_dir(), STORE_FILE)
+
+
+def connect(path):
+    # Satu koneksi per pemanggilan: murah, dan aman dipakai dari thread mana pun
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA cache_size = -65536")
+    return conn
+
+
+def has_city(conn):
+    return "city" in [row[1] for row in conn.execute("PRAGMA table_info(hour)")]
+
+
+def dimensions(level, city=False):
+    return DIMENSIONS[level] + (["city"] if city else [])
+
+
+def aggregate_keys(level, city=False):
+    return {name: keys + (["city"] if city else []) for name, keys in AGGREGATES[level].items()}
+
+
+def row_columns(level, city=False):
+    extra = ["hr", "anomaly"] if level == "hour" else []
+    keys = [c for c in DIMENSIONS[level] if c != "hr"]
+    return ["instant", "dteday"] + keys + extra + (["city"] if city else []) + WEATHER_COLUMNS + MEASURES
+
+
+def date_code(dates):
+    # dteday disimpan sebagai integer yyyymmdd: terurut, ringkas, dan mudah dibaca di SQL
+    dates = pd.DatetimeIndex(dates)
+    return dates.year * 10000 + dates.month * 100 + dates.day
+
+
+def day_code(date):
+    return int(date_code([pd.Timestamp(date)])[0])
+
+
+# --- Pembuatan dan pembaruan store ---
+
+def create_tables(conn, city):
+    for level in ("hour", "day"):
+        columns = row_columns(level, city)
+        kinds = {c: "REAL" if c in WEATHER_COLUMNS else "INTEGER" for c in columns}
+        conn.execute(f"CREATE TABLE {level} ({', '.join(f'{c} {kinds[c]}' for c in columns)})")
+        for name, keys in aggregate_keys(level, city).items():
+            sums = [f"{m}_sum INTEGER" for m in MEASURES]
+            conn.execute(f"CREATE TABLE {name} ({', '.join(f'{k} INTEGER' for k in keys)}, "
+                         f"{', '.join(sums)}, n INTEGER, PRIMARY KEY ({', '.join(keys)})) WITHOUT ROWID")
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+
+
+def create_indexes(conn):
+    # Dibuat setelah bulk load (lebih cepat daripada memperbarui indeks per baris)
+    for level, indexes in INDEXES.items():
+        for columns in indexes:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {level}_{'_'.join(columns)} ON {level} ({', '.join(columns)})")
+    # Statistik untuk query planner, agar indeks kategori berselektivitas rendah tidak dipakai sembarangan
+    conn.execute("ANALYZE")
+
+
+def insert_rows(conn, level, frame, city):
+    columns = row_columns(level, city)
+    values = {c: frame[c].to_numpy() for c in columns if c != "dteday"}
+    values["dteday"] = date_code(frame["dteday"]).to_numpy()
+    rows = zip(*[values[c].tolist() for c in columns])
+    conn.executemany(f"INSERT INTO {level} VALUES ({', '.join('?' * len(columns))})", rows)
+
+
+def partial_aggregates(level, frame, city):
+    # Sum dan n per sel untuk setiap tabel agregat (seperti build_cube)
+    result = {}
+    for name, keys in aggregate_keys(level, city).items():
+        grouped = frame.groupby(keys, sort=False)
+        cells = grouped[MEASURES].sum().astype("int64").add_suffix("_sum")
+        cells["n"] = grouped.size()
+        result[name] = cells.reset_index()
+    return result
+
+
+def upsert_aggregates(conn, partials, sign=1):
+    # Sel yang sudah ada ditambah (sign=-1 untuk mengurangi), sel baru disisipkan
+    for name, cells in partials.items():
+        columns = list(cells.columns)
+        keys = [c for c in columns if not c.endswith("_sum") and c != "n"]
+        values = [c for c in columns if c not in keys]
+        updates = ", ".join(f"{c} = {c} + excluded.{c}" for c in values)
+        data = cells[keys].to_numpy(dtype=np.int64).tolist()
+        amounts = (cells[values].to_numpy(dtype=np.int64) * sign).tolist()
+        conn.executemany(
+            f"INSERT INTO {name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}",
+            (k + v for k, v in zip(data, amounts)),
+        )
+
+
+def write_meta(conn, hour_df, previous=None):
+    # Ringkasan prefiks hour yang tersimpan, untuk mendeteksi append vs data baru
+    meta = dict(previous or {"version": STORE_VERSION, "rows": 0, "max_instant": 0, "cnt_total": 0})
+    if len(hour_df):
+        meta["rows"] += len(hour_df)
+        meta["max_instant"] = max(meta["max_instant"], int(hour_df["instant"].max()))
+        meta["cnt_total"] += int(hour_df["cnt"].to_numpy().sum(dtype=np.int64))
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('state', ?)", (json.dumps(meta),))
+    return meta
+
+
+def read_meta(conn):
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'state'").fetchone()
+    except sqlite3.DatabaseError:
+        return None
+    return json.loads(row[0]) if row else None
+
+
+def build(path, chunks):
+    # Bulk load ke file sementara lalu diganti secara atomik; pembaca lama
+    # tetap melihat store sebelumnya sampai selesai. chunks: (level, frame) terurut
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = connect(tmp_path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    meta, city = None, None
+    try:
+        conn.execute("BEGIN")
+        for level, frame in chunks:
+            if city is None:
+                city = "city" in frame.columns
+                create_tables(conn, city)
+            insert_rows(conn, level, frame, city)
+            upsert_aggregates(conn, partial_aggregates(level, frame, city))
+            if level == "hour":
+                meta = write_meta(conn, frame, meta)
+        conn.execute("COMMIT")
+        create_indexes(conn)
+    except BaseException:
+        conn.close()
+        os.remove(tmp_path)
+        raise
+    conn.close()
+    os.replace(tmp_path, path)
+    return meta
+
+
+def frame_chunks(hour_df, day_df, chunk_rows=CHUNK_ROWS):
+    # Frame hasil prepare_data dimasukkan per potongan agar memori tambahan kecil
+    for level, df in (("hour", hour_df), ("day", day_df)):
+        for start in range(0, len(df), chunk_rows):
+            yield level, df.iloc[start:start + chunk_rows]
+
+
+def csv_chunks(hour_path, day_path, chunk_rows=CHUNK_ROWS):
+    # Dari CSV tanpa memuat seluruh file: validasi, tandai anomali dengan
+    # detektor online, lalu perkaya per potongan (sama seperti streaming.py)
+    detector = AnomalyDetector()
+    for chunk in iter_chunks(hour_path, chunk_rows):
+        check(chunk, HOUR_SCHEMA, hour_path)
+        yield "hour", add_features(flag_anomalies(chunk, detector))
+    for chunk in iter_chunks(day_path, chunk_rows):
+        check(chunk, DAY_SCHEMA, day_path)
+        yield "day", add_features(chunk)
+
+
+def append(path, hour_rows, day_rows):
+    # Bulk append baris per jam baru (hasil ingestion). Baris harian untuk
+    # tanggal yang tersentuh diganti, dan kontribusinya di tabel agregat
+    # dikurangi dulu sebelum baris baru ditambahkan.
+    conn = connect(path)
+    try:
+        # BEGIN IMMEDIATE: hanya satu proses yang menulis; meta dibaca ulang di dalam transaksi
+        conn.execute("BEGIN IMMEDIATE")
+        meta = read_meta(conn)
+        city = has_city(conn)
+        hour_rows = hour_rows[hour_rows["instant"] > meta["max_instant"]]
+        if len(hour_rows):
+            insert_rows(conn, "hour", hour_rows, city)
+            upsert_aggregates(conn, partial_aggregates("hour", hour_rows, city))
+            first = day_code(hour_rows["dteday"].min())
+            columns = row_columns("day", city)
+            old = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM day WHERE dteday >= ?", conn, params=(first,))
+            old["dteday"] = pd.to_datetime(old["dteday"].astype(str), format="%Y%m%d")
+            upsert_aggregates(conn, partial_aggregates("day", old, city), sign=-1)
+            conn.execute("DELETE FROM day WHERE dteday >= ?", (first,))
+            new = day_rows[day_rows["dteday"] >= pd.Timestamp(str(first))]
+            insert_rows(conn, "day", new, city)
+            upsert_aggregates(conn, partial_aggregates("day", new, city))
+            write_meta(conn, hour_rows, meta)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return len(hour_rows)
+
+
+def sync():
+    # Store disamakan dengan data yang sedang di-cache dashboard: baris baru
+    # dari ingestion ditambahkan, data lain (CSV diganti) membuat store dibangun ulang
+    global _synced
+    version = data_loader.data_version()
+    if _synced == version:
+        return store_path()
+    with _lock:
+        if _synced != version:
+            hour_df, day_df = data_loader.load_data()
+            path = store_path()
+            meta = None
+            if os.path.exists(path):
+                conn = connect(path)
+                try:
+                    meta = read_meta(conn)
+                finally:
+                    conn.close()
+            instant = hour_df["instant"].to_numpy()
+            seen = instant <= (meta["max_instant"] if meta else 0)
+            if (meta is None or meta.get("version") != STORE_VERSION or int(seen.sum()) != meta["rows"]
+                    or int(hour_df["cnt"].to_numpy()[seen].sum(dtype=np.int64)) != meta["cnt_total"]):
+                build(path, frame_chunks(hour_df, day_df))
+            elif not seen.all():
+                append(path, hour_df[~seen], day_df)
+            _synced = version
+    return store_path()
+
+
+# --- Query ---
+
+def plan(level, group_by, filters, measure, start, end, include_anomalies, city):
+    # Nama kolom hanya dari whitelist; nilai filter selalu lewat parameter SQL
+    allowed = dimensions(level, city)
+    unknown = [c for c in list(group_by) + list(filters) if c not in allowed]
+    if unknown or level not in DIMENSIONS:
+        raise ValueError(f"Kolom tidak dikenal untuk level {level}: {', '.join(unknown) or level}")
+    if measure not in MEASURES:
+        raise ValueError(f"Measure tidak dikenal: {measure}")
+
+    used = set(group_by) | set(filters) | ({"anomaly"} if level == "hour" else set())
+    table = level
+    if start is None and end is None:
+        # Tabel agregat terkecil yang memuat semua kolom yang dipakai
+        for name, keys in aggregate_keys(level, city).items():
+            if used <= set(keys):
+                table = name
+                break
+    if table == level:
+        total, count = f"SUM({measure})", "COUNT(*)"
+    else:
+        total, count = f"SUM({measure}_sum)", "SUM(n)"
+
+    where, params = [], []
+    if start is not None:
+        where.append("dteday >= ?")
+        params.append(day_code(start))
+    if end is not None:
+        where.append("dteday <= ?")
+        params.append(day_code(end))
+    if level == "hour" and not include_anomalies:
+        where.append("anomaly = 0")
+    for column, values in sorted(filters.items()):
+        where.append(f"{column} IN ({', '.join('?' * len(values))})")
+        params.extend(int(v) for v in values)
+
+    sql = f"SELECT {', '.join(list(group_by) + [f'{total} AS total', f'{count} AS n'])} FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if group_by:
+        sql += f" GROUP BY {', '.join(group_by)} HAVING n > 0 ORDER BY {', '.join(group_by)}"
+    return table, sql, params
+
+
+def run_query(path, level="hour", group_by=("hr",), filters=None, measure="cnt", agg="mean",
+              start=None, end=None, include_anomalies=False):
+    conn = connect(path)
+    try:
+        table, sql, params = plan(level, list(group_by), filters or {}, measure, start, end,
+                                  include_anomalies, has_city(conn))
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    result = pd.DataFrame(rows, columns=list(group_by) + ["total", "n"])
+    if not group_by and len(result) and result["n"].isna().all():
+        result = result.iloc[:0]
+    if agg == "sum":
+        result["value"] = result["total"]
+    elif agg == "mean":
+        result["value"] = result["total"] / result["n"]
+    else:
+        result["value"] = result["n"]
+    return table, result[list(group_by) + ["value", "n"]]
+
+
+def label(result):
+    # Kode dimensi diganti label (sama seperti roll-up cube)
+    result = result.copy()
+    for column in result.columns:
+        if column in LABELS:
+            result[column] = result[column].map(LABELS[column][1])
+    return result.rename(columns=DIMENSION_LABELS)
+
+
+def query(level="hour", group_by=("hr",), filters=None, measure="cnt", agg="mean",
+          start=None, end=None, include_anomalies=False):
+    # Hasil di-cache per (versi data, parameter) dengan LRU kecil.
+    # Mengembalikan (tabel sumber, hasil, hit cache)
+    path = sync()
+    filters = {c: tuple(sorted(int(v) for v in values)) for c, values in (filters or {}).items()}
+    key = (data_loader.data_version(), level, tuple(group_by), tuple(sorted(filters.items())), measure, agg,
+           start, end, include_anomalies)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached[0], cached[1], True
+    table, result = run_query(path, level, group_by, filters, measure, agg, start, end, include_anomalies)
+    with _lock:
+        _cache[key] = (table, result)
+        while len(_cache) > MAX_CACHED:
+            _cache.popitem(last=False)
+    return table, result, False
+
+
+# --- Pengukuran (python store.py --measure); kesetaraan diuji di tests/test_store.py ---
+
+def random_queries(n, city, seed=0):
+    rng = np.random.default_rng(seed)
+    values = {"season": [1, 2, 3, 4], "weathersit": [1, 2, 3, 4], "workingday": [0, 1], "holiday": [0, 1],
+              "weekday": list(range(7))}
+    for i in range(n):
+        level = "hour" if rng.random() < 0.7 else "day"
+        dims = dimensions(level, city)
+        group_by = list(rng.choice(dims, size=rng.integers(1, 3), replace=False))
+        filters = {c: [v for v in vals if rng.random() < 0.6] or [vals[0]]
+                   for c, vals in values.items() if rng.random() < 0.4}
+        yield {"level": level, "group_by": tuple(str(g) for g in group_by), "filters": filters,
+               "measure": str(rng.choice(MEASURES)), "agg": str(rng.choice(list(AGGREGATIONS)))}
+
+
+def measure(data_dir=None, n=30, rebuild=False):
+    # Waktu bulk load dari CSV (streaming) dan latensi query, tanpa memuat data ke dashboard
+    data_dir = data_dir or data_loader.resolve_data_dir()
+    path = store_path(data_dir)
+    hour_path = os.path.join(data_dir, data_loader.HOUR_FILE)
+    day_path = os.path.join(data_dir, data_loader.DAY_FILE)
+    result = {}
+    if rebuild or not os.path.exists(path):
+        start = time.perf_counter()
+        build(path, csv_chunks(hour_path, day_path))
+        result["build_s"] = round(time.perf_counter() - start, 1)
+    conn = connect(path)
+    try:
+        city = has_city(conn)
+        result["hour_rows"] = conn.execute("SELECT COUNT(*) FROM hour").fetchone()[0]
+        dates = conn.execute("SELECT MIN(dteday), MAX(dteday) FROM day").fetchone()
+    finally:
+        conn.close()
+    result["store_mb"] = round(os.path.getsize(path) / 2**20, 1)
+
+    latencies = {}
+    first = pd.Timestamp(str(dates[0]))
+    queries = list(random_queries(n, city, seed=1))
+    # Rentang tanggal satu bulan dijawab dari baris mentah lewat indeks
+    queries += [{"level": "hour", "group_by": ("hr",), "filters": q["filters"], "measure": "cnt", "agg": "mean",
+                 "start": first + pd.Timedelta(days=30 * i), "end": first + pd.Timedelta(days=30 * i + 30)}
+                for i, q in enumerate(queries[:10])]
+    for params in queries:
+        start = time.perf_counter()
+        table, _ = run_query(path, **params)
+        latencies.setdefault(table, []).append(time.perf_counter() - start)
+    for table, values in sorted(latencies.items()):
+        result[f"{table}_p50_ms"] = round(float(np.percentile(values, 50)) * 1000, 1)
+        result[f"{table}_max_ms"] = round(max(values) * 1000, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store SQLite lokal untuk query ad-hoc (halaman Explore)")
+    parser.add_argument("--data-dir", help="folder berisi hour.csv dan day.csv (mis. hasil synthetic.py)")
+    parser.add_argument("--verify", action="store_true", help="bandingkan hasil query dengan groupby pandas")
+    parser.add_argument("--measure", action="store_true", help="ukur waktu bulk load dan latensi query")
+    parser.add_argument("--rebuild", action="store_true", help="bangun ulang store dari CSV sebelum mengukur")
+    parser.add_argument("--n", type=int, default=30, help="jumlah query acak")
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(data_loader.run_tests("test_store.py", data_dir=args.data_dir))
+    elif args.measure:
+        print(json.dumps(measure(args.data_dir, args.n, args.rebuild)))
+    else:
+        print(f"Store diperbarui: {sync()}")
+
+
+if __name__ == "__main__":
+    main()
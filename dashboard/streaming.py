@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+import data_loader
+from anomaly import AnomalyDetector, flag_anomalies
+from cube import DAY_KEYS, HOUR_KEYS, build_cube, merge_cubes
+from pipeline import add_features, compact_dtypes, concat_prepared
+from schema import DAY_SCHEMA, HOUR_SCHEMA, check
+
+# Jumlah baris per potongan; memori puncak sebanding nilai ini, bukan ukuran file
+CHUNK_ROWS = int(os.environ.get("BIKE_CHUNK_ROWS", 100_000))
+
+
+def iter_chunks(path, chunk_rows=CHUNK_ROWS):
+    # Generator potongan CSV; hanya satu potongan yang ada di memori
+    yield from pd.read_csv(path, chunksize=chunk_rows)
+
+
+def stream_hour_cube(path, chunk_rows=CHUNK_ROWS):
+    # Satu pass: tandai anomali dengan detektor online, perkaya, lalu agregasi
+    # per potongan. State detektor berukuran jumlah slot, bukan jumlah baris.
+    # Partial cube ditampung lalu digabung begitu ukurannya melewati satu
+    # potongan, sehingga akumulator tetap sebesar jumlah sel cube.
+    detector = AnomalyDetector()
+    pending, rows, anomalies = [], 0, 0
+    for chunk in iter_chunks(path, chunk_rows):
+        rows += len(chunk)
+        check(chunk, HOUR_SCHEMA, path)
+        chunk = add_features(flag_anomalies(chunk, detector))
+        anomalies += int(chunk["anomaly"].sum())
+        pending.append(build_cube(chunk, HOUR_KEYS))
+        if len(pending) > 1 and sum(map(len, pending)) > chunk_rows:
+            pending = [merge_cubes(pending, HOUR_KEYS)]
+    cube = merge_cubes(pending, HOUR_KEYS) if len(pending) > 1 else pending[0]
+    return cube, rows, anomalies, detector
+
+
+def stream_day(path, chunk_rows=CHUNK_ROWS):
+    # day_df tetap dikumpulkan (satu baris per hari) karena dipakai chart tren
+    # harian dan korelasi; cube harian dibangun bersamaan
+    partials, frames = [], []
+    for chunk in iter_chunks(path, chunk_rows):
+        check(chunk, DAY_SCHEMA, path)
+        enriched = compact_dtypes(add_features(chunk))
+        frames.append(enriched)
+        partials.append(build_cube(enriched, DAY_KEYS))
+    cube = merge_cubes(partials, DAY_KEYS) if len(partials) > 1 else partials[0]
+    day_df = concat_prepared(frames) if len(frames) > 1 else frames[0]
+    return cube, day_df
+
+
+def stream_data(hour_path=None, day_path=None, chunk_rows=CHUNK_ROWS):
+    # Hasil setara load_data() + get_cubes() untuk chart dashboard, tanpa
+    # pernah memuat seluruh hour.csv sekaligus
+    data_dir = data_loader.resolve_data_dir() if hour_path is None or day_path is None else None
+    hour_path = hour_path or os.path.join(data_dir, data_loader.HOUR_FILE)
+    day_path = day_path or os.path.join(data_dir, data_loader.DAY_FILE)
+
+    hour_cube, rows, anomalies, detector = stream_hour_cube(hour_path, chunk_rows)
+    day_cube, day_df = stream_day(day_path, chunk_rows)
+    return {
+        "cubes": {"hour": hour_cube, "day": day_cube},
+        "day_df": day_df,
+        "detector": detector,
+        "rows": rows,
+        "anomalies": anomalies,
+    }
+
+
+def normalize_cube(cube, keys):
+    # Tipe kolom disamakan agar cube streaming dan in-memory bisa dibandingkan langsung
+    return cube.sort_values(keys).reset_index(drop=True).astype("int64")
+
+
+def measure(chunk_rows=CHUNK_ROWS):
+    # Waktu dan memori puncak (tracemalloc) satu kali proses streaming
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = stream_data(chunk_rows=chunk_rows)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "chunk_rows": chunk_rows,
+        "rows": result["rows"],
+        "seconds": round(elapsed, 3),
+        "peak_mb": round(peak / 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agregasi hour.csv/day.csv per potongan (streaming)")
+    parser.add_argument("--hour", help="path file dengan skema hour.csv")
+    parser.add_argument("--day", help="path file dengan skema day.csv")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="jumlah baris per potongan")
+    parser.add_argument("--verify", action="store_true", help="jalankan tests/test_streaming.py (bandingkan dengan jalur in-memory)")
+    parser.add_argument("--measure", action="store_true", help="ukur waktu dan memori puncak")
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(data_loader.run_tests("test_streaming.py"))
+    elif args.measure:
+        print(json.dumps(measure(args.chunk_rows)))
+    else:
+        result = stream_data(args.hour, args.day, args.chunk_rows)
+        print(json.dumps({
+            "rows": result["rows"],
+            "anomalies": result["anomalies"],
+            "hour_cells": len(result["cubes"]["hour"]),
+            "day_rows": len(result["day_df"]),
+        }))
+
+
+if __name__ == "__main__":
+    main()
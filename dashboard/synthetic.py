@@ -0,0 +1,92 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+from ingest import DAY_COLUMNS, HOUR_COLUMNS
+
+# Data sintetis untuk uji skala: salinan hour.csv bawaan dengan kolom kota
+# tambahan, tanggal digeser per blok tahun, dan jumlah penyewaan diberi noise.
+# day.csv dibentuk dari agregasi baris per jam sehingga keduanya konsisten.
+
+
+def load_base():
+    data_dir = data_loader.resolve_data_dir()
+    return pd.read_csv(os.path.join(data_dir, data_loader.HOUR_FILE))
+
+
+def replicate(base, index, cities, rng, noise=0.1):
+    # Replika ke-i: kota i % cities, digeser 4*(i // cities) tahun
+    # (kelipatan 4 agar tanggal kabisat tetap ada)
+    df = base.copy()
+    shift = 4 * (index // cities)
+    dteday = pd.to_datetime(df["dteday"]) + pd.DateOffset(years=shift)
+    df["dteday"] = dteday.dt.strftime("%Y-%m-%d")
+    df["yr"] = dteday.dt.year - 2011
+    df["weekday"] = (dteday.dt.dayofweek + 1) % 7
+    df["workingday"] = (df["weekday"].between(1, 5) & (df["holiday"] == 0)).astype(int)
+
+    factor = rng.lognormal(0, noise, len(df))
+    df["casual"] = np.rint(df["casual"] * factor).astype(int)
+    df["registered"] = np.rint(df["registered"] * factor).astype(int)
+    df["cnt"] = df["casual"] + df["registered"]
+    for column in ["temp", "atemp", "hum", "windspeed"]:
+        jitter = rng.normal(0, 0.02, len(df))
+        df[column] = (df[column] + jitter).clip(0, 1).round(4)
+    df["city"] = index % cities
+    return df
+
+
+def daily_rows(hour_df):
+    # Rollup harian dengan aturan yang sama seperti day.csv
+    grouped = hour_df.groupby(["city", "dteday"], sort=True)
+    day = grouped[["season", "yr", "mnth", "holiday", "weekday", "workingday"]].first()
+    weather = hour_df.groupby(["city", "dteday", "weathersit"]).size().rename("hours").reset_index()
+    weather = weather.sort_values("hours", kind="stable").drop_duplicates(["city", "dteday"], keep="last")
+    day["weathersit"] = weather.set_index(["city", "dteday"])["weathersit"]
+    means = grouped[["temp", "atemp", "hum", "windspeed"]].mean().round(6)
+    sums = grouped[["casual", "registered", "cnt"]].sum()
+    return pd.concat([day, means, sums], axis=1).reset_index()
+
+
+def generate(output_dir, scale=10, cities=None, seed=0):
+    # Ditulis per replika agar memori tidak bertambah sesuai skala
+    cities = cities or min(scale, 10)
+    rng = np.random.default_rng(seed)
+    base = load_base()
+    os.makedirs(output_dir, exist_ok=True)
+    hour_path = os.path.join(output_dir, data_loader.HOUR_FILE)
+    day_path = os.path.join(output_dir, data_loader.DAY_FILE)
+
+    hour_instant = day_instant = 1
+    for index in range(scale):
+        hour_df = replicate(base, index, cities, rng)
+        hour_df["instant"] = np.arange(hour_instant, hour_instant + len(hour_df))
+        hour_instant += len(hour_df)
+        day_df = daily_rows(hour_df)
+        day_df["instant"] = np.arange(day_instant, day_instant + len(day_df))
+        day_instant += len(day_df)
+
+        header = index == 0
+        mode = "w" if header else "a"
+        hour_df[HOUR_COLUMNS + ["city"]].to_csv(hour_path, mode=mode, header=header, index=False)
+        day_df[DAY_COLUMNS + ["city"]].to_csv(day_path, mode=mode, header=header, index=False)
+    return hour_path, day_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Buat data sintetis berskema hour.csv/day.csv")
+    parser.add_argument("output_dir")
+    parser.add_argument("--scale", type=int, default=10, help="kelipatan ukuran data bawaan")
+    parser.add_argument("--cities", type=int, help="jumlah kota (default: min(scale, 10))")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for path in generate(args.output_dir, args.scale, args.cities, args.seed):
+        print(f"Ditulis: {path}")
+
+
+if __name__ == "__main__":
+    main()
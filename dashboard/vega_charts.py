@@ -0,0 +1,345 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from cube import rollup, totals
+from pipeline import day_order
+from stats import INSUFFICIENT_DATA, get_day_moments
+
+# Mode render chart per deployment (env BIKE_CHART_MODE):
+# - "png"  : figure matplotlib dirender di server lalu dikirim sebagai gambar (default)
+# - "vega" : hanya data agregat (puluhan sampai ratusan titik) yang dikirim;
+#            chart Vega-Lite digambar di browser, termasuk tooltip, zoom/pan,
+#            dan klik legenda, tanpa rerun atau render ulang di server
+# Builder yang belum punya versi Vega-Lite tetap memakai PNG.
+CHART_MODES = ("png", "vega")
+CHART_MODE = os.environ.get("BIKE_CHART_MODE", "png").lower()
+if CHART_MODE not in CHART_MODES:
+    raise ValueError(f"BIKE_CHART_MODE harus salah satu dari {', '.join(CHART_MODES)}, bukan {CHART_MODE!r}")
+
+# Jumlah titik maksimum per seri pada chart tren harian (dirata-rata per bin)
+MAX_TREND_POINTS = 200
+
+# Jumlah titik scatter maksimum (sampel acak dengan seed tetap)
+MAX_SCATTER_POINTS = 500
+
+# Spec per kombinasi (chart, filter, versi data) yang disimpan per proses
+MAX_CACHED = 64
+
+VIRIDIS = ["#440154", "#31688e", "#35b779", "#fde725"]
+
+# Zoom/pan dengan drag dan scroll, hanya untuk sumbu kontinu
+ZOOM = {"name": "zoom", "select": "interval", "bind": "scales"}
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+# --- Helper spec ---
+
+def records(frame):
+    # Data inline yang ringkas: float dibulatkan, tanggal sebagai string ISO
+    frame = frame.copy()
+    for column in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[column]):
+            frame[column] = frame[column].dt.strftime("%Y-%m-%d")
+        elif pd.api.types.is_float_dtype(frame[column]):
+            frame[column] = frame[column].round(2)
+            # NaN bukan JSON yang valid; Vega-Lite membaca null sebagai nilai kosong
+            if frame[column].isna().any():
+                frame[column] = frame[column].astype(object).where(frame[column].notna(), None)
+        elif isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype(str)
+    return frame.to_dict("records")
+
+
+def chart(frame, mark, encoding, title, zoom=False, legend=None):
+    spec = {
+        **({"title": title} if title else {}),
+        "data": {"values": records(frame)},
+        "mark": {"type": mark, "tooltip": True} if isinstance(mark, str) else {**mark, "tooltip": True},
+        "encoding": encoding,
+    }
+    params = [ZOOM] if zoom else []
+    if legend is not None:
+        # Klik legenda menyembunyikan/menonjolkan seri di browser
+        params.append({"name": "series", "select": {"type": "point", "fields": [legend]}, "bind": "legend"})
+        spec["encoding"] = {**encoding, "opacity": {"condition": {"param": "series", "value": 1}, "value": 0.15}}
+    if params:
+        spec["params"] = params
+    return spec
+
+
+def layer(title, *layers, zoom=False):
+    spec = {"title": title, "layer": list(layers)}
+    if zoom:
+        spec["layer"][0] = {**spec["layer"][0], "params": spec["layer"][0].get("params", []) + [ZOOM]}
+    return spec
+
+
+def field(name, kind, title=None, **extra):
+    return {"field": name, "type": kind, **({"title": title} if title else {}), **extra}
+
+
+def color(name, title, domain=None, scheme="viridis"):
+    scale = {"scheme": scheme} if domain is None else {"domain": domain, "scheme": scheme}
+    return field(name, "nominal", title, scale=scale)
+
+
+def trend_points(day_df, by, max_points=MAX_TREND_POINTS):
+    # Rata-rata cnt harian per bin waktu dan kategori; jumlah titik tetap
+    # kecil berapa pun panjang datanya (juga untuk data multi-kota)
+    dates = day_df["dteday"]
+    first = dates.min()
+    days = (dates - first).dt.days.to_numpy()
+    width = max(1, -(-(int(days.max()) + 1) // max_points))
+    start = first + pd.to_timedelta(days // width * width, unit="D")
+    grouped = day_df.assign(start=start).groupby(["start", by], observed=True, sort=True)["cnt"].mean()
+    return grouped.rename("cnt").reset_index()
+
+
+def ordered(frame, column, order):
+    return frame.assign(**{column: pd.Categorical(frame[column], [o for o in order if o in set(frame[column])])}) \
+        .sort_values(column)
+
+
+# --- Spec per pertanyaan (padanan builder di charts.py) ---
+# Setiap fungsi mengembalikan baris-baris chart, sesuai tata letak subplot figure-nya
+
+def category_specs(cubes, day_df, key, label, title, order_by_total=True):
+    stats = rollup(cubes["day"], [key]).reset_index()
+    name = stats.columns[0]
+    ranked = stats.sort_values("cnt_sum", ascending=False) if order_by_total else stats
+    sort = ranked[name].astype(str).tolist()
+    x = field(name, "nominal", label, sort=sort)
+    trend = trend_points(day_df, name)
+    return [
+        [chart(ranked[[name, "cnt_sum"]], "bar", {"x": x, "y": field("cnt_sum", "quantitative", "Total Sewa"),
+                                                  "color": color(name, label)},
+               f"Total Sewa Sepeda Berdasarkan {title}"),
+         chart(ranked[[name, "cnt_mean"]], "bar", {"x": x, "y": field("cnt_mean", "quantitative", "Rata-rata Sewa per Hari"),
+                                                   "color": color(name, label)},
+               f"Rata-Rata Sewa Sepeda Harian Berdasarkan {title}")],
+        [chart(trend, "line", {"x": field("start", "temporal", "Tanggal"),
+                               "y": field("cnt", "quantitative", "Rata-rata Sewa Harian"),
+                               "color": color(name, label)},
+               f"Tren Sewa Sepeda Berdasarkan {title}", zoom=True, legend=name),
+         chart(stats[[name, "cnt_sum"]], {"type": "line", "point": True, "color": "purple"},
+               {"x": field(name, "nominal", label, sort=stats[name].astype(str).tolist()),
+                "y": field("cnt_sum", "quantitative", "Total Sewa")},
+               f"Total Sewa Sepeda untuk Setiap {title}")],
+    ]
+
+
+def season_specs(cubes, day_df):
+    return category_specs(cubes, day_df, "season", "Musim", "Musim")
+
+
+def weather_specs(cubes, day_df):
+    return category_specs(cubes, day_df, "weathersit", "Kondisi Cuaca", "Kondisi Cuaca")
+
+
+def hourly_specs(cubes, day_df):
+    hourly = rollup(cubes["hour"], ["hr"]).reset_index()
+    grid = rollup(cubes["hour"], ["weekday", "hr"])["cnt_sum"].reset_index()
+    return [[
+        chart(hourly[["hr", "cnt_sum"]], {"type": "line", "point": True, "color": "purple"},
+              {"x": field("hr", "quantitative", "Jam"), "y": field("cnt_sum", "quantitative", "Jumlah Sewa")},
+              "Tren Sewa Sepeda per Jam dalam Sehari", zoom=True),
+        chart(grid, "rect", {"x": field("hr", "ordinal", "Jam"),
+                             "y": field("day_of_week", "ordinal", "Hari", sort=list(day_order)),
+                             "color": field("cnt_sum", "quantitative", "Jumlah Sewa", scale={"scheme": "viridis"})},
+              "Pola Sewa Sepeda (Jam vs. Hari)"),
+    ]]
+
+
+def split_specs(cubes, key, labels, title, line_title, label):
+    totals_ = rollup(cubes["day"], [key])["cnt_sum"].reset_index()
+    totals_[label] = totals_[key].map(dict(enumerate(labels)))
+    hourly = rollup(cubes["hour"], ["hr", key])["cnt_sum"].reset_index()
+    hourly[label] = hourly[key].map(dict(enumerate(labels)))
+    return [[
+        chart(totals_[[label, "cnt_sum"]], "bar", {"x": field(label, "nominal", label, sort=labels),
+                                                   "y": field("cnt_sum", "quantitative", "Jumlah Sewa"),
+                                                   "color": color(label, label, labels)}, title),
+        chart(hourly[["hr", label, "cnt_sum"]], {"type": "line", "point": True},
+              {"x": field("hr", "quantitative", "Jam"), "y": field("cnt_sum", "quantitative", "Jumlah Sewa"),
+               "color": color(label, "Kategori", labels)},
+              line_title, zoom=True, legend=label),
+    ]]
+
+
+def workingday_specs(cubes, day_df):
+    return split_specs(cubes, "workingday", ["Akhir Pekan", "Hari Kerja"],
+                       "Total Sewa Sepeda: Hari Kerja vs. Akhir Pekan",
+                       "Tren Sewa Sepeda Sepanjang Hari: Hari Kerja vs. Akhir Pekan", "Tipe Hari")
+
+
+def holiday_specs(cubes, day_df):
+    return split_specs(cubes, "holiday", ["Hari Biasa", "Hari Libur"],
+                       "Total Sewa Sepeda: Hari Libur vs. Hari Biasa",
+                       "Tren Sewa Sepeda Sepanjang Hari: Hari Libur vs. Hari Biasa", "Kategori Hari")
+
+
+def users_specs(cubes, day_df):
+    day_totals = totals(cubes["day"])
+    users = pd.DataFrame({"user": ["Casual", "Registered"],
+                          "cnt": [day_totals["casual_sum"], day_totals["registered_sum"]]})
+    hourly = rollup(cubes["hour"], ["hr"])[["casual_sum", "registered_sum"]]
+    hourly = hourly.set_axis(["Casual", "Registered"], axis=1).rename_axis("hr").reset_index() \
+        .melt("hr", var_name="user", value_name="cnt")
+    users_color = color("user", "Tipe Pengguna", ["Casual", "Registered"])
+    return [[
+        chart(users, "bar", {"x": field("user", "nominal", "Tipe Pengguna"),
+                             "y": field("cnt", "quantitative", "Jumlah Sewa"), "color": users_color},
+              "Total Pengguna Kasual vs. Terdaftar"),
+        chart(hourly, "bar", {"x": field("hr", "ordinal", "Jam"), "y": field("cnt", "quantitative", "Jumlah Sewa"),
+                              "color": users_color},
+              "Perbandingan Pengguna Kasual dan Terdaftar per Jam", legend="user"),
+        chart(users, "arc", {"theta": field("cnt", "quantitative", stack="normalize"), "color": users_color},
+              "Rasio Pengguna Kasual vs. Terdaftar"),
+    ]]
+
+
+def correlation_specs(cubes, day_df, moments=None):
+    moments = get_day_moments() if moments is None else moments
+    columns = ["cnt", "temp", "hum", "windspeed"]
+    corr = moments.corr(columns).rename_axis("a").reset_index().melt("a", var_name="b", value_name="r")
+    sample = day_df[["temp", "cnt"]]
+    if len(sample) > MAX_SCATTER_POINTS:
+        sample = sample.sample(MAX_SCATTER_POINTS, random_state=0)
+    fit = moments.ols("temp", "cnt", points=50)
+    x, y = field("temp", "quantitative", "Suhu"), field("cnt", "quantitative", "Jumlah Penyewaan")
+    heat = {"x": field("a", "nominal", None, sort=columns), "y": field("b", "nominal", None, sort=columns)}
+    scatter = chart(sample, {"type": "point", "filled": True, "color": "purple", "opacity": 0.6}, {"x": x, "y": y}, None)
+    title = "Hubungan antara Suhu dan Jumlah Penyewaan"
+    if fit is None:
+        # Data tidak cukup untuk regresi: scatter saja dengan catatan di subjudul
+        regression = layer({"text": title, "subtitle": INSUFFICIENT_DATA}, scatter, zoom=True)
+    else:
+        line = pd.DataFrame({"temp": fit["x"], "cnt": fit["y"], "lower": fit["lower"], "upper": fit["upper"]})
+        regression = layer(title, scatter,
+                           chart(line, {"type": "area", "color": "purple", "opacity": 0.15},
+                                 {"x": x, "y": field("lower", "quantitative"), "y2": {"field": "upper"}}, None),
+                           chart(line, {"type": "line", "color": "purple"}, {"x": x, "y": y}, None),
+                           zoom=True)
+    return [[
+        layer("Korelasi antara Faktor Cuaca dan Jumlah Penyewaan",
+              chart(corr, "rect", {**heat, "color": field("r", "quantitative", "r",
+                                                          scale={"scheme": "viridis", "domain": [-1, 1]})}, None),
+              chart(corr, "text", {**heat, "text": field("r", "quantitative", format=".2f")}, None)),
+        regression,
+    ]]
+
+
+# --- Spec clustering ---
+
+def time_period_specs(time_period_clusters):
+    data = time_period_clusters.melt(["TimePeriod", "holiday"], ["casual", "registered"], "user", "rentals")
+    data["series"] = data["user"].str.capitalize() + np.where(data["holiday"] == 1, " (Holiday)", " (Non-Holiday)")
+    periods = time_period_clusters["TimePeriod"].drop_duplicates().tolist()
+    return [[chart(data[["TimePeriod", "user", "series", "rentals"]], "bar",
+                   {"x": field("TimePeriod", "nominal", "Time Period", sort=periods),
+                    "xOffset": field("user", "nominal"),
+                    "y": field("rentals", "quantitative", "Average Rentals"),
+                    "color": color("series", "Kategori")},
+                   "Average Rentals by Time Period (Casual vs Registered)", legend="series")]]
+
+
+def day_cluster_specs(clusters):
+    centroids = clusters["centroids"]
+    counts = np.bincount(clusters["labels"], minlength=len(centroids))
+    row = []
+    for f, feature in enumerate(clusters["features"]):
+        data = pd.DataFrame([
+            {"hr": hr, "cluster": f"Cluster {i + 1} ({counts[i]} hari)", "mean": float(centroid[f * 24 + hr])}
+            for i, centroid in enumerate(centroids) for hr in range(24)
+        ])
+        row.append(chart(data, {"type": "line", "point": True},
+                         {"x": field("hr", "quantitative", "Jam"), "y": field("mean", "quantitative", "Rata-Rata Sewa"),
+                          "color": color("cluster", "Cluster")},
+                         f"Profil Harian per Cluster ({feature})", zoom=True, legend="cluster"))
+    return [row]
+
+
+# Builder figure matplotlib (nama fungsi di charts.py) -> builder spec Vega-Lite
+SPEC_BUILDERS = {
+    "season_figure": season_specs,
+    "weather_figure": weather_specs,
+    "hourly_figure": hourly_specs,
+    "workingday_figure": workingday_specs,
+    "holiday_figure": holiday_specs,
+    "users_figure": users_specs,
+    "correlation_figure": correlation_specs,
+    "time_period_figure": time_period_specs,
+    "day_cluster_figure": day_cluster_specs,
+}
+
+
+def client_rendered(builder):
+    return CHART_MODE == "vega" and builder.__name__ in SPEC_BUILDERS
+
+
+def cached_specs(key, builder, *args):
+    # Spec hanya dibangun ulang jika (chart, filter, versi data) berubah
+    with _lock:
+        specs = _cache.get(key)
+        if specs is not None:
+            _cache.move_to_end(key)
+            return specs
+    specs = SPEC_BUILDERS[builder.__name__](*args)
+    with _lock:
+        _cache[key] = specs
+        while len(_cache) > MAX_CACHED:
+            _cache.popitem(last=False)
+    return specs
+
+
+def payload_bytes(specs):
+    return sum(len(json.dumps(spec, separators=(",", ":"))) for row in specs for spec in row)
+
+
+# --- Pengukuran (python vega_charts.py) ---
+
+def measure():
+    # Bytes per tampilan dan waktu CPU server: figure PNG vs spec Vega-Lite
+    import time
+
+    import charts
+    from clustering import DEFAULT_BOUNDARIES, get_day_clusters, time_period_means
+    from cube import get_cubes
+    from data_loader import load_data
+    from figure_cache import encode_figure
+
+    cubes = get_cubes()
+    _, day_df = load_data()
+    cases = [(getattr(charts, name), (cubes, day_df)) for name in list(SPEC_BUILDERS)[:7]]
+    cases.append((charts.time_period_figure, (time_period_means(DEFAULT_BOUNDARIES, None),)))
+    cases.append((charts.day_cluster_figure, (get_day_clusters(4, ("cnt",), False),)))
+    results = []
+    for builder, args in cases:
+        start = time.process_time()
+        png = encode_figure(builder(*args), "png")
+        png_seconds = time.process_time() - start
+        start = time.process_time()
+        specs = SPEC_BUILDERS[builder.__name__](*args)
+        spec_seconds = time.process_time() - start
+        spec_bytes = payload_bytes(specs)
+        results.append({
+            "chart": builder.__name__,
+            "png_kb": round(len(png) / 1024, 1),
+            "vega_kb": round(spec_bytes / 1024, 1),
+            "bytes_ratio": round(len(png) / spec_bytes, 1),
+            "png_cpu_ms": round(png_seconds * 1000, 1),
+            "vega_cpu_ms": round(spec_seconds * 1000, 1),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    for result in measure():
+        print(json.dumps(result))
@@ -0,0 +1,3 @@
+# Satu modul per halaman dashboard, masing-masing dengan fungsi render().
+# Modul diimpor saat halaman pertama kali dibuka sehingga pandas, matplotlib,
+# dan data hanya dimuat oleh halaman yang membutuhkannya.
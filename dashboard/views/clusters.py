@@ -0,0 +1,80 @@
+import streamlit as st
+
+from charts import day_cluster_figure, time_period_figure
+from clustering import (DEFAULT_BOUNDARIES, PROFILE_FEATURES, TIME_PERIODS, cluster_membership,
+                        get_day_clusters, time_period_means)
+from cube import rollup
+from filters import select_days
+from views.common import load, show_anomalies, show_figure, sidebar_filters
+
+
+def render():
+    cubes, day_df = load()
+    # Filter global yang sama dengan halaman Visualization & Explanatory
+    active_filter, view = sidebar_filters(day_df)
+    cubes, day_df = view["cubes"], view["day_df"]
+
+    st.title("Clustering")
+    show_anomalies(view, active_filter)
+
+    # Batas jam tiap periode bisa diatur; hasil dihitung dari agregat per jam
+    # sehingga mengubah batas tidak memindai ulang baris data
+    st.caption("Jam mulai setiap periode waktu (Night berlanjut hingga jam mulai Morning).")
+    columns = st.columns(len(TIME_PERIODS))
+    boundaries = tuple(
+        int(column.number_input(period, min_value=0, max_value=23, value=default, step=1))
+        for column, period, default in zip(columns, TIME_PERIODS, DEFAULT_BOUNDARIES)
+    )
+    if any(a >= b for a, b in zip(boundaries, boundaries[1:])):
+        st.warning("Jam mulai setiap periode harus berurutan naik; batas default digunakan.")
+        boundaries = DEFAULT_BOUNDARIES
+
+    # Kelompokkan data berdasarkan TimePeriod dan holiday
+    hourly = None if active_filter is None else rollup(cubes["hour"], ["hr", "holiday"])
+    time_period_clusters = time_period_means(boundaries, hourly)
+
+    # Visualisasi hasil clustering
+    show_figure(time_period_figure, time_period_clusters, filters=(active_filter, boundaries))
+    
+    st.markdown("""
+    ### **Insight:**
+    #### **Pola Penyewaan Berdasarkan Waktu dan Jenis Pengguna:**
+    - **Pagi hari (Morning):** Pengguna terdaftar (registered) mendominasi penyewaan sepeda, terutama pada hari kerja. Pengguna kasual lebih sedikit.
+    - **Siang hingga sore (Afternoon):** Penyewaan meningkat drastis, terutama oleh pengguna terdaftar.
+    - **Malam hari (Evening & Night):** Penyewaan berkurang secara signifikan, terutama dari pengguna kasual.
+    - **Pengguna terdaftar (registered)** lebih sering menyewa di pagi dan sore hari, yang menunjukkan pola perjalanan komuter *(work-home travel)*.
+    - **Pengguna kasual** cenderung menyewa di siang dan sore hari, yang kemungkinan besar terkait dengan aktivitas rekreasi atau wisata.
+    - **Hari libur** memiliki lebih banyak penyewaan oleh pengguna kasual dibandingkan hari kerja.
+
+    #### **Perbedaan antara Hari Libur dan Hari Kerja:**
+    - **Hari kerja:** Pengguna terdaftar mendominasi, terutama di pagi dan sore hari.
+    - **Hari libur:** Pengguna kasual meningkat drastis di siang dan sore hari, tetapi masih lebih sedikit dibandingkan pengguna terdaftar secara keseluruhan.
+    - **Layanan penyewaan** dapat meningkatkan kapasitas sepeda di pagi dan sore hari untuk mengakomodasi pengguna terdaftar.
+    - **Strategi pemasaran** bisa difokuskan pada pengguna kasual di hari libur, misalnya dengan paket diskon atau rute wisata menarik.
+    - **Jam operasional** bisa disesuaikan agar lebih fleksibel di akhir pekan untuk meningkatkan jumlah penyewaan malam.
+
+    #### **Potensi Optimalisasi Bisnis Berdasarkan Pola Penyewaan:**
+    - **Optimalisasi jumlah sepeda** → Tambah kapasitas sepeda di pagi dan sore hari untuk mengakomodasi pengguna terdaftar.
+    - **Strategi harga dinamis** → Tarif lebih tinggi pada jam sibuk *(morning & evening)* dan promo diskon untuk pengguna kasual di siang hari.
+    - **Fokus layanan di hari libur** → Promosi dan event khusus bagi pengguna kasual di siang dan sore hari.
+    - **Pemanfaatan data untuk prediksi permintaan** → Menyesuaikan jumlah sepeda berdasarkan prediksi pola sewa di setiap waktu.
+    """)
+
+    # Segmentasi hari dengan k-means atas profil permintaan 24 jam per dteday
+    st.subheader("Segmentasi Hari Berdasarkan Profil Permintaan (K-Means)")
+    col_k, col_features, col_shape = st.columns([1, 2, 1])
+    k = col_k.slider("Jumlah cluster (k)", min_value=2, max_value=8, value=4)
+    features = col_features.multiselect("Profil yang digunakan", PROFILE_FEATURES, default=["cnt"]) or ["cnt"]
+    normalize = col_shape.checkbox("Bandingkan bentuk profil saja", value=False,
+                                   help="Setiap profil dibagi total hariannya sehingga volume tidak berpengaruh")
+
+    # Model dilatih dengan seluruh hari; filter hanya membatasi hari yang ditampilkan
+    day_clusters = get_day_clusters(k, tuple(features), normalize)
+    if active_filter is not None:
+        day_clusters = select_days(day_clusters, day_df)
+    show_figure(day_cluster_figure, day_clusters, filters=(active_filter, k, tuple(features), normalize))
+
+    st.markdown("**Keanggotaan cluster (proporsi hari per cluster):**")
+    for tab, column in zip(st.tabs(["Musim", "Cuaca", "Hari Kerja"]),
+                           ["season_name", "weather_condition", "workingday"]):
+        tab.dataframe(cluster_membership(day_clusters, day_df, column), use_container_width=True)
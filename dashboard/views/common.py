@@ -0,0 +1,100 @@
+import streamlit as st
+
+from charts import anomaly_figure
+from cube import get_cubes
+from data_loader import data_version, load_data
+from diagnostics import stage
+from figure_cache import cached_figure
+from filters import ANOMALY_MODES, USER_TYPES, filter_key, filtered_view
+from ingest import poll_inbox
+from pipeline import season_map, weather_map
+from vega_charts import cached_specs, client_rendered
+
+# Modul ini (beserta pandas/matplotlib) baru diimpor saat halaman yang
+# membutuhkan data pertama kali dibuka
+
+
+def load():
+    # Batch baru di folder inbox digabungkan dulu secara inkremental
+    with stage("poll_inbox"):
+        for result in poll_inbox():
+            if "error" in result:
+                st.warning(f"Batch {result['file']} gagal diproses dan dipindah ke inbox/failed/: {result['error']}")
+
+    # Memuat dataset yang sudah dibersihkan dan diperkaya (di-cache per proses)
+    with stage("load_data"):
+        hour_df, day_df = load_data()
+
+    # Aggregate cube dihitung sekali per versi data; semua chart di halaman
+    # "Visualization & Explanatory" menjawab pertanyaannya lewat roll-up cube ini
+    with stage("get_cubes"):
+        cubes = get_cubes()
+    return cubes, day_df
+
+
+def show_figure(builder, *args, filters=()):
+    # Figure hanya dirender ulang jika kombinasi (chart, filter, versi data) belum
+    # ada di cache; selebihnya bytes PNG langsung dikirim ke browser
+    key = (builder.__name__, filters, data_version())
+    with stage(f"chart:{builder.__name__}"):
+        if client_rendered(builder):
+            show_specs(cached_specs(key, builder, *args))
+        else:
+            st.image(cached_figure(key, builder, *args), use_container_width=True)
+
+
+def show_specs(specs):
+    # Mode "vega": hanya data agregat yang dikirim; tooltip, zoom, dan klik
+    # legenda ditangani browser tanpa rerun. Baris spec mengikuti tata letak subplot
+    for row in specs:
+        for column, spec in zip(st.columns(len(row)), row):
+            with column:
+                st.vega_lite_chart(spec, use_container_width=True)
+
+
+def sidebar_filters(day_df):
+    # Filter global sidebar; mengembalikan (kunci filter, view). Kunci None = seluruh data
+    first_day, last_day = day_df["dteday"].min(), day_df["dteday"].max()
+    with st.sidebar:
+        st.subheader("Filter")
+        date_range = st.date_input("Rentang tanggal", value=(first_day.date(), last_day.date()),
+                                   min_value=first_day.date(), max_value=last_day.date())
+        # Saat pengguna baru memilih tanggal awal, rentang belum lengkap
+        if len(date_range) != 2:
+            date_range = (first_day, last_day)
+        seasons = st.multiselect("Musim", list(season_map), default=list(season_map), format_func=season_map.get)
+        weathers = st.multiselect("Cuaca", list(weather_map), default=list(weather_map), format_func=weather_map.get)
+        working = st.radio("Hari kerja", ["Semua", "Hari kerja", "Bukan hari kerja"], horizontal=True)
+        holiday = st.radio("Hari libur", ["Semua", "Hari libur", "Bukan hari libur"], horizontal=True)
+        user_type = st.radio("Jenis pengguna", list(USER_TYPES), horizontal=True,
+                             help="Casual/Registered menggantikan total penyewaan (cnt) di semua chart")
+        anomalies = st.radio("Jam anomali", list(ANOMALY_MODES), horizontal=True,
+                             help="Jam dengan jumlah sewa jauh dari pola jam-dalam-minggunya dikecualikan "
+                                  "dari chart, atau tetap dihitung dan ditandai di atas halaman")
+
+    flags = {"Semua": [0, 1], "Hari kerja": [1], "Bukan hari kerja": [0], "Hari libur": [1], "Bukan hari libur": [0]}
+    selections = {"season": seasons, "weathersit": weathers, "workingday": flags[working], "holiday": flags[holiday]}
+    active_filter = filter_key(date_range[0], date_range[1], selections, USER_TYPES[user_type], (first_day, last_day),
+                               ANOMALY_MODES[anomalies])
+
+    with stage("filter"):
+        view = filtered_view(active_filter)
+    if len(view["day_df"]) == 0:
+        st.warning("Tidak ada data yang sesuai dengan filter.")
+        st.stop()
+    return active_filter, view
+
+
+def show_anomalies(view, active_filter):
+    # Mode "Tandai": jam anomali pada filter aktif ditampilkan sebagai chart dan tabel
+    anomalies = view.get("anomalies")
+    if anomalies is None:
+        return
+    with st.expander(f"Jam anomali ({len(anomalies)})", expanded=True):
+        if len(anomalies) == 0:
+            st.info("Tidak ada jam anomali pada filter ini.")
+            return
+        show_figure(anomaly_figure, anomalies, filters=active_filter)
+        table = anomalies.sort_values("anomaly_score", key=abs, ascending=False)
+        st.dataframe(table[["dteday", "hr", "cnt", "cnt_expected", "anomaly_score"]].head(100),
+                     hide_index=True, use_container_width=True)
@@ -0,0 +1,46 @@
+import streamlit as st
+
+
+def render():
+    st.title("Conclusion & Recommendation")
+    
+    st.subheader("Conclusion")
+    st.markdown("""
+    - **Pola Musiman:** Penyewaan sepeda tertinggi terjadi di musim gugur dan terendah di musim dingin.
+    - **Pengaruh Cuaca:** Cuaca buruk (hujan/salju) menurunkan jumlah penyewaan, terutama bagi pengguna kasual.
+    - **Tren Harian:** Hari kerja didominasi oleh pengguna terdaftar, sedangkan akhir pekan lebih banyak menarik pengguna kasual.
+    - **Tren Per Jam:**
+        - Puncak penyewaan terjadi pada pagi (07:00-09:00) dan sore (17:00-19:00) di hari kerja.
+        - Akhir pekan memiliki pola penyewaan yang lebih merata sepanjang siang hingga sore.
+    - **Perbedaan Pengguna:**
+        - Pengguna terdaftar lebih konsisten menyewa sepanjang tahun.
+        - Pengguna kasual sangat dipengaruhi oleh musim dan cuaca.
+    - **Korelasi Faktor Lingkungan:**
+        - Suhu lebih tinggi meningkatkan penyewaan.
+        - Kelembaban dan kecepatan angin yang tinggi menurunkan penyewaan.
+    - **Clustering Berdasarkan Waktu:**
+        - **Pagi & Sore:** Dominasi pengguna terdaftar (perjalanan komuter).
+        - **Siang:** Dominasi pengguna kasual (aktivitas rekreasi).
+        - **Malam:** Penyewaan rendah untuk semua kategori pengguna.
+    """)
+    
+    st.subheader("Recommendations")
+    st.markdown("""
+    - **Penyesuaian Sesuai Musim:**
+        - Tambah sepeda di musim gugur (puncak penyewaan).
+        - Kurangi operasional di musim dingin atau tawarkan promosi untuk menarik pengguna kasual.
+    - **Strategi Cuaca & Diskon Dinamis:**
+        - Tawarkan diskon atau insentif bagi pengguna kasual saat cuaca kurang bersahabat.
+        - Sediakan stasiun penampungan atau shelter sepeda di lokasi strategis saat cuaca buruk.
+    - **Strategi Layanan Berdasarkan Hari:**
+        - Tingkatkan promosi paket wisata atau sewa harian untuk pengguna kasual di akhir pekan.
+    - **Penyesuaian Tarif Sesuai Waktu:**
+        - Tarif premium saat jam sibuk (pagi & sore hari kerja).
+        - Diskon untuk siang hari guna menarik lebih banyak pengguna kasual.
+    - **Inovasi & Promosi untuk Malam Hari:**
+        - Kampanye atau event khusus seperti “Night Ride” untuk meningkatkan penyewaan malam hari.
+        - Peningkatan keamanan dan penerangan di jalur sepeda untuk mendorong penggunaan malam.
+    - **Kerjasama dengan Bisnis Lokal:**
+        - Kolaborasi dengan tempat wisata, restoran, dan hotel untuk menyediakan paket sewa sepeda dengan diskon.
+        - Sponsor atau iklan di sepeda untuk menambah sumber pendapatan.
+    """)
@@ -0,0 +1,78 @@
+import time
+
+import streamlit as st
+
+from data_loader import load_data
+from diagnostics import stage
+from pipeline import season_map, weather_map
+from store import AGGREGATIONS, DIMENSION_LABELS, DIMENSIONS, label, query
+from views.common import load
+
+LEVELS = {"Per jam": "hour", "Per hari": "day"}
+MEASURE_LABELS = {"cnt": "Total (cnt)", "casual": "Casual", "registered": "Registered"}
+
+
+def render():
+    load()
+    _, day_df = load_data()
+
+    st.title("Explore")
+    st.write(
+        "Query group-by ad-hoc atas store SQLite lokal (tanpa server). Query tanpa rentang tanggal dijawab "
+        "dari tabel agregat yang sudah dihitung, rentang tanggal memakai indeks (dteday, hr), dan hasil "
+        "yang sama tidak dihitung ulang selama data belum berubah."
+    )
+
+    col_level, col_measure, col_agg = st.columns(3)
+    level = LEVELS[col_level.radio("Level", list(LEVELS), horizontal=True)]
+    measure = col_measure.selectbox("Measure", list(MEASURE_LABELS), format_func=MEASURE_LABELS.get)
+    agg = col_agg.selectbox("Agregasi", list(AGGREGATIONS), index=1, format_func=AGGREGATIONS.get)
+
+    dims = DIMENSIONS[level] + (["city"] if "city" in day_df.columns else [])
+    group_by = st.multiselect("Group by", dims, default=["hr" if level == "hour" else "weekday"],
+                              max_selections=3, format_func=DIMENSION_LABELS.get)
+
+    with st.expander("Filter", expanded=False):
+        col_season, col_weather = st.columns(2)
+        seasons = col_season.multiselect("Musim", list(season_map), default=list(season_map),
+                                         format_func=season_map.get)
+        weathers = col_weather.multiselect("Cuaca", list(weather_map), default=list(weather_map),
+                                           format_func=weather_map.get)
+        col_working, col_holiday = st.columns(2)
+        working = col_working.radio("Hari kerja", ["Semua", "Hari kerja", "Bukan hari kerja"], horizontal=True)
+        holiday = col_holiday.radio("Hari libur", ["Semua", "Hari libur", "Bukan hari libur"], horizontal=True)
+        start = end = None
+        if st.checkbox("Batasi rentang tanggal"):
+            first_day, last_day = day_df["dteday"].min().date(), day_df["dteday"].max().date()
+            date_range = st.date_input("Rentang tanggal", value=(first_day, last_day),
+                                       min_value=first_day, max_value=last_day)
+            if len(date_range) == 2:
+                start, end = date_range
+        include_anomalies = level == "hour" and st.checkbox("Sertakan jam anomali")
+
+    # Filter yang memilih semua nilai tidak dikirim agar tabel agregat terkecil bisa dipakai
+    flags = {"Hari kerja": [1], "Bukan hari kerja": [0], "Hari libur": [1], "Bukan hari libur": [0]}
+    filters = {}
+    if len(seasons) < len(season_map):
+        filters["season"] = seasons
+    if len(weathers) < len(weather_map):
+        filters["weathersit"] = weathers
+    if working in flags:
+        filters["workingday"] = flags[working]
+    if holiday in flags:
+        filters["holiday"] = flags[holiday]
+
+    started = time.perf_counter()
+    with stage("store:query"):
+        table, result, cached = query(level, tuple(group_by), filters, measure, agg, start, end, include_anomalies)
+    source = "cache" if cached else f"tabel {table}"
+    st.caption(f"{len(result)} grup dari {source} dalam {(time.perf_counter() - started) * 1000:.1f} ms")
+    if table == level and start is None:
+        st.caption("Kombinasi jam dengan tahun/bulan dihitung dari baris mentah; pada data besar, "
+                   "batasi rentang tanggal agar query memakai indeks (dteday, hr).")
+
+    result = label(result).rename(columns={"value": f"{AGGREGATIONS[agg]} {MEASURE_LABELS[measure]}"})
+    if len(group_by) == 1 and len(result):
+        st.bar_chart(result.set_index(result.columns[0]).iloc[:, 0])
+    st.dataframe(result.round(2), use_container_width=True, hide_index=True)
+    st.download_button("Unduh CSV", result.to_csv(index=False), file_name="explore.csv")
@@ -0,0 +1,42 @@
+import streamlit as st
+
+from charts import forecast_figure
+from data_loader import load_data
+from forecast import HORIZONS, forecast, get_backtest, recent_history
+from pipeline import weather_map
+from views.common import load, show_figure
+
+
+def render():
+    load()
+    hour_df, _ = load_data()
+
+    st.title("Forecast")
+    st.write(
+        "Prakiraan jumlah penyewaan per jam untuk perencanaan redistribusi sepeda. Model menggabungkan "
+        "baseline rata-rata per jam-dalam-minggu dengan ridge regression atas fitur kalender dan cuaca, "
+        "dan dilatih ulang secara inkremental saat data baru masuk."
+    )
+
+    col_horizon, col_weather = st.columns(2)
+    horizon = col_horizon.radio("Horizon", list(HORIZONS), horizontal=True)
+    weather_options = ["Sesuai 7 hari terakhir"] + list(weather_map)
+    weather = col_weather.selectbox("Kondisi cuaca", weather_options,
+                                    format_func=lambda w: weather_map.get(w, w),
+                                    help="Suhu, kelembaban, dan kecepatan angin memakai rata-rata per jam 7 hari terakhir")
+    weathersit = None if weather == weather_options[0] else weather
+
+    prediction = forecast(HORIZONS[horizon], weathersit)
+    show_figure(forecast_figure, recent_history(hour_df), prediction, filters=(horizon, weathersit))
+
+    # Akurasi pada 28 hari terakhir yang tidak dipakai saat training
+    scores = get_backtest()
+    st.markdown(f"**Backtest {scores['test_rows']} jam terakhir (cuaca aktual):**")
+    col_model, col_baseline = st.columns(2)
+    col_model.metric("MAE model", f"{scores['model_mae']:.1f}",
+                     delta=f"{scores['model_mae'] - scores['baseline_mae']:.1f} vs baseline", delta_color="inverse")
+    col_baseline.metric("MAE baseline", f"{scores['baseline_mae']:.1f}")
+
+    table = prediction.assign(time=prediction["time"].dt.strftime("%Y-%m-%d %H:00")).round(1)
+    st.dataframe(table, use_container_width=True, hide_index=True)
+    st.download_button("Unduh CSV", table.to_csv(index=False), file_name="forecast.csv")
@@ -0,0 +1,21 @@
+import streamlit as st
+
+
+def render():
+    st.title("Project: Bike Sharing Analysis")
+    st.subheader("Personal info:")
+    st.write("""
+        - **Nama:** Karinda Amelia
+        - **Email :** karindaamelia21@gmail.com
+    """)
+    
+    st.subheader("Analisis akan menjawab pertanyaan berikut:")
+    st.write("""
+        - Bagaimana variasi jumlah penyewaan sepeda berdasarkan musim, dan musim mana yang memiliki permintaan tertinggi?
+        - Bagaimana pengaruh kondisi cuaca terhadap pola penyewaan sepeda?
+        - Bagaimana tren penyewaan sepeda per jam sepanjang hari, dan kapan waktu penggunaan tertinggi?
+        - Apakah terdapat perbedaan signifikan dalam pola penyewaan sepeda antara hari kerja dan akhir pekan?
+        - Bagaimana distribusi dan rasio antara pengguna kasual dan terdaftar di berbagai periode waktu?
+        - Bagaimana dampak hari libur terhadap pola penyewaan sepeda dibandingkan dengan hari biasa?
+        - Apakah terdapat korelasi antara suhu, kelembaban, kecepatan angin, dan jumlah penyewaan sepeda?
+    """)
@@ -0,0 +1,32 @@
+import streamlit as st
+
+
+def render():
+    st.title("Bike Sharing Dataset Overview")
+    
+    st.subheader("About Dataset")
+    st.write(
+        "Dataset ini mencakup jumlah penyewaan sepeda secara harian dan per jam antara tahun 2011 dan 2012, "
+        "dengan informasi tambahan mengenai musim, cuaca, dan faktor lingkungan."
+    )
+    
+    st.subheader("Attribute Information")
+    st.code("""
+        - instant: Record index
+        - dteday: Tanggal
+        - season: Musim (1: Spring, 2: Summer, 3: Fall, 4: Winter)
+        - yr: Tahun (0: 2011, 1: 2012)
+        - mnth: Bulan (1-12)
+        - hr: Jam (0-23, hanya di hour.csv)
+        - holiday: Hari libur (1: Ya, 0: Tidak)
+        - workingday: Hari kerja (1: Ya, 0: Tidak)
+        - weathersit: Kondisi cuaca (1: Cerah, 4: Hujan/Salju)
+        - temp: Suhu terukur (skala normalisasi)
+        - atemp: Suhu yang dirasakan (skala normalisasi)
+        - hum: Kelembaban (0-100)
+        - windspeed: Kecepatan angin (0-67)
+        - casual: Pengguna kasual
+        - registered: Pengguna terdaftar
+        - cnt: Total penyewaan sepeda
+    """)
+    st.write("Sumber data: [Bike Sharing Dataset](http://archive.ics.uci.edu/ml/datasets/Bike+Sharing+Dataset)")
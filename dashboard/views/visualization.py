@@ -0,0 +1,189 @@
+import streamlit as st
+
+from charts import (QUESTIONS, correlation_figure, holiday_figure, hourly_figure, season_figure,
+                    users_figure, weather_figure, workingday_figure)
+from views.common import load, show_anomalies, show_figure, sidebar_filters
+
+
+def render():
+    cubes, day_df = load()
+    # Filter global untuk semua pertanyaan
+    active_filter, view = sidebar_filters(day_df)
+    cubes, day_df = view["cubes"], view["day_df"]
+
+    st.title("Visualization & Explanatory Analysis")
+    show_anomalies(view, active_filter)
+    
+    # Selectbox untuk memilih pertanyaan analisis
+    # Nomor pertanyaan awal juga bisa dipilih lewat URL (?question=1..7)
+    question_param = st.query_params.get("question", "1")
+    question_numbers = [str(i) for i in range(1, len(QUESTIONS) + 1)]
+    default_question = question_numbers.index(question_param) if question_param in question_numbers else 0
+    question = st.selectbox("Pilih pertanyaan analisis:", QUESTIONS, index=default_question)
+    
+    # Placeholder untuk menampilkan analisis berdasarkan pertanyaan yang dipilih
+    st.subheader(f"**Pertanyaan:**")
+    st.write(f"{question}")
+    
+    # Pertanyaan 1
+    if question == "Bagaimana variasi jumlah penyewaan sepeda berdasarkan musim, dan musim mana yang memiliki permintaan tertinggi?":
+        show_figure(season_figure, cubes, day_df, filters=active_filter)
+
+        # Tambahkan insight
+        st.markdown("""
+        ### **Insight:**
+        - **Total Sewa Sepeda Berdasarkan Musim (Bar Chart - Kiri Atas):**
+            - Musim Fall (Gugur) memiliki total penyewaan tertinggi (~1,06 juta), disusul oleh Summer (Musim Panas) dan Winter (Musim Dingin), mengindikasikan bahwa musim ini memiliki kondisi optimal bagi pengguna untuk bersepeda, mungkin karena suhu yang nyaman dan kondisi cuaca yang mendukung.
+            - Spring (Musim Semi) memiliki jumlah sewa terendah (~471 ribu), sekitar setengah dari Fall, mengindikasikan bahwa faktor cuaca atau tingkat aktivitas pengguna yang lebih rendah di musim ini bisa menjadi penyebabnya.
+        - **Rata-Rata Sewa Sepeda Harian Berdasarkan Musim (Bar Chart - Kanan Atas):**
+            - Rata-rata sewa harian juga tertinggi pada Fall (5.644 sewa/hari), menunjukkan tingginya permintaan saat musim ini, mengindikasikan bahwa periode ini merupakan waktu yang sangat produktif untuk bisnis penyewaan sepeda. 
+            - Spring memiliki rata-rata sewa harian terendah (~2.604 sewa/hari), mengindikasikan faktor cuaca atau preferensi pengguna yang menyebabkan minat bersepeda lebih rendah. 
+            - Summer dan Winter memiliki angka sewa harian yang cukup seimbang, mengindikasikan bahwa meskipun ada perbedaan suhu ekstrem di kedua musim ini, masih terdapat minat yang cukup tinggi dalam penyewaan sepeda.
+        - **Tren Sewa Sepeda Berdasarkan Musim (Line Chart - Kiri Bawah):**
+            - Tren menunjukkan peningkatan sewa secara bertahap dari awal tahun hingga mencapai puncaknya pada pertengahan tahun, kemudian menurun menjelang akhir tahun, mengindikasikan adanya pola musiman dalam penyewaan sepeda. 
+            - Fluktuasi harian cukup tinggi, terutama di musim panas dan gugur, yang mungkin disebabkan oleh variasi cuaca atau aktivitas pengguna, mengindikasikan bahwa faktor lingkungan dan gaya hidup mempengaruhi tingkat penyewaan secara signifikan.
+        - **Total Sewa Sepeda untuk Setiap Musim (Line Chart - Kanan Bawah):**
+            - Visualisasi ini mengonfirmasi bahwa jumlah sewa meningkat dari Spring → Summer → Fall lalu menurun saat memasuki Winter mengindikasikan adanya siklus tahunan yang dapat digunakan untuk strategi bisnis.
+            - Fall menjadi musim paling optimal untuk penyewaan, sementara Spring memiliki permintaan paling rendah, mengindikasikan bahwa bisnis dapat memanfaatkan tren ini untuk menyesuaikan strategi operasional.<br>
+
+        Musim Fall merupakan musim paling populer untuk penyewaan sepeda, baik dari total maupun rata-rata harian.
+        Spring memiliki jumlah penyewaan terendah, mungkin karena kondisi cuaca atau kurangnya minat masyarakat untuk bersepeda di periode ini.
+        Winter masih memiliki angka sewa yang cukup tinggi, kemungkinan karena pengguna yang sudah terbiasa menggunakan sepeda dalam kondisi dingin.
+        Pola tren musiman ini bisa digunakan untuk strategi bisnis, seperti meningkatkan jumlah sepeda di musim Fall atau menawarkan promosi saat Spring untuk meningkatkan pemakaian.  
+        """)
+
+    # Pertanyaan 2
+    elif question == "Bagaimana pengaruh kondisi cuaca terhadap pola penyewaan sepeda?":
+        show_figure(weather_figure, cubes, day_df, filters=active_filter)
+
+        st.markdown("""
+        ### **Insight:**
+        - **Total Sewa Sepeda Berdasarkan Kondisi Cuaca (Bar Chart - Kiri Atas):**
+            - Penyewaan sepeda paling tinggi terjadi pada kondisi Clear/Partly Cloudy (~2,26 juta sewa). 
+            - Penyewaan menurun pada kondisi Mist/Cloudy (~996 ribu sewa). 
+            - Light Precipitation (hujan ringan) memiliki jumlah sewa yang sangat rendah (~37 ribu), menunjukkan bahwa hujan sangat menghambat penggunaan sepeda.
+        - **Rata-Rata Sewa Sepeda Harian Berdasarkan Kondisi Cuaca (Bar Chart - Kanan Atas):**
+            - Rata-rata sewa tertinggi terjadi saat Clear/Partly Cloudy (4.877 sewa/hari). 
+            - Mist/Cloudy masih memiliki angka yang cukup tinggi (4.036 sewa/hari), meskipun lebih rendah dari kondisi cerah. 
+            - Light Precipitation memiliki angka yang sangat rendah (1.803 sewa/hari), mengindikasikan dampak negatif hujan terhadap minat pengguna.
+        - **Tren Sewa Sepeda Berdasarkan Kondisi Cuaca (Line Chart - Kiri Bawah):**
+            - Sewa sepeda meningkat seiring waktu, terutama pada hari cerah dan berawan. 
+            - Penurunan signifikan terlihat saat terjadi hujan ringan, menunjukkan bahwa pengguna menghindari bersepeda dalam kondisi ini. 
+            - Tren harian menunjukkan fluktuasi besar, kemungkinan dipengaruhi oleh faktor eksternal seperti suhu dan hari kerja vs. akhir pekan.
+        - **Total Sewa Sepeda untuk Setiap Kondisi Cuaca (Line Chart - Kanan Bawah):**
+            - Grafik ini mempertegas bahwa Clear/Partly Cloudy adalah kondisi terbaik untuk penyewaan sepeda. 
+            - Mist/Cloudy masih memiliki pangsa pasar yang besar dan bisa dioptimalkan. 
+            - Light Precipitation memiliki jumlah penyewaan yang sangat kecil, menunjukkan perlunya strategi alternatif di kondisi ini.
+
+        Pengguna lebih cenderung menyewa sepeda saat cuaca cerah atau sedikit berawan.
+        Cuaca berkabut masih memungkinkan penggunaan sepeda, tetapi dengan penurunan permintaan yang cukup besar. Saat hujan ringan, permintaan turun drastis, mengindikasikan bahwa pengguna lebih memilih alternatif transportasi lain atau menghindari aktivitas bersepeda.
+        """)
+
+    # Pertanyaan 3
+    elif question == "Bagaimana tren penyewaan sepeda per jam sepanjang hari, dan kapan waktu penggunaan tertinggi?":
+        show_figure(hourly_figure, cubes, day_df, filters=active_filter)
+
+        st.markdown("""
+        ### **Insight:**
+        - **Tren Sewa Sepeda per Jam dalam Sehari:** 
+            - Jumlah penyewaan sepeda rendah pada dini hari (00:00 - 05:00), dengan titik terendah sekitar pukul 04:00. 
+            - Lonjakan signifikan terjadi sekitar pukul 07:00 - 09:00, dengan puncak pertama sekitar pukul 08:00 (~160 ribu sewa). 
+            - Setelah itu, jumlah penyewaan menurun hingga siang hari, tetapi kembali meningkat pada sore hari. 
+            - Puncak penyewaan tertinggi terjadi sekitar pukul 17:00 - 19:00, dengan titik maksimal pada pukul 18:00 (~210 ribu sewa). 
+            - Setelah pukul 19:00, jumlah penyewaan menurun secara bertahap hingga malam hari.
+            - Lonjakan pagi menunjukkan bahwa sepeda digunakan sebagai alat transportasi untuk perjalanan ke kantor/sekolah.
+            - Lonjakan sore-malam menunjukkan penggunaan sepeda untuk perjalanan pulang kerja/sekolah serta aktivitas rekreasi atau olahraga.
+            - Tren ini mengindikasikan bahwa mayoritas pengguna adalah pekerja atau pelajar yang menggunakan sepeda sebagai transportasi utama dalam jam sibuk.
+
+        - **Pola Sewa Sepeda (Jam vs. Hari):**
+            - Senin - Jumat: Pola penyewaan menunjukkan dua puncak utama pada pagi (~08:00) dan sore (~19:00), mencerminkan jam sibuk. 
+            - Sabtu - Minggu: Tren berbeda, di mana penyewaan meningkat lebih lambat di pagi hari dan puncak lebih merata di siang hingga sore (~10:00 - 18:00).
+            - Warna terang pada heatmap menunjukkan intensitas penyewaan tertinggi, yang terutama terjadi pada sore hari di hari kerja. 
+            - Hari kerja memiliki pola sewa yang lebih terstruktur karena keterikatan jadwal kerja dan sekolah. 
+            - Akhir pekan menunjukkan pola yang lebih fleksibel, dengan sewa meningkat secara bertahap dan tersebar sepanjang hari. 
+            - Ini mengindikasikan adanya perbedaan tujuan penggunaan sepeda: transportasi pada hari kerja dan rekreasi pada akhir pekan.
+        """)
+        
+
+    #  Pertanyaan 4
+    elif question == "Apakah terdapat perbedaan signifikan dalam pola penyewaan sepeda antara hari kerja dan akhir pekan?":
+        show_figure(workingday_figure, cubes, day_df, filters=active_filter)
+
+        st.markdown("""
+        ### **Insight:**
+        **Insight:**
+        - **Total Penyewaan Sepeda: Hari Kerja vs. Akhir Pekan (Bar Chart - Kiri):**
+            - Hari Kerja memiliki total penyewaan sepeda sebanyak 2,292,410 unit. 
+            - Akhir Pekan memiliki total penyewaan sepeda sebanyak 1,000,269 unit. 
+            - Jumlah penyewaan sepeda pada hari kerja sekitar 2,3 kali lipat dibandingkan akhir pekan.
+            - Sepeda lebih sering digunakan sebagai alat transportasi utama pada hari kerja, kemungkinan besar untuk keperluan perjalanan ke kantor/sekolah.
+            - Pada akhir pekan, penggunaan sepeda lebih rendah, mengindikasikan bahwa penggunaannya lebih bersifat rekreasi atau santai dibandingkan kebutuhan transportasi sehari-hari.
+        - **Tren Penyewaan Sepeda Sepanjang Hari: Hari Kerja vs. Akhir Pekan (Line Chart - Kanan):**
+            - Hari Kerja: Pola penyewaan memiliki dua puncak utama: Pukul 08:00 (sekitar 145 ribu sewa) → Perjalanan ke kantor/sekolah. Pukul 18:00 - 19:00 (sekitar 160 ribu sewa) → Perjalanan pulang kerja/sekolah. Setelah pukul 19:00, jumlah penyewaan turun drastis.
+            - Akhir Pekan: Pola lebih stabil tanpa lonjakan ekstrem. Penyewaan mulai meningkat dari pagi hari dan mencapai puncaknya antara 10:00 - 16:00, dengan sekitar 70 - 80 ribu sewa per jam. Jumlah sewa tetap lebih tinggi dibandingkan dini hari/malam, tetapi tidak ada lonjakan signifikan seperti di hari kerja
+            - Hari kerja menunjukkan pola yang lebih tajam dengan lonjakan di pagi dan sore hari, mengindikasikan bahwa sepeda lebih sering digunakan sebagai alat transportasi utama pada hari kerja, kemungkinan besar untuk keperluan perjalanan ke kantor/sekolah.
+            - Akhir pekan memiliki pola yang lebih merata, menunjukkan penggunaan sepeda untuk rekreasi, olahraga, atau aktivitas santai, bukan sebagai transportasi utama.
+            - Tingkat penyewaan lebih tinggi di sore hari pada hari kerja dibandingkan akhir pekan, yang bisa dikaitkan dengan kepadatan lalu lintas dan kebutuhan perjalanan pulang.
+        """)
+
+    # Pertanyaan 5
+    elif question == "Bagaimana distribusi dan rasio antara pengguna kasual dan terdaftar di berbagai periode waktu?":
+        show_figure(users_figure, cubes, day_df, filters=active_filter)
+
+        st.markdown("""
+        ### **Insight:**
+        **Insight:**
+        - **Total Pengguna Kasual vs. Terdafar (Bar Chart - Kiri):**
+            - Registered users mendominasi dengan total 2,672,662 penyewaan sepeda. 
+            - Casual users memiliki total penyewaan jauh lebih rendah, hanya 620,017. 
+            - Registered users berkontribusi lebih dari 4 kali lipat dibanding casual users dalam hal jumlah penyewaan.
+            - Sebagian besar penyewaan dilakukan oleh pengguna terdaftar, yang kemungkinan besar menggunakan sepeda untuk keperluan transportasi harian (misalnya perjalanan kerja atau sekolah).
+            - Casual users lebih sedikit karena mungkin mereka hanya menyewa untuk rekreasi atau kebutuhan sesekali.
+        - **Perbandingan Pengguna Kasual dan Terdaftar per Jam (Bar Chart - Tengah):**
+            - Registered users memiliki pola penyewaan yang kuat pada jam sibuk, terutama pukul 07:00 - 09:00 dan 17:00 - 19:00. 
+            - Casual users lebih dominan di siang hari, dengan lonjakan bertahap dari 10:00 - 16:00. 
+            - Saat jam sibuk, jumlah penyewaan registered users jauh lebih tinggi dibanding casual users
+            - Registered users lebih banyak beraktivitas pada hari kerja, yang sesuai dengan pola perjalanan pekerja kantoran atau pelajar.
+            - Casual users lebih aktif pada siang hari, kemungkinan besar karena mereka menggunakan sepeda untuk wisata, jalan santai, atau aktivitas rekreasi.
+            - Lonjakan penyewaan registered users pada pagi dan sore hari menunjukkan pola perjalanan kerja pulang-pergi, sedangkan penyewaan casual users lebih merata tanpa lonjakan ekstrem.
+        - **Rasio Pengguna Kasual vs. Terdaftar (Pie Chart - Kanan):**
+            - Registered users mendominasi dengan 81.2% dari total penyewaan, sedangkan casual users hanya 18.8%.
+            - Sebagian besar pelanggan adalah pengguna setia yang berlangganan layanan penyewaan sepeda, sehingga strategi bisnis bisa lebih fokus pada mempertahankan dan meningkatkan layanan bagi mereka.
+            - Casual users memiliki porsi kecil, sehingga ada peluang untuk meningkatkan pangsa pasar dengan menawarkan promosi atau paket fleksibel bagi pelanggan non-terdaftar.
+        """)
+    
+    # Pertanyaan 6
+    elif question == "Bagaimana dampak hari libur terhadap pola penyewaan sepeda dibandingkan dengan hari biasa?":
+        show_figure(holiday_figure, cubes, day_df, filters=active_filter)
+
+        st.markdown("""
+        ### **Insight:**
+        **Insight:**
+        - **Total Sewa Sepeda: Hari Libur vs. Hari Biasa (Bar Chart - Kiri):**
+            - Penyewaan sepeda pada hari biasa (regular) jauh lebih tinggi dibandingkan dengan hari libur (holiday).
+            - Selisih jumlah penyewaan yang signifikan menunjukkan bahwa sepeda lebih sering digunakan pada hari-hari kerja atau aktivitas rutin dibandingkan saat libur.
+        - **Tren Sewa Sepeda Sepanjang Hari: Hari Libur vs. Hari Biasa (Line Chart - Kanan):**
+            - Hari biasa memiliki pola penyewaan yang teratur dengan lonjakan signifikan pada pagi (07:00 - 09:00) dan sore (17:00 - 19:00), yang menandakan pola perjalanan kerja.
+            - Hari libur menunjukkan pola yang lebih merata, dengan peningkatan bertahap dari pagi hingga sore, tanpa lonjakan signifikan.
+        """)
+
+    # Pertanyaan 7
+    elif question == "Apakah terdapat korelasi antara suhu, kelembaban, kecepatan angin, dan jumlah penyewaan sepeda?":
+        show_figure(correlation_figure, cubes, day_df, view["moments"], filters=active_filter)
+
+        st.markdown("""
+        ### **Insight:**
+        **Insight:**
+        - **Korelasi antara Faktor Cuaca dan Jumlah Penyewaan (Heatmap - Kiri):**
+            - Suhu (temp) memiliki korelasi positif yang cukup kuat (0.63) terhadap jumlah penyewaan sepeda, yang berarti semakin tinggi suhu, semakin banyak sepeda yang disewa.
+            - Kelembaban (hum) memiliki korelasi negatif lemah (-0.1), menunjukkan bahwa kelembaban tidak terlalu mempengaruhi jumlah penyewaan.
+            - Kecepatan angin (windspeed) memiliki korelasi negatif (-0.23), yang berarti semakin kencang angin, semakin sedikit jumlah penyewaan sepeda, meskipun pengaruhnya tidak terlalu besar.
+            - Suhu merupakan faktor lingkungan yang paling mempengaruhi penyewaan sepeda, karena cuaca yang lebih hangat cenderung lebih nyaman untuk bersepeda.
+            - Kelembaban tidak terlalu signifikan, mungkin karena pengguna lebih memperhatikan suhu dibandingkan tingkat kelembaban udara.
+            - Kecepatan angin yang tinggi bisa membuat perjalanan bersepeda menjadi lebih sulit, sehingga dapat mengurangi jumlah penyewaan sepeda.
+        - **Hubungan antara Suhu dan Jumlah Penyewaan (Scatter Plot - Kanan):**
+            - Scatter plot menunjukkan tren positif yang jelas antara suhu dan jumlah penyewaan, dikonfirmasi dengan garis regresi yang menunjukkan peningkatan jumlah sewa saat suhu naik.
+            - Meskipun ada beberapa penyebaran data yang variatif, tren keseluruhannya tetap menunjukkan hubungan positif yang kuat.
+            - Suhu yang lebih tinggi mendorong lebih banyak orang untuk menyewa sepeda, kemungkinan karena cuaca lebih nyaman untuk bersepeda.
+            - Namun, pada suhu yang sangat tinggi (di atas titik tertentu), mungkin ada titik jenuh di mana penyewaan mulai menurun karena cuaca menjadi terlalu panas.
+        """)
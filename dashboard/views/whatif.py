@@ -0,0 +1,84 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from data_loader import load_data
+from pipeline import season_map, weather_map
+from views.common import load
+from whatif import SCALES, UNITS, denormalize, get_surface, normalize, simulate, tomorrow_conditions
+
+DAY_TYPES = {1: "Hari kerja", 0: "Akhir pekan / libur"}
+
+
+def weather_slider(container, label, column, value, key):
+    # Slider dalam satuan asli; model dan grid memakai skala ternormalisasi [0, 1]
+    high = int(SCALES[column])
+    return container.slider(f"{label} ({UNITS[column]})", 0, high, int(round(value)), key=key)
+
+
+def render():
+    load()
+    hour_df, day_df = load_data()
+    surface = get_surface()
+    base = tomorrow_conditions(hour_df, day_df)
+
+    st.title("What-if")
+    st.write(
+        "Simulasi jumlah penyewaan per jam untuk kondisi cuaca yang berbeda. Model respons dilatih sekali "
+        "per versi data lalu dievaluasi di grid suhu × kelembaban × kecepatan angin, sehingga setiap "
+        "perubahan slider hanya berupa interpolasi di grid tersebut. Nilai awal mengikuti kondisi besok "
+        "(rata-rata 7 hari terakhir)."
+    )
+
+    col_day, col_season = st.columns(2)
+    workingday = col_day.radio("Jenis hari", list(DAY_TYPES), index=list(DAY_TYPES).index(base["workingday"]),
+                               format_func=DAY_TYPES.get, horizontal=True)
+    season = col_season.selectbox("Musim", list(season_map), index=list(season_map).index(base["season"]),
+                                  format_func=season_map.get)
+
+    col_base, col_scenario = st.columns(2)
+    col_base.subheader("Kondisi dasar")
+    base_weather = col_base.selectbox("Kondisi cuaca", list(weather_map), index=list(weather_map).index(base["weathersit"]),
+                                      format_func=weather_map.get, key="whatif_base_weather")
+    base_values = {
+        "temp": weather_slider(col_base, "Suhu", "temp", denormalize("temp", base["temp"]), "whatif_temp"),
+        "hum": weather_slider(col_base, "Kelembaban", "hum", denormalize("hum", base["hum"]), "whatif_hum"),
+        "windspeed": weather_slider(col_base, "Kecepatan angin", "windspeed",
+                                    denormalize("windspeed", base["windspeed"]), "whatif_windspeed"),
+    }
+
+    col_scenario.subheader("Skenario")
+    scenario_weather = col_scenario.selectbox("Kondisi cuaca", list(weather_map),
+                                              index=list(weather_map).index(base_weather),
+                                              format_func=weather_map.get, key="whatif_scenario_weather")
+    deltas = {
+        "temp": col_scenario.slider("Perubahan suhu (°C)", -15, 15, 0),
+        "hum": col_scenario.slider("Perubahan kelembaban (%)", -40, 40, 0),
+        "windspeed": col_scenario.slider("Perubahan kecepatan angin (km/jam)", -20, 20, 0),
+    }
+    scenario_values = {column: base_values[column] + deltas[column] for column in base_values}
+    clamped = [column for column, value in scenario_values.items() if not 0 <= value <= SCALES[column]]
+    if clamped:
+        st.warning("Nilai skenario di luar rentang dataset dibatasi ke tepi grid: " + ", ".join(clamped))
+
+    scenarios = [
+        dict({c: float(normalize(c, v)) for c, v in base_values.items()}, season=season, weathersit=base_weather),
+        dict({c: float(normalize(c, v)) for c, v in scenario_values.items()}, season=season, weathersit=scenario_weather),
+    ]
+    start = time.perf_counter()
+    prediction = simulate(surface, workingday, scenarios)
+    elapsed = time.perf_counter() - start
+
+    base_total, scenario_total = prediction.sum(axis=1)
+    col_total_base, col_total_scenario = st.columns(2)
+    col_total_base.metric("Total harian (dasar)", f"{base_total:,.0f}")
+    col_total_scenario.metric("Total harian (skenario)", f"{scenario_total:,.0f}",
+                              delta=f"{(scenario_total / base_total - 1) if base_total else 0:.1%}")
+
+    table = pd.DataFrame({"hr": range(prediction.shape[1]), "dasar": prediction[0], "skenario": prediction[1]})
+    st.line_chart(table.set_index("hr"))
+    st.caption(f"Interpolasi grid {surface.grid.size:,} titik ({surface.nbytes / 2**20:.1f} MB): "
+               f"{elapsed * 1e6:.0f} µs untuk kedua skenario")
+    st.dataframe(table.assign(selisih=table["skenario"] - table["dasar"]).round(1),
+                 use_container_width=True, hide_index=True)
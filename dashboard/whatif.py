@@ -0,0 +1,269 @@
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from data_loader import get_artifact, load_data, run_tests
+from forecast import future_frame, training_rows
+
+# Simulasi what-if cuaca: model respons log1p(cnt) per jam dilatih sekali per
+# versi data, lalu dievaluasi di grid rapat atas temp/hum/windspeed (skala
+# ternormalisasi dataset) untuk setiap (hari kerja, jam). Setiap perubahan
+# slider dijawab dengan interpolasi trilinear di grid tersebut (satu gather
+# numpy), tanpa mengevaluasi model maupun membaca ulang data.
+#
+# Model: intercept dan polinomial cuaca per (workingday, hr), ditambah offset
+# musim dan weathersit yang sama untuk semua jam. Efek musim/cuaca bersifat
+# multiplikatif pada cnt sehingga cukup disimpan terpisah dari grid.
+
+WEATHER_COLUMNS = ["temp", "hum", "windspeed"]
+
+# Pembagi normalisasi dataset (lihat data/Readme.txt): °C / 41, % / 100, km/jam / 67
+SCALES = {"temp": 41.0, "hum": 100.0, "windspeed": 67.0}
+UNITS = {"temp": "°C", "hum": "%", "windspeed": "km/jam"}
+
+# Titik grid per variabel di rentang ternormalisasi [0, 1]
+# (temp per 1 °C, hum per 4%, windspeed per ~4 km/jam)
+GRID_POINTS = {"temp": 42, "hum": 26, "windspeed": 18}
+
+HOURS = 24
+GROUPS = 2 * HOURS
+SEASONS = [1, 2, 3, 4]
+WEATHERS = [1, 2, 3, 4]
+
+# Suku polinomial cuaca per (workingday, hr), dihitung dari nilai yang dipusatkan di 0.5
+TERMS = ["temp", "temp_sq", "temp_cu", "hum", "hum_sq", "windspeed", "windspeed_sq",
+         "temp_hum", "temp_windspeed", "hum_windspeed"]
+GROUP_COLUMNS = 1 + len(TERMS)
+# Offset musim 2..4 dan weathersit 2..4 (musim/cuaca 1 sebagai acuan)
+SHARED_OFFSET = GROUPS * GROUP_COLUMNS
+SHARED_COLUMNS = len(SEASONS) - 1 + len(WEATHERS) - 1
+
+DEFAULT_ALPHA = 1.0
+
+
+def normalize(column, value):
+    return np.asarray(value, dtype=float) / SCALES[column]
+
+
+def denormalize(column, value):
+    return np.asarray(value, dtype=float) * SCALES[column]
+
+
+def basis(temp, hum, windspeed):
+    # Suku polinomial untuk array nilai ternormalisasi (bentuk apa pun) -> (..., len(TERMS))
+    t, h, w = (np.asarray(v, dtype=float) - 0.5 for v in (temp, hum, windspeed))
+    return np.stack([t, t ** 2, t ** 3, h, h ** 2, w, w ** 2, t * h, t * w, h * w], axis=-1)
+
+
+def shared_matrix(season, weathersit):
+    n = len(season)
+    S = np.zeros((n, SHARED_COLUMNS))
+    rows = np.arange(n)
+    seasons = season.astype(np.int64) - 2
+    weathers = weathersit.astype(np.int64) - 2
+    S[rows[seasons >= 0], seasons[seasons >= 0]] = 1.0
+    S[rows[weathers >= 0], len(SEASONS) - 1 + weathers[weathers >= 0]] = 1.0
+    return S
+
+
+def fit_coefficients(hour_df, alpha=DEFAULT_ALPHA):
+    # Ridge di skala log1p(cnt). Setiap baris hanya menyentuh blok kolom
+    # (workingday, hr)-nya dan kolom offset bersama, jadi X'X diakumulasi per
+    # kelompok tanpa membangun matriks desain penuh
+    p = SHARED_OFFSET + SHARED_COLUMNS
+    xtx, xty = np.zeros((p, p)), np.zeros(p)
+    group = hour_df["workingday"].to_numpy().astype(np.int64) * HOURS + hour_df["hr"].to_numpy()
+    order = np.argsort(group, kind="stable")
+    bounds = np.searchsorted(group[order], np.arange(GROUPS + 1))
+    weather = {c: hour_df[c].to_numpy(dtype=float) for c in WEATHER_COLUMNS}
+    season = hour_df["season"].to_numpy()
+    weathersit = hour_df["weathersit"].to_numpy()
+    y_all = np.log1p(hour_df["cnt"].to_numpy(dtype=float))
+    shared = slice(SHARED_OFFSET, p)
+    for g in range(GROUPS):
+        rows = order[bounds[g]:bounds[g + 1]]
+        if len(rows) == 0:
+            continue
+        Z = np.hstack([np.ones((len(rows), 1)), basis(*(weather[c][rows] for c in WEATHER_COLUMNS))])
+        S = shared_matrix(season[rows], weathersit[rows])
+        y = y_all[rows]
+        block = slice(g * GROUP_COLUMNS, (g + 1) * GROUP_COLUMNS)
+        xtx[block, block] += Z.T @ Z
+        xtx[block, shared] += Z.T @ S
+        xtx[shared, block] += S.T @ Z
+        xtx[shared, shared] += S.T @ S
+        xty[block] += Z.T @ y
+        xty[shared] += S.T @ y
+    # Intercept per kelompok tanpa penalti; kelompok tanpa data tetap terdefinisi (semua 0)
+    penalty = np.full(p, alpha)
+    penalty[0:SHARED_OFFSET:GROUP_COLUMNS] = 0.0
+    empty = np.diag(xtx)[0:SHARED_OFFSET:GROUP_COLUMNS] == 0
+    penalty[np.flatnonzero(empty) * GROUP_COLUMNS] = alpha
+    return np.linalg.solve(xtx + np.diag(penalty), xty)
+
+
+def grid_axes():
+    return [np.linspace(0.0, 1.0, GRID_POINTS[c]) for c in WEATHER_COLUMNS]
+
+
+class ResponseSurface:
+    # Grid log1p(cnt) berbentuk (workingday, hr, temp, hum, windspeed) + offset musim/cuaca
+
+    def __init__(self, coef, rows):
+        self.coef = coef
+        self.rows = rows
+        self.axes = grid_axes()
+        self.season_offset = np.concatenate([[0.0], coef[SHARED_OFFSET:SHARED_OFFSET + len(SEASONS) - 1]])
+        self.weather_offset = np.concatenate([[0.0], coef[SHARED_OFFSET + len(SEASONS) - 1:]])
+        # Evaluasi model di semua titik grid: satu perkalian matriks (titik x suku) @ (suku x kelompok)
+        mesh = np.meshgrid(*self.axes, indexing="ij")
+        B = np.hstack([np.ones((mesh[0].size, 1)), basis(*(m.ravel() for m in mesh))])
+        C = coef[:SHARED_OFFSET].reshape(GROUPS, GROUP_COLUMNS).T
+        # Jam di sumbu terakhir: setiap sudut sel grid adalah 24 nilai berurutan,
+        # jadi satu query cukup satu gather (8 sudut x 24 jam)
+        self.shape = tuple(len(a) for a in self.axes)
+        values = (B @ C).reshape((-1, 2, HOURS)).transpose(1, 0, 2)
+        self.grid = np.ascontiguousarray(values, dtype=np.float32)
+        # Grid seragam di [0, 1]: posisi pada grid = nilai x jumlah sel per sumbu
+        self.cells = np.array(self.shape) - 1
+        self.strides = np.array([self.shape[1] * self.shape[2], self.shape[2], 1])
+        self.corners = np.array([[a, b, c] for a in (0, 1) for b in (0, 1) for c in (0, 1)], dtype=bool)
+        self.corner_offsets = self.corners.astype(np.int64) @ self.strides
+
+    @property
+    def nbytes(self):
+        return self.grid.nbytes
+
+    def predict_direct(self, workingday, season, weathersit, temp, hum, windspeed):
+        # Evaluasi model langsung (pembanding di tests/test_whatif.py); bentuk sama dengan predict
+        C = self.coef[:SHARED_OFFSET].reshape(2, HOURS, GROUP_COLUMNS)[workingday]
+        temp, hum, windspeed = (np.atleast_1d(v).astype(float) for v in (temp, hum, windspeed))
+        B = np.hstack([np.ones((len(temp), 1)), basis(temp, hum, windspeed)])
+        return self.finish(B @ C.T, season, weathersit)
+
+    def predict(self, workingday, season, weathersit, temp, hum, windspeed):
+        # cnt per jam (n skenario x 24 jam) untuk array nilai cuaca ternormalisasi
+        # berbentuk (n,); nilai di luar [0, 1] dibatasi ke tepi grid
+        points = np.column_stack(np.broadcast_arrays(temp, hum, windspeed)).astype(float)
+        position = np.clip(points, 0.0, 1.0) * self.cells
+        lower = np.minimum(position.astype(np.int64), self.cells - 1)
+        fraction = position - lower
+        # Bobot trilinear untuk 8 sudut: hasil kali (d atau 1 - d) per sumbu
+        weight = np.where(self.corners, fraction[:, None], 1 - fraction[:, None]).prod(axis=-1)
+        values = self.grid[workingday][(lower @ self.strides)[:, None] + self.corner_offsets]
+        return self.finish(np.einsum("nc,nch->nh", weight, values), season, weathersit)
+
+    def finish(self, log, season, weathersit):
+        offset = self.season_offset[np.atleast_1d(season) - 1] + self.weather_offset[np.atleast_1d(weathersit) - 1]
+        return np.maximum(np.expm1(log + offset[:, None]), 0.0)
+
+
+def fit_surface(hour_df, alpha=DEFAULT_ALPHA):
+    return ResponseSurface(fit_coefficients(hour_df, alpha), len(hour_df))
+
+
+def get_surface():
+    # Jam anomali tidak ikut melatih model (sama seperti forecast.py)
+    return get_artifact("whatif_surface", lambda hour_df, day_df: fit_surface(training_rows(hour_df)))
+
+
+def tomorrow_conditions(hour_df, day_df):
+    # Kondisi dasar: 24 jam setelah data terakhir, dengan cuaca rata-rata 7 hari terakhir
+    frame = future_frame(hour_df, day_df, HOURS)
+    return {
+        "workingday": int(frame["workingday"].iloc[0]),
+        "season": int(frame["season"].iloc[0]),
+        "weathersit": int(frame["weathersit"].mode().iloc[0]),
+        **{c: float(frame[c].mean()) for c in WEATHER_COLUMNS},
+    }
+
+
+def simulate(surface, workingday, scenarios):
+    # scenarios: daftar dict (season, weathersit, temp, hum, windspeed ternormalisasi)
+    # -> array (skenario x 24 jam); semua skenario dijawab dalam satu interpolasi
+    columns = {c: np.array([s[c] for s in scenarios]) for c in ["season", "weathersit"] + WEATHER_COLUMNS}
+    return surface.predict(workingday, columns["season"], columns["weathersit"],
+                           columns["temp"], columns["hum"], columns["windspeed"])
+
+
+# --- Pengukuran (python whatif.py --measure); akurasi grid diuji di tests/test_whatif.py ---
+
+def random_points(rng, n):
+    return (rng.integers(0, 2), rng.integers(1, 5, n), rng.integers(1, 5, n),
+            rng.random(n), rng.random(n), rng.random(n))
+
+
+def measure(queries=2000, batch=1000, seed=0):
+    # Waktu fit model, waktu dan memori build grid, serta latensi per query
+    # (satu skenario = 24 jam, seperti satu gerakan slider)
+    hour_df, _ = load_data()
+    rows = training_rows(hour_df)
+    start = time.perf_counter()
+    coef = fit_coefficients(rows)
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    surface = ResponseSurface(coef, len(rows))
+    build_seconds = time.perf_counter() - start
+
+    rng = np.random.default_rng(seed)
+    latencies = []
+    for _ in range(queries):
+        workingday, *points = random_points(rng, 1)
+        start = time.perf_counter()
+        surface.predict(workingday, *points)
+        latencies.append(time.perf_counter() - start)
+    workingday, *points = random_points(rng, batch)
+    start = time.perf_counter()
+    surface.predict(workingday, *points)
+    batch_seconds = time.perf_counter() - start
+    direct = []
+    for _ in range(min(queries, 200)):
+        workingday, *points = random_points(rng, 1)
+        start = time.perf_counter()
+        surface.predict_direct(workingday, *points)
+        direct.append(time.perf_counter() - start)
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {
+        "hour_rows": len(hour_df),
+        "fit_s": round(fit_seconds, 4),
+        "grid_build_s": round(build_seconds, 4),
+        "grid_points": int(surface.grid.size),
+        "grid_mb": round(surface.nbytes / 2**20, 2),
+        "query_p50_us": round(p50 * 1e6, 1),
+        "query_p99_us": round(p99 * 1e6, 1),
+        "direct_p50_us": round(float(np.median(direct)) * 1e6, 1),
+        f"batch_{batch}_ms": round(batch_seconds * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulasi what-if cuaca (gunakan BIKE_DATA_DIR untuk data lain)")
+    parser.add_argument("--verify", action="store_true", help="bandingkan interpolasi grid dengan evaluasi model")
+    parser.add_argument("--measure", action="store_true", help="ukur fit, build grid, memori, dan latensi query")
+    parser.add_argument("--temp", type=float, help="suhu skenario (°C); default kondisi besok")
+    parser.add_argument("--weathersit", type=int, choices=WEATHERS, help="kondisi cuaca skenario")
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(run_tests("test_whatif.py"))
+    elif args.measure:
+        print(json.dumps(measure()))
+    else:
+        hour_df, day_df = load_data()
+        base = tomorrow_conditions(hour_df, day_df)
+        scenario = dict(base)
+        if args.temp is not None:
+            scenario["temp"] = float(normalize("temp", args.temp))
+        if args.weathersit is not None:
+            scenario["weathersit"] = args.weathersit
+        result = simulate(get_surface(), base["workingday"], [base, scenario])
+        for hr in range(HOURS):
+            print(f"{hr:02d}:00  {result[0, hr]:8.1f}  {result[1, hr]:8.1f}")
+        print(f"Total  {result[0].sum():8.1f}  {result[1].sum():8.1f}")
+
+
+if __name__ == "__main__":
+    main()
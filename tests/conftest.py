@@ -0,0 +1,42 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "dashboard"))
+
+# Test berjalan atas salinan data/ dan cache sementara sehingga store SQLite,
+# inbox, dan artefak tidak menyentuh folder kerja. BIKE_DATA_DIR yang sudah
+# di-set (mis. data sintetis dari synthetic.py) dipakai apa adanya.
+# Harus di-set sebelum data_loader diimpor karena lokasi dibaca saat impor.
+WORK_DIR = tempfile.mkdtemp(prefix="bike-tests-")
+if not os.environ.get("BIKE_DATA_DIR"):
+    os.makedirs(os.path.join(WORK_DIR, "data"))
+    for name in ("hour.csv", "day.csv"):
+        shutil.copy2(os.path.join(ROOT_DIR, "data", name), os.path.join(WORK_DIR, "data", name))
+    os.environ["BIKE_DATA_DIR"] = os.path.join(WORK_DIR, "data")
+os.environ.setdefault("BIKE_CACHE_DIR", os.path.join(WORK_DIR, "cache"))
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def frames():
+    import data_loader
+    return data_loader.load_data()
+
+
+@pytest.fixture(scope="session")
+def raw_frames():
+    # CSV mentah dari folder data yang sedang dipakai
+    import pandas as pd
+
+    import data_loader
+    data_dir = data_loader.resolve_data_dir()
+    return (pd.read_csv(os.path.join(data_dir, data_loader.HOUR_FILE)),
+            pd.read_csv(os.path.join(data_dir, data_loader.DAY_FILE)))
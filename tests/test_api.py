@@ -0,0 +1,64 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import data_loader
+from api import counters, fetch, start_background
+from cube import get_cubes, rollup
+
+SEASON_TOTALS = "/aggregate?by=season&stats=sum,mean"
+
+
+@pytest.fixture(scope="module")
+def port():
+    server = start_background()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def test_aggregate_matches_rollup(port):
+    # Isi sama dengan roll-up yang dipakai chart
+    status, _, body = fetch(port, SEASON_TOTALS)
+    expected = rollup(get_cubes()["day"], ["season"])
+    columns = json.loads(body)["columns"]
+    assert status == 200 and columns["season_name"] == expected.index.tolist()
+    assert columns["cnt_sum"] == expected["cnt_sum"].tolist()
+    np.testing.assert_allclose(columns["cnt_mean"], expected["cnt_mean"], rtol=1e-6)
+
+
+def test_heatmap_matches_rollup(port):
+    status, _, body = fetch(port, "/heatmap?rows=weekday&cols=hr")
+    expected = rollup(get_cubes()["hour"], ["weekday", "hr"])["cnt_sum"].unstack("hr")
+    payload = json.loads(body)
+    assert status == 200
+    assert payload["values"] == expected.reindex(payload["rows"]).to_numpy(dtype=float).tolist()
+
+
+def test_etag_and_not_modified(port):
+    # Urutan parameter tidak mengubah ETag; If-None-Match -> 304 tanpa body
+    _, etag, _ = fetch(port, SEASON_TOTALS)
+    assert fetch(port, "/aggregate?stats=sum,mean&by=season")[1] == etag
+    status, _, body = fetch(port, SEASON_TOTALS, {"If-None-Match": etag})
+    assert status == 304 and body == b""
+
+
+def test_bad_parameters(port):
+    assert fetch(port, "/aggregate?by=nope")[0] == 400
+    assert fetch(port, "/query?level=hour&group_by=hr&season=9")[0] == 200
+
+
+def test_concurrent_requests_are_coalesced(port):
+    _, etag, _ = fetch(port, SEASON_TOTALS)
+    # Burst request identik pada versi data baru dihitung sekali
+    data_loader.publish(data_loader.load_data(), {})
+    computed = counters["computed"]
+    with ThreadPoolExecutor(32) as pool:
+        results = list(pool.map(lambda _: fetch(port, "/heatmap?rows=season&cols=hr&value=casual_mean"), range(32)))
+    assert len({etag for _, etag, _ in results}) == 1
+    assert counters["computed"] - computed == 1, counters
+    # Versi data baru: ETag lama tidak lagi cocok
+    status, new_etag, _ = fetch(port, SEASON_TOTALS, {"If-None-Match": etag})
+    assert status == 200 and new_etag != etag
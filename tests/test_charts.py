@@ -0,0 +1,26 @@
+import pytest
+
+from charts import holiday_figure, workingday_figure
+from cube import build_cubes
+
+
+def labels(fig):
+    bars, lines = fig.axes[:2]
+    return ([t.get_text() for t in bars.get_xticklabels()],
+            [t.get_text() for t in lines.get_legend().get_texts()])
+
+
+@pytest.mark.parametrize("builder, key, names", [
+    (workingday_figure, "workingday", ["Akhir Pekan", "Hari Kerja"]),
+    (holiday_figure, "holiday", ["Hari Biasa", "Hari Libur"]),
+])
+def test_split_labels_follow_category_values(frames, builder, key, names):
+    hour_df, day_df = frames
+    assert labels(builder(build_cubes(hour_df, day_df), day_df)) == (names, names)
+    # Filter yang menyisakan satu kategori tetap memberi label kategori tersebut
+    for value, name in enumerate(names):
+        hours, days = hour_df[hour_df[key] == value], day_df[day_df[key] == value]
+        fig = builder(build_cubes(hours, days), days)
+        assert labels(fig) == ([name], [name])
+        total = fig.axes[0].patches[0].get_height()
+        assert total == days["cnt"].sum()
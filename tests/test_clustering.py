@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import clustering
+import data_loader
+from clustering import fit_day_clusters
+
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch):
+    # Model .npz ditulis ke folder per test
+    monkeypatch.setattr(data_loader, "cache_dir", lambda: str(tmp_path))
+    return tmp_path
+
+
+def fresh_fit(hour_df, model_dir):
+    for name in os.listdir(model_dir):
+        os.remove(model_dir / name)
+    return fit_day_clusters(hour_df)
+
+
+def test_edited_history_refits(frames, model_dir):
+    hour_df, _ = frames
+    fit_day_clusters(hour_df)
+    # Jumlah hari sama, isi hari lama berubah: centroid lama tidak boleh dipakai
+    edited = hour_df.copy()
+    first_days = edited["dteday"] < edited["dteday"].iloc[0] + np.timedelta64(60, "D")
+    edited.loc[first_days, "cnt"] = edited.loc[first_days, "cnt"] * 3
+    result = fit_day_clusters(edited)
+    np.testing.assert_allclose(result["centroids"], fresh_fit(edited, model_dir)["centroids"])
+
+
+def test_appended_days_reuse_model(frames, model_dir):
+    hour_df, _ = frames
+    cutoff = hour_df["dteday"].iloc[len(hour_df) // 2]
+    fit_day_clusters(hour_df[hour_df["dteday"] <= cutoff])
+    incremental = fit_day_clusters(hour_df)
+    # Hari baru hanya menggeser centroid lama (partial fit), bukan k-means ulang
+    assert incremental["labels"].shape == (hour_df["dteday"].nunique(),)
+    assert not np.allclose(incremental["centroids"], fresh_fit(hour_df, model_dir)["centroids"])
+    assert [p.suffix for p in model_dir.iterdir()] == [".npz"]
+
+
+def test_profiles_sum_cities(frames):
+    hour_df, _ = frames
+    days, single = clustering.daily_profiles(hour_df, ("cnt", "casual"))
+    # Dua kota dengan data identik: profil harian = dua kali profil satu kota
+    cities = pd.concat([hour_df.assign(city=0), hour_df.assign(city=1)], ignore_index=True)
+    city_days, combined = clustering.daily_profiles(cities, ("cnt", "casual"))
+    assert city_days.equals(days)
+    np.testing.assert_allclose(combined, 2 * single)
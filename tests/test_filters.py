@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import DAY_KEYS, HOUR_KEYS, build_cubes
+from filters import compute_view, random_keys, use_measure
+from stats import Moments
+
+N_KEYS = 50
+
+
+def reference_view(frames, key):
+    # Jalur lambat: boolean mask atas seluruh baris lalu build_cubes
+    hour_df, day_df = frames
+    start, end, selections, user_type, anomalies = key
+    start, end = pd.Timestamp(start), pd.Timestamp(end) + pd.Timedelta(days=1)
+
+    def select(df):
+        mask = (df["dteday"] >= start) & (df["dteday"] < end)
+        for column, values in selections:
+            mask &= df[column].isin(values)
+        return df[mask]
+
+    hours = select(hour_df)
+    if anomalies == "exclude":
+        hours = hours[hours["anomaly"] == 0]
+    cubes = build_cubes(hours, select(day_df))
+    return use_measure(cubes, select(day_df), user_type)
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return list(random_keys(N_KEYS))
+
+
+def sorted_cube(cube, keys):
+    return cube.sort_values(keys).reset_index(drop=True).astype("int64")
+
+
+@pytest.mark.parametrize("index", range(N_KEYS))
+def test_view_matches_boolean_mask(frames, keys, index):
+    key = keys[index]
+    view = compute_view(key)
+    cubes, day_df = reference_view(frames, key)
+    for name, columns in (("hour", HOUR_KEYS), ("day", DAY_KEYS)):
+        pd.testing.assert_frame_equal(sorted_cube(view["cubes"][name], columns), sorted_cube(cubes[name], columns))
+    # Frame yang tidak terurut dikembalikan dalam urutan tanggal
+    pd.testing.assert_frame_equal(view["day_df"].sort_index(), day_df)
+    # Momen dari partisi + tepi rentang sama dengan memindai baris hasil filter
+    expected = Moments.from_frame(day_df)
+    assert view["moments"].n == expected.n
+    if expected.n:
+        for name in ("mean", "comoment", "minimum", "maximum"):
+            np.testing.assert_allclose(getattr(view["moments"], name), getattr(expected, name), rtol=1e-9, atol=1e-9)
+    if "anomalies" in view:
+        hour = cubes["hour"]
+        assert len(view["anomalies"]) == int(hour.loc[hour["anomaly"] == 1, "n"].sum())
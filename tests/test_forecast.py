@@ -0,0 +1,35 @@
+import os
+
+import numpy as np
+
+from forecast import ForecastModel, fit_model, training_rows
+
+
+def test_edited_history_refits(frames, tmp_path):
+    hour_df, _ = frames
+    rows = training_rows(hour_df)
+    path = str(tmp_path / "model.npz")
+    fit_model(rows, path=path)
+
+    # Jumlah baris sama tetapi nilai cnt diubah: statistik lama tidak boleh dipakai
+    edited = rows.assign(cnt=rows["cnt"].to_numpy()[::-1])
+    model = fit_model(edited, path=path)
+    expected = ForecastModel(edited["dteday"].min()).update(edited)
+    np.testing.assert_allclose(model.xty, expected.xty)
+    assert model.n == len(edited)
+
+
+def test_appended_hours_update_model(frames, tmp_path):
+    hour_df, _ = frames
+    rows = training_rows(hour_df)
+    split = len(rows) - 100
+    path = str(tmp_path / "model.npz")
+    fit_model(rows.iloc[:split], path=path)
+
+    model = fit_model(rows, path=path)
+    expected = ForecastModel(rows["dteday"].min()).update(rows)
+    np.testing.assert_allclose(model.xtx, expected.xtx)
+    assert model.seen_hash == expected.seen_hash
+    # Dimuat ulang tanpa menambah apa pun, dan tidak ada file tmp yang tertinggal
+    assert ForecastModel.load(path).seen_hash == model.seen_hash
+    assert os.listdir(tmp_path) == ["model.npz"]
@@ -0,0 +1,85 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import data_loader
+import ingest
+from cube import get_cubes, totals
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # Ingestion menulis ke CSV dan inbox, jadi setiap test memakai salinan data sendiri
+    source = data_loader.resolve_data_dir()
+    for name in (data_loader.HOUR_FILE, data_loader.DAY_FILE):
+        shutil.copy2(os.path.join(source, name), tmp_path / name)
+    monkeypatch.setattr(data_loader, "_data_dir", str(tmp_path))
+    monkeypatch.setattr(ingest, "INBOX_DIR", None)
+    monkeypatch.setattr(ingest, "_ingestor", None)
+    data_loader.clear_cache()
+    yield tmp_path
+    data_loader.clear_cache()
+
+
+def drop(data_dir, name, frame):
+    inbox = data_dir / "inbox"
+    inbox.mkdir(exist_ok=True)
+    frame.to_csv(inbox / name, index=False)
+
+
+def new_hours(data_dir, hours=3):
+    # Jam setelah data terakhir, dengan nilai baris terakhir hour.csv
+    raw = pd.read_csv(data_dir / data_loader.HOUR_FILE)
+    batch = raw.iloc[-hours:].drop(columns=["instant"]).copy()
+    batch["dteday"] = (pd.Timestamp(raw["dteday"].iloc[-1]) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    batch["hr"] = range(hours)
+    return batch
+
+
+def test_malformed_batch_is_moved_to_failed(data_dir):
+    rows = len(data_loader.load_data()[0])
+    drop(data_dir, "bad.csv", new_hours(data_dir).drop(columns=["cnt"]))
+    results = ingest.poll_inbox()
+
+    assert [r["file"] for r in results] == ["bad.csv"] and "cnt" in results[0]["error"]
+    failed = data_dir / "inbox" / "failed"
+    assert sorted(os.listdir(failed)) == ["bad.csv", "bad.csv.error.txt"]
+    assert [p for p in os.listdir(data_dir / "inbox") if p.endswith(".processing")] == []
+    # Halaman berikutnya tetap bisa memuat data, dan file tidak diproses ulang
+    assert len(data_loader.load_data()[0]) == rows
+    assert ingest.poll_inbox() == []
+
+
+def test_invalid_values_are_moved_to_failed(data_dir):
+    batch = new_hours(data_dir)
+    batch["hr"] = 99
+    drop(data_dir, "range.csv", batch)
+    assert "error" in ingest.poll_inbox()[0]
+    assert os.path.exists(data_dir / "inbox" / "failed" / "range.csv")
+
+
+def test_redropped_batch_is_not_double_counted(data_dir):
+    hour_df, _ = data_loader.load_data()
+    total = int(totals(get_cubes(include_anomalies=True)["day"])["cnt_sum"])
+    batch = new_hours(data_dir)
+
+    drop(data_dir, "b1.csv", batch)
+    assert ingest.poll_inbox()[0]["received"] == len(batch)
+    drop(data_dir, "b1-again.csv", batch)
+    summary = ingest.poll_inbox()[0]
+    assert summary["received"] == 0 and summary["duplicates"] == len(batch)
+
+    # Jam yang sudah ada di riwayat juga dibuang; hanya jam baru yang ditambahkan
+    overlap = pd.concat([pd.read_csv(data_dir / data_loader.HOUR_FILE).iloc[-5:].drop(columns=["instant"]),
+                         new_hours(data_dir, 5).iloc[3:]])
+    summary = ingest.append_hours(overlap, persist=True)
+    assert (summary["received"], summary["duplicates"]) == (2, 5)
+
+    expected = total + int(batch["cnt"].sum()) + int(overlap["cnt"].iloc[-2:].sum())
+    assert int(totals(get_cubes(include_anomalies=True)["day"])["cnt_sum"]) == expected
+    on_disk = pd.read_csv(data_dir / data_loader.HOUR_FILE)
+    assert len(on_disk) == len(hour_df) + 5
+    assert not on_disk.duplicated(["dteday", "hr"]).any()
+    assert on_disk["instant"].is_unique
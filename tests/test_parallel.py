@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import DAY_KEYS, HOUR_KEYS
+from parallel import MOMENT_COLUMNS, PARTITIONS, cube_keys, parallel_aggregate, serial_aggregate
+from streaming import normalize_cube
+
+
+@pytest.fixture(scope="module")
+def expected(raw_frames):
+    return serial_aggregate(*raw_frames)
+
+
+@pytest.mark.parametrize("by", list(PARTITIONS))
+def test_partitioned_matches_serial(raw_frames, expected, by):
+    hour_raw, day_raw = raw_frames
+    if PARTITIONS[by] not in hour_raw.columns:
+        pytest.skip(f"data tidak punya kolom {PARTITIONS[by]}")
+    result = parallel_aggregate(hour_raw, day_raw, by)
+
+    # Cube berisi jumlah integer sehingga harus identik bit per bit
+    for name, keys in (("hour", HOUR_KEYS), ("day", DAY_KEYS)):
+        keys = cube_keys(hour_raw, keys)
+        pd.testing.assert_frame_equal(normalize_cube(result["cubes"][name], keys),
+                                      normalize_cube(expected["cubes"][name], keys))
+    assert result["rows"] == expected["rows"]
+
+    # Momen float: identik antara serial (workers=1) dan process pool,
+    # dan setara dengan DataFrame.corr() sampai galat pembulatan
+    serial = parallel_aggregate(hour_raw, day_raw, by, workers=1)
+    for key in ("mean", "comoment"):
+        np.testing.assert_array_equal(getattr(serial["moments"], key), getattr(result["moments"], key))
+    corr = result["moments"].corr(MOMENT_COLUMNS)
+    np.testing.assert_allclose(corr.to_numpy(), expected["corr"].to_numpy(), rtol=0, atol=1e-9)
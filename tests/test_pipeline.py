@@ -0,0 +1,67 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import data_loader
+import pipeline
+from pipeline import DAY_FILE, HOUR_FILE, SOURCES, STAGES, Pipeline, build_day_cube, build_hour_cube, prepare_data
+
+
+@pytest.fixture
+def work(tmp_path):
+    source = data_loader.resolve_data_dir()
+    for name in SOURCES:
+        shutil.copy(os.path.join(source, name), tmp_path)
+    return tmp_path
+
+
+def computed(pipe):
+    return sorted(name for name, status, _ in pipe.log if status == "dihitung")
+
+
+def touch_day(path):
+    # Perubahan kecil pada day.csv: suhu satu hari dinaikkan sedikit
+    df = pd.read_csv(path)
+    df.loc[0, "temp"] = round(df.loc[0, "temp"] + 0.01, 6)
+    df.to_csv(path, index=False)
+
+
+def test_matches_in_memory_path(work):
+    hour_df, day_df, cube_hour, cube_day = Pipeline(work, work / "store").run(["hour", "day", "cube_hour", "cube_day"])
+    expected = prepare_data(pd.read_csv(work / HOUR_FILE), pd.read_csv(work / DAY_FILE))
+    pd.testing.assert_frame_equal(hour_df, expected[0])
+    pd.testing.assert_frame_equal(day_df, expected[1])
+    pd.testing.assert_frame_equal(cube_hour, build_hour_cube(expected[0]))
+    pd.testing.assert_frame_equal(cube_day, build_day_cube(expected[1]))
+
+
+def test_only_changed_stages_recompute(work):
+    store_dir = work / "store"
+    Pipeline(work, store_dir).run(list(STAGES))
+    second = Pipeline(work, store_dir)
+    second.run(list(STAGES))
+    assert computed(second) == []
+
+    touch_day(work / DAY_FILE)
+    third = Pipeline(work, store_dir)
+    third.run(list(STAGES))
+    assert computed(third) == ["cube_day", "day", "day_raw"]
+    assert third.version(["hour", "day"]) != second.version(["hour", "day"])
+    assert third.key("hour") == second.key("hour")
+
+
+def test_stage_code_is_part_of_key(work, monkeypatch):
+    store_dir = work / "store"
+    Pipeline(work, store_dir).run(list(STAGES))
+
+    # Fungsi tahap day berubah: day dan cube_day dihitung ulang tanpa menaikkan versi manual
+    def prepare_day(df):
+        return pipeline.prepare_frame(df)
+
+    inputs, _, code = STAGES["day"]
+    monkeypatch.setitem(STAGES, "day", (inputs, prepare_day, code))
+    changed = Pipeline(work, store_dir)
+    changed.run(list(STAGES))
+    assert computed(changed) == ["cube_day", "day"]
@@ -0,0 +1,81 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import data_loader
+import report
+import stats
+from figure_cache import SAVEFIG_KWARGS
+
+FIGURES = 9
+
+
+@pytest.fixture(scope="module")
+def rendered(tmp_path_factory):
+    # Satu render penuh per modul di atas salinan data; test lain hanya memeriksa
+    # rencana render (report.plan) agar tidak merender ulang setiap kali
+    work = tmp_path_factory.mktemp("report")
+    data = work / "data"
+    data.mkdir()
+    source = data_loader.resolve_data_dir()
+    for name in (data_loader.HOUR_FILE, data_loader.DAY_FILE):
+        shutil.copy2(os.path.join(source, name), data / name)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(data_loader, "_data_dir", str(data))
+        data_loader.clear_cache()
+        output = work / "reports"
+        yield data, output, report.render_report(str(output))
+    data_loader.clear_cache()
+
+
+def pending(output):
+    # (figure yang akan dirender, figure yang dilewati) untuk run berikutnya
+    jobs, _, skipped = report.plan(str(output), ["png"], [], report.load_manifest(str(output)))
+    return len(jobs), skipped
+
+
+def test_first_run_renders_all(rendered):
+    _, output, result = rendered
+    assert (result["rendered"], result["skipped"]) == (FIGURES, 0)
+    assert len([f for f in os.listdir(output / "all") if f.endswith(".png")]) == FIGURES
+
+
+def test_unchanged_run_skips_all(rendered):
+    _, output, _ = rendered
+    result = report.render_report(str(output))
+    assert (result["rendered"], result["skipped"]) == (0, FIGURES)
+
+
+def test_changed_code_rerenders(rendered, tmp_path, monkeypatch):
+    _, output, _ = rendered
+    # stats.py diubah: sumbernya dibaca dari salinan dengan baris tambahan
+    edited = tmp_path / "stats.py"
+    shutil.copy(stats.__file__, edited)
+    with open(edited, "a") as f:
+        f.write("\n# diubah\n")
+    monkeypatch.setattr(stats, "__file__", str(edited))
+    assert pending(output) == (FIGURES, 0)
+
+
+def test_changed_savefig_options_rerender(rendered, monkeypatch):
+    _, output, _ = rendered
+    monkeypatch.setitem(SAVEFIG_KWARGS, "dpi", SAVEFIG_KWARGS.get("dpi", 100) + 1)
+    assert pending(output) == (FIGURES, 0)
+
+
+def test_changed_day_csv_rerenders(rendered):
+    data, output, _ = rendered
+    path = data / data_loader.DAY_FILE
+    original = path.read_bytes()
+    try:
+        day = pd.read_csv(path)
+        day.loc[0, "temp"] = round(day.loc[0, "temp"] + 0.01, 6)
+        day.to_csv(path, index=False)
+        data_loader.clear_cache()
+        assert pending(output)[0] > 0
+    finally:
+        path.write_bytes(original)
+        data_loader.clear_cache()
+    assert pending(output) == (0, FIGURES)
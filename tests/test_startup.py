@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+from benchmark import STARTUP_BUDGET_SECONDS, STARTUP_FORBIDDEN, check_startup
+
+# Waktu di CI bisa bising: anggaran bisa dilonggarkan lewat BIKE_STARTUP_BUDGET,
+# dan first paint diambil yang tercepat dari beberapa proses baru
+BUDGET = float(os.environ.get("BIKE_STARTUP_BUDGET", STARTUP_BUDGET_SECONDS))
+ATTEMPTS = 3
+
+
+@pytest.fixture(scope="module")
+def startup():
+    runs = []
+    for _ in range(ATTEMPTS):
+        result, _ = check_startup(budget=BUDGET)
+        runs.append(result)
+        if result["first_paint_s"] <= BUDGET:
+            break
+    return runs
+
+
+def test_home_does_not_import_data_modules(startup):
+    for result in startup:
+        assert result["error"] is None
+        assert result["imported"] == [], f"modul yang dilarang ({STARTUP_FORBIDDEN}) ikut diimpor"
+
+
+def test_home_first_paint_within_budget(startup):
+    best = min(result["first_paint_s"] for result in startup)
+    assert best <= BUDGET, f"first paint {best:.3f}s melebihi anggaran {BUDGET:.3f}s"
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from charts import correlation_figure
+from stats import INSUFFICIENT_DATA, MOMENT_KEYS, Moments, PartitionedMoments
+from vega_charts import correlation_specs, payload_bytes
+
+
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+@pytest.mark.parametrize("n", [0, 1, 2, 3])
+def test_regression_needs_three_rows(frames, n):
+    _, day_df = frames
+    days = day_df.head(n)
+    moments = Moments.from_frame(days)
+    fit = moments.ols("temp", "cnt")
+    if n < 3:
+        assert fit is None
+    else:
+        slope, intercept = np.polyfit(days["temp"], days["cnt"], 1)
+        np.testing.assert_allclose([fit["slope"], fit["intercept"]], [slope, intercept])
+        assert np.isfinite(fit["lower"]).all() and np.isfinite(fit["upper"]).all()
+
+    # Kedua mode render tetap jalan; tanpa regresi keduanya menampilkan catatan
+    fig = correlation_figure(None, days, moments)
+    notes = [t.get_text() for t in fig.axes[1].texts]
+    assert notes == ([INSUFFICIENT_DATA] if fit is None else [])
+    specs = correlation_specs(None, days, moments)
+    regression = specs[0][1]
+    assert len(regression["layer"]) == (1 if fit is None else 3)
+    assert (regression["title"] == {"text": "Hubungan antara Suhu dan Jumlah Penyewaan",
+                                    "subtitle": INSUFFICIENT_DATA}) == (fit is None)
+    # NaN dikirim sebagai null agar payload tetap JSON yang valid
+    assert payload_bytes(specs) > 0
+
+
+def test_constant_x_has_no_regression(frames):
+    _, day_df = frames
+    days = day_df.head(5).assign(temp=0.5)
+    assert Moments.from_frame(days).ols("temp", "cnt") is None
+
+
+def test_moments_match_pandas(frames):
+    _, day_df = frames
+    moments = Moments.from_frame(day_df.iloc[:400]).merge(Moments.from_frame(day_df.iloc[400:]))
+    columns = ["cnt", "temp", "hum", "windspeed"]
+    np.testing.assert_allclose(moments.corr(columns).to_numpy(), day_df[columns].corr().to_numpy(), atol=1e-12)
+
+
+def test_partitions_merge_to_scan(frames):
+    _, day_df = frames
+    partitions = PartitionedMoments.from_frame(day_df)
+    assert len(partitions.keys) == len(day_df.drop_duplicates(MOMENT_KEYS))
+    for mask, rows in ((partitions.keys["workingday"] == 1, day_df[day_df["workingday"] == 1]),
+                       (partitions.keys["year"] >= 0, day_df)):
+        merged, expected = partitions.select(mask.to_numpy()), Moments.from_frame(rows)
+        assert merged.n == expected.n
+        for name in ("mean", "comoment", "minimum", "maximum"):
+            np.testing.assert_allclose(getattr(merged, name), getattr(expected, name), rtol=1e-9)
+    assert partitions.select(np.zeros(len(partitions.keys), dtype=bool)).n == 0
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from store import random_queries, run_query, sync
+
+N_QUERIES = 40
+
+
+@pytest.fixture(scope="module")
+def store(frames):
+    # Store dibangun di folder data salinan (lihat conftest.py)
+    hour_df, day_df = frames
+    return sync(), {"hour": hour_df[hour_df["anomaly"] == 0], "day": day_df}
+
+
+@pytest.fixture(scope="module")
+def queries(frames):
+    return list(random_queries(N_QUERIES, "city" in frames[0].columns))
+
+
+@pytest.mark.parametrize("index", range(N_QUERIES))
+def test_query_matches_groupby(store, queries, index):
+    # Tabel agregat maupun baris mentah harus sama dengan groupby pandas
+    path, tables = store
+    params = queries[index]
+    _, result = run_query(path, **params)
+    df = tables[params["level"]]
+    for column, values in params["filters"].items():
+        df = df[df[column].isin(values)]
+    grouped = df.groupby(list(params["group_by"]), sort=True)[params["measure"]]
+    expected = {"sum": grouped.sum, "mean": grouped.mean, "count": grouped.size}[params["agg"]]()
+    actual = result.set_index(list(params["group_by"]))["value"]
+    np.testing.assert_allclose(actual.to_numpy(dtype=float), expected.to_numpy(dtype=float), rtol=1e-9)
+    assert actual.index.equals(expected.index.set_names(actual.index.names)), params
+
+
+def test_date_range_matches_groupby(frames, store):
+    # Rentang tanggal: baris mentah lewat indeks (dteday, hr)
+    hour_df, _ = frames
+    path, tables = store
+    start, end = hour_df["dteday"].iloc[len(hour_df) // 3], hour_df["dteday"].iloc[len(hour_df) // 2]
+    _, result = run_query(path, "hour", ("hr",), {}, "cnt", "sum", start, end)
+    df = tables["hour"]
+    expected = df[(df["dteday"] >= start) & (df["dteday"] <= end)].groupby("hr")["cnt"].sum()
+    np.testing.assert_array_equal(result["value"].to_numpy(), expected.to_numpy())
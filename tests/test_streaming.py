@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+
+from cube import DAY_KEYS, HOUR_KEYS, build_cubes
+from pipeline import prepare_data
+from streaming import CHUNK_ROWS, normalize_cube, stream_data
+
+
+@pytest.fixture(scope="module")
+def expected(raw_frames):
+    hour_df, day_df = prepare_data(*raw_frames)
+    return hour_df, day_df, build_cubes(hour_df, day_df)
+
+
+# Beberapa ukuran potongan, termasuk yang memotong di tengah hari
+@pytest.mark.parametrize("chunk_rows", sorted({CHUNK_ROWS, 1000, 997}))
+def test_stream_matches_in_memory(expected, chunk_rows):
+    hour_df, day_df, cubes = expected
+    result = stream_data(chunk_rows=chunk_rows)
+
+    assert result["rows"] == len(hour_df)
+    # Detektor online per potongan harus menandai jam yang sama dengan satu pass penuh
+    assert result["anomalies"] == int(hour_df["anomaly"].sum())
+    for name, keys in (("hour", HOUR_KEYS), ("day", DAY_KEYS)):
+        pd.testing.assert_frame_equal(normalize_cube(result["cubes"][name], keys),
+                                      normalize_cube(cubes[name], keys))
+    pd.testing.assert_frame_equal(result["day_df"], day_df)
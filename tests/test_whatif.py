@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from forecast import training_rows
+from whatif import fit_surface, random_points, simulate, tomorrow_conditions
+
+N_POINTS = 2000
+
+
+@pytest.fixture(scope="module")
+def surface(frames):
+    hour_df, _ = frames
+    return fit_surface(training_rows(hour_df))
+
+
+@pytest.mark.parametrize("workingday", [0, 1])
+def test_grid_nodes_match_model(surface, workingday):
+    # Di titik grid interpolasi identik dengan evaluasi model langsung
+    rng = np.random.default_rng(workingday)
+    nodes = [axis[rng.integers(0, len(axis), N_POINTS)] for axis in surface.axes]
+    season, weathersit = rng.integers(1, 5, N_POINTS), rng.integers(1, 5, N_POINTS)
+    exact = surface.predict_direct(workingday, season, weathersit, *nodes)
+    np.testing.assert_allclose(surface.predict(workingday, season, weathersit, *nodes), exact, rtol=1e-4, atol=1e-3)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_interpolation_error_is_small(surface, seed):
+    # Di antara titik grid error relatif tetap di bawah 5%
+    workingday, *points = random_points(np.random.default_rng(seed), N_POINTS)
+    exact = surface.predict_direct(workingday, *points)
+    error = np.abs(surface.predict(workingday, *points) - exact) / np.maximum(exact, 1.0)
+    assert error.max() < 0.05
+
+
+def test_simulate_base_scenario(frames, surface):
+    hour_df, day_df = frames
+    base = tomorrow_conditions(hour_df, day_df)
+    result = simulate(surface, base["workingday"], [base, dict(base, temp=base["temp"] + 0.1)])
+    expected = surface.predict_direct(base["workingday"], base["season"], base["weathersit"],
+                                      base["temp"], base["hum"], base["windspeed"])
+    assert result.shape == (2, 24)
+    np.testing.assert_allclose(result[0], expected[0], rtol=0.05)